@@ -36,13 +36,11 @@ class CollectionSerializer(serializers.ModelSerializer):
 
     def get_store(self, obj):
         """Get the store details"""
-        store = Store.objects.get(id=obj.store_id.id)
-        return StoreSerializer(store).data
+        return StoreSerializer(obj.store_id).data
 
     def get_season(self, obj):
         """Get the season details"""
-        season = Season.objects.get(id=obj.season_id.id)
-        return SeasonSerializer(season).data
+        return SeasonSerializer(obj.season_id).data
 
     def validate(self, data):
         """
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CompaniesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'companies'
+
+    def ready(self):
+        # Connect subscription cache invalidation signals
+        import companies.signals  # noqa: F401
@@ -1,6 +1,7 @@
 from django.http import JsonResponse
-from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from companies.models import Company
+from companies.subscription_cache import get_subscription_state
 
 class SubscriptionMiddleware:
     def __init__(self, get_response):
@@ -22,22 +23,25 @@ class SubscriptionMiddleware:
                 'error': 'No company associated with this user'
             }, status=403)
 
-        try:
-            company = Company.objects.get(id=company_id)
-            
-            # Check if subscription is valid
-            if not company.is_subscription_valid():
-                return JsonResponse({
-                    'error': 'Subscription has expired',
-                    'expired_at': company.subscription_expiration_date.isoformat() if company.subscription_expiration_date else None
-                }, status=403)
-
-            # Add company to request for easy access in views
-            request.company = company
-            
-        except Company.DoesNotExist:
+        state = get_subscription_state(company_id)
+        if state is not None and not state.is_valid():
+            # The cached expiry has passed; re-read it in case the subscription was
+            # renewed by another process before rejecting the request
+            state = get_subscription_state(company_id, refresh=True)
+
+        if state is None:
             return JsonResponse({
                 'error': 'Company not found'
             }, status=403)
 
-        return self.get_response(request) 
\ No newline at end of file
+        # Check if subscription is valid
+        if not state.is_valid():
+            return JsonResponse({
+                'error': 'Subscription has expired',
+                'expired_at': state.expiration_date.isoformat() if state.expiration_date else None
+            }, status=403)
+
+        # Add company to request for easy access in views (loaded on first use)
+        request.company = SimpleLazyObject(lambda: Company.objects.get(id=company_id))
+
+        return self.get_response(request)
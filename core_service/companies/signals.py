@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from companies.models import Company, SubscriptionPlan
+from companies.subscription_cache import invalidate_subscription_state
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_subscription(sender, instance, **kwargs):
+    invalidate_subscription_state(instance.pk)
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+@receiver(post_delete, sender=SubscriptionPlan)
+def invalidate_plan_subscriptions(sender, instance, **kwargs):
+    # Plan limits are cached per company; a plan change can affect any of them
+    invalidate_subscription_state()
@@ -0,0 +1,72 @@
+import threading
+import time
+from django.conf import settings
+from django.utils import timezone
+from companies.models import Company
+
+# Per-process cache of company_id -> subscription state, so the subscription check
+# on the request path does not query the database. Entries expire after
+# SUBSCRIPTION_CACHE_TIMEOUT seconds and are dropped as soon as this process saves
+# or deletes the company or any subscription plan (see companies.signals).
+_states = {}
+_lock = threading.Lock()
+
+
+class SubscriptionState:
+    __slots__ = ('expiration_date', 'plan_limits', 'fetched_at')
+
+    def __init__(self, expiration_date, plan_limits):
+        self.expiration_date = expiration_date
+        self.plan_limits = plan_limits
+        self.fetched_at = time.monotonic()
+
+    def is_valid(self):
+        """Same rule as Company.is_subscription_valid, evaluated against the clock on every call"""
+        if not self.expiration_date:
+            return False
+        return timezone.now() <= self.expiration_date
+
+
+def _load_state(company_id):
+    row = Company.objects.filter(id=company_id).values(
+        'subscription_expiration_date',
+        'subscription_plan__max_products',
+        'subscription_plan__max_stores',
+        'subscription_plan__max_customers',
+    ).first()
+    if row is None:
+        return None
+    plan_limits = {
+        entity_type: row[f'subscription_plan__max_{entity_type}']
+        for entity_type in ('products', 'stores', 'customers')
+    }
+    return SubscriptionState(row['subscription_expiration_date'], plan_limits)
+
+
+def get_subscription_state(company_id, refresh=False):
+    """
+    Subscription state for a company, or None if it does not exist.
+    Unknown companies are not cached, so a newly created company is seen at once.
+    """
+    key = str(company_id)
+    if not refresh:
+        state = _states.get(key)
+        if state is not None and time.monotonic() - state.fetched_at < settings.SUBSCRIPTION_CACHE_TIMEOUT:
+            return state
+
+    state = _load_state(company_id)
+    with _lock:
+        if state is None:
+            _states.pop(key, None)
+        else:
+            _states[key] = state
+    return state
+
+
+def invalidate_subscription_state(company_id=None):
+    """Drop one company's cached state, or every company's when company_id is None"""
+    with _lock:
+        if company_id is None:
+            _states.clear()
+        else:
+            _states.pop(str(company_id), None)
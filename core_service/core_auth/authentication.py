@@ -1,91 +1,142 @@
 # core_service/core_service/authentication.py
+import hashlib
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from rest_framework import authentication, exceptions
 from core_auth.utils import StatelessUser
-import os
-import json
 import logging
 import jwt
 from django.conf import settings
+from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+IDENTITY_KEY = 'auth:identity:{token_id}'
+
+_session = None
+
+
+def get_user_service_session():
+    """
+    Shared HTTP session for calls to the user service, so connections (and TLS
+    handshakes) are reused across requests instead of opened per call
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.USER_SERVICE_POOL_SIZE)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.verify = False
+        _session = session
+    return _session
+
+
+def _identity_cache_key(token, payload):
+    token_id = payload.get('jti') or hashlib.sha256(token.encode()).hexdigest()
+    return IDENTITY_KEY.format(token_id=token_id)
+
+
+def _fetch_identity(token):
+    """
+    Ask the user service for the token owner's profile. Returns the profile dict,
+    None if the service could not be reached, and raises if it rejects the token.
+    """
+    user_service_url = settings.USER_SERVICE_URL
+    if not user_service_url:
+        return None
+
+    verify_url = f"{user_service_url.rstrip('/')}/auth/verify-token/"
+    try:
+        response = get_user_service_session().post(
+            verify_url,
+            headers={'Authorization': f'Bearer {token}'},
+            json={'token': token},
+            timeout=settings.USER_SERVICE_TIMEOUT
+        )
+    except requests.RequestException as e:
+        logger.warning(f"Failed to get additional user info from user service: {str(e)}")
+        return None
+
+    if response.status_code == 400:
+        raise exceptions.AuthenticationFailed('Token is invalid or expired')
+    if not response.ok:
+        logger.warning(f"User service returned {response.status_code} while verifying a token")
+        return None
+
+    try:
+        data = response.json()
+    except ValueError:
+        logger.warning("User service returned a response that is not JSON while verifying a token")
+        raise exceptions.AuthenticationFailed('Could not verify token with the user service')
+    if not isinstance(data, dict):
+        raise exceptions.AuthenticationFailed('Could not verify token with the user service')
+    return data if data.get('is_valid') else None
+
+
 class UserServiceAuthentication(authentication.BaseAuthentication):
+    """
+    Verifies SimpleJWT access tokens locally with the shared signing key. The user's
+    profile (email, role, company, assigned store) is fetched from the user service
+    once per token and cached until the token expires or AUTH_IDENTITY_CACHE_TIMEOUT
+    passes, whichever comes first.
+    """
     def authenticate(self, request):
-        print('mahfouz')
         # Extract token from Authorization header
         auth_header = request.META.get('HTTP_AUTHORIZATION')
-        logger.info(f"Authentication attempt - Authorization header present: {bool(auth_header)}")
 
         if not auth_header:
-            logger.warning("No Authorization header found in request")
             return None
-        
+
         # Handle both "Bearer token" and "Bearer Bearer token" formats
         parts = auth_header.split()
-        
+
         if len(parts) == 2:
             token = parts[1]
         elif len(parts) == 3 and parts[0] == 'Bearer' and parts[1] == 'Bearer':
             token = parts[2]
         else:
-            logger.warning(f"Invalid Authorization header format: {auth_header}")
+            logger.warning("Invalid Authorization header format")
             return None
-            
-        logger.info("Token successfully extracted from header")
-        
+
         try:
-            # First try to decode the token to get user_id
-            decoded_token = jwt.decode(token, options={"verify_signature": False})
-            logger.info(f"Decoded token payload: {decoded_token}")
-            
-            user_id = decoded_token.get('user_id')
-            if not user_id:
-                logger.error("No user_id found in token")
-                raise exceptions.AuthenticationFailed('Invalid token: no user_id')
-
-            # Create basic user data from token
+            payload = jwt.decode(
+                token,
+                settings.SIMPLE_JWT['SIGNING_KEY'],
+                algorithms=[settings.SIMPLE_JWT.get('ALGORITHM', 'HS256')]
+            )
+        except jwt.ExpiredSignatureError:
+            raise exceptions.AuthenticationFailed('Token has expired')
+        except jwt.InvalidTokenError as e:
+            logger.warning(f"Rejected token: {str(e)}")
+            raise exceptions.AuthenticationFailed('Invalid token')
+
+        if payload.get('token_type', 'access') != 'access':
+            raise exceptions.AuthenticationFailed('Invalid token: not an access token')
+
+        user_id = payload.get('user_id')
+        if not user_id:
+            raise exceptions.AuthenticationFailed('Invalid token: no user_id')
+
+        key = _identity_cache_key(token, payload)
+        user_data = cache.get(key)
+        if user_data is None:
             user_data = {
                 'id': user_id,
                 'is_active': True
             }
-            
-            # Get User Service URL from environment
-            user_service_url = os.getenv('USER_SERVICE_URL')
-            logger.info(f"Using USER_SERVICE_URL: {user_service_url}")
-            
-            if user_service_url:
-                verify_url = f"{user_service_url.rstrip('/')}/auth/verify-token/"
-                headers = {'Authorization': f'Bearer {token}'}
-                
-                try:
-                    logger.info(f"Making verification request to: {verify_url}")
-                    response = requests.post(
-                        verify_url, 
-                        headers=headers, 
-                        timeout=30,
-                        json={'token': token},
-                        verify=False
-                    )
-                    
-                    if response.ok:
-                        data = response.json()
-                        if data.get('is_valid'):
-                            # Update user data with additional info from user service
-                            user_info = data
-                            if user_info:
-                                user_data.update(user_info)
-                except Exception as e:
-                    logger.warning(f"Failed to get additional user info from user service: {str(e)}")
-                    # Continue with basic user data since we have the user_id from token
-            
-            user = StatelessUser(user_data=user_data)
-            logger.info(f"Successfully created StatelessUser with ID: {user.id}")
-            return (user, token)
-            
-        except jwt.DecodeError as e:
-            logger.error(f"Failed to decode token: {str(e)}")
-            raise exceptions.AuthenticationFailed('Invalid token format')
-        except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
-            raise exceptions.AuthenticationFailed('Authentication failed')
\ No newline at end of file
+            identity = _fetch_identity(token)
+            if identity is not None:
+                user_data.update(identity)
+                # Never outlive the token itself
+                timeout = settings.AUTH_IDENTITY_CACHE_TIMEOUT
+                if payload.get('exp'):
+                    timeout = min(timeout, int(payload['exp'] - time.time()))
+                if timeout > 0:
+                    cache.set(key, user_data, timeout=timeout)
+
+        user = StatelessUser(user_data=user_data)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User is inactive')
+        return (user, token)
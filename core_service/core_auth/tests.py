@@ -1,3 +1,46 @@
-from django.test import TestCase
+import time
+import uuid
+from unittest import mock
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import exceptions
+from rest_framework.test import APIRequestFactory
+from core_auth.authentication import UserServiceAuthentication
 
-# Create your tests here.
+
+@override_settings(USER_SERVICE_URL='')
+class UserServiceAuthenticationTests(TestCase):
+    """Access tokens are verified locally with the shared signing key"""
+
+    def setUp(self):
+        cache.clear()
+
+    def authenticate(self, payload, key=None):
+        token = jwt.encode(payload, key or settings.SIMPLE_JWT['SIGNING_KEY'], algorithm=settings.SIMPLE_JWT['ALGORITHM'])
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return UserServiceAuthentication().authenticate(request)
+
+    def test_signed_access_token(self):
+        user_id = str(uuid.uuid4())
+        user, _ = self.authenticate({'user_id': user_id, 'token_type': 'access', 'exp': int(time.time()) + 60})
+        self.assertEqual(user.id, user_id)
+        self.assertTrue(user.is_authenticated)
+
+    def test_token_signed_with_another_key(self):
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate({'user_id': str(uuid.uuid4()), 'token_type': 'access'}, key='not-the-signing-key')
+
+    def test_refresh_token(self):
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate({'user_id': str(uuid.uuid4()), 'token_type': 'refresh'})
+
+    @override_settings(USER_SERVICE_URL='http://user-service')
+    def test_user_service_returns_non_json(self):
+        response = mock.Mock(status_code=200, ok=True)
+        response.json.side_effect = ValueError('Expecting value')
+        with mock.patch('core_auth.authentication.get_user_service_session') as session:
+            session.return_value.post.return_value = response
+            with self.assertRaises(exceptions.AuthenticationFailed):
+                self.authenticate({'user_id': str(uuid.uuid4()), 'token_type': 'access', 'exp': int(time.time()) + 60})
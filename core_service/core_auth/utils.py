@@ -9,6 +9,7 @@ class StatelessUser(AnonymousUser):
         self.last_name = user_data.get('last_name', '')
         self.role = user_data.get('role', '')
         self.company_id = user_data.get('company_id', '')
+        self.assigned_store = user_data.get('assigned_store')
         self.is_active = user_data.get('is_active', True)
 
     @property
@@ -0,0 +1,124 @@
+import base64
+import json
+from datetime import datetime
+from functools import lru_cache
+from django.conf import settings
+from django.db.models import Q
+from drf_spectacular.utils import OpenApiParameter, inline_serializer
+from rest_framework import serializers, status
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+KEYSET_PAGINATION_PARAMETERS = [
+    OpenApiParameter(name='cursor', type=str, description='Cursor from the previous page\'s "next" link'),
+    OpenApiParameter(name='page_size', type=int, description='Items per page (capped by LIST_MAX_PAGE_SIZE)'),
+    OpenApiParameter(name='paginate', type=bool, description='Pass false to get the full unpaginated list'),
+]
+
+
+
+@lru_cache(maxsize=None)
+def keyset_page_serializer(serializer_class):
+    """
+    Schema of one keyset page of serializer_class, {next, results}, for the 200
+    response of paginated list views. Cached so each page component is declared once.
+    """
+    return inline_serializer(
+        name=f"Paginated{serializer_class.__name__.removesuffix('Serializer')}List",
+        fields={
+            'next': serializers.URLField(allow_null=True, help_text='Link to the next page, null on the last page'),
+            'results': serializer_class(many=True),
+        }
+    )
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on (created_at, id), newest first. Each page is read with an
+    index range scan (created_at, id) < cursor, so deep pages cost the same as the
+    first one, unlike OFFSET. Lists are paginated unless the client explicitly asks
+    for the old unpaginated response with ?paginate=false.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    opt_out_query_param = 'paginate'
+
+    def __init__(self):
+        self.page_size = settings.LIST_PAGE_SIZE
+        self.max_page_size = settings.LIST_MAX_PAGE_SIZE
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def encode_cursor(self, instance):
+        position = json.dumps([instance.created_at.isoformat(), str(instance.pk)])
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            return datetime.fromisoformat(created_at), pk
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the requested page, or None if the client opted out of pagination"""
+        if request.query_params.get(self.opt_out_query_param, '').lower() in ('false', '0'):
+            return None
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by('-created_at', '-id')
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+        # One extra row tells whether there is a next page
+        page = list(queryset[:page_size + 1])
+        self.has_next = len(page) > page_size
+        self.page = page[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data
+        }, status=status.HTTP_200_OK)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+def paginated_list_response(request, queryset, serializer_class, view=None):
+    """
+    Serialize a store-scoped list one keyset page at a time, or in full when the
+    client passes ?paginate=false.
+    """
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(queryset, request, view=view)
+    if page is None:
+        serializer = serializer_class(queryset, many=True)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+    serializer = serializer_class(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
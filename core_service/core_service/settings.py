@@ -12,6 +12,18 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv('SECRET_KEY', default='-asdf&*YJHKP908yuik')
 DEBUG = os.getenv('DEBUG', default='True').lower() == 'true'
 USER_SERVICE_URL = os.getenv('USER_SERVICE_URL')
+USER_SERVICE_TIMEOUT = float(os.getenv('USER_SERVICE_TIMEOUT', default='5'))
+USER_SERVICE_POOL_SIZE = int(os.getenv('USER_SERVICE_POOL_SIZE', default='20'))
+# Upper bound on how long a verified token's user profile is cached
+AUTH_IDENTITY_CACHE_TIMEOUT = int(os.getenv('AUTH_IDENTITY_CACHE_TIMEOUT', default='300'))
+# How long each process trusts its cached company subscription state
+SUBSCRIPTION_CACHE_TIMEOUT = int(os.getenv('SUBSCRIPTION_CACHE_TIMEOUT', default='60'))
+# RabbitMQ publisher connection pool (connections per process, seconds to wait for one)
+RABBITMQ_POOL_SIZE = int(os.getenv('RABBITMQ_POOL_SIZE', default='4'))
+RABBITMQ_POOL_TIMEOUT = float(os.getenv('RABBITMQ_POOL_TIMEOUT', default='5'))
+# Stock checkpoints stop this many seconds in the past, so stock movements from
+# transactions still in flight are not missed
+STOCK_CHECKPOINT_LAG = int(os.getenv('STOCK_CHECKPOINT_LAG', default='300'))
 print("USER_SERVICE_URL loaded:", USER_SERVICE_URL)
 
 ALLOWED_HOSTS = ['*']
@@ -79,6 +91,10 @@ DATABASES = {
     )
 }
 
+# Keyset pagination of store-scoped list endpoints
+LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', default='50'))
+LIST_MAX_PAGE_SIZE = int(os.getenv('LIST_MAX_PAGE_SIZE', default='200'))
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     
@@ -95,6 +111,13 @@ REST_FRAMEWORK = {
     # ],
 }
 
+# Access tokens are issued by the user management service and verified here with
+# the same signing key
+SIMPLE_JWT = {
+    'SIGNING_KEY': config('JWT_SECRET_KEY', default=SECRET_KEY),
+    'ALGORITHM': 'HS256',
+}
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Core Service API',
     'DESCRIPTION': 'API documentation for Core Service',
@@ -112,6 +135,35 @@ SPECTACULAR_SETTINGS = {
 
 CLOUDAMQP_URL = config('CLOUDAMQP_URL', default='')
 
+# Cache configuration (Redis in production, per-process memory otherwise)
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'core_service',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Report caching needs a cache shared by all workers to invalidate correctly
+REPORT_CACHE_ENABLED = os.getenv('REPORT_CACHE_ENABLED', default=str(bool(REDIS_URL))).lower() == 'true'
+REPORT_CACHE_TIMEOUT = int(os.getenv('REPORT_CACHE_TIMEOUT', default='3600'))
+# Background report jobs still RUNNING after this many seconds are handed to another worker
+REPORT_JOB_TIMEOUT = int(os.getenv('REPORT_JOB_TIMEOUT', default='1800'))
+
+# Fitted forecasts are cached by history hash; the nightly prefit_forecasts run refreshes them
+FORECAST_CACHE_TIMEOUT = int(os.getenv('FORECAST_CACHE_TIMEOUT', default=str(26 * 60 * 60)))
+# Default forecasting backend: 'holt_winters' (NumPy), 'prophet' or 'trend_based'
+FORECAST_BACKEND = os.getenv('FORECAST_BACKEND', default='holt_winters')
+FORECAST_BATCH_WORKERS = int(os.getenv('FORECAST_BATCH_WORKERS', default=str(os.cpu_count() or 1)))
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-17 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financials', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['store_id', 'created_at', 'id'], name='expenses_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payable',
+            index=models.Index(fields=['store_id', 'created_at', 'id'], name='payables_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentin',
+            index=models.Index(fields=['store_id', 'created_at', 'id'], name='payment_ins_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentout',
+            index=models.Index(fields=['store_id', 'created_at', 'id'], name='payment_outs_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receivable',
+            index=models.Index(fields=['store_id', 'created_at', 'id'], name='receivables_store_created_idx'),
+        ),
+    ]
@@ -44,5 +44,8 @@ class Expense(models.Model):
 
   class Meta:
     db_table = 'expenses'
+    indexes = [
+      models.Index(fields=['store_id', 'created_at', 'id'], name='expenses_store_created_idx'),
+    ]
     ordering = ['-created_at']
     
\ No newline at end of file
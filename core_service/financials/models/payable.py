@@ -35,5 +35,8 @@ class Payable(models.Model):
 
   class Meta:
     db_table = 'payables'
+    indexes = [
+      models.Index(fields=['store_id', 'created_at', 'id'], name='payables_store_created_idx'),
+    ]
     ordering = ['-created_at']
     
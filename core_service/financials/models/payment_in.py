@@ -52,5 +52,8 @@ class PaymentIn(models.Model):
 
   class Meta:
     db_table = 'payment_ins'
+    indexes = [
+      models.Index(fields=['store_id', 'created_at', 'id'], name='payment_ins_store_created_idx'),
+    ]
     ordering = ['-created_at']
     
@@ -52,5 +52,8 @@ class PaymentOut(models.Model):
 
   class Meta:
     db_table = 'payment_outs'
+    indexes = [
+      models.Index(fields=['store_id', 'created_at', 'id'], name='payment_outs_store_created_idx'),
+    ]
     ordering = ['-created_at']
     
@@ -35,5 +35,8 @@ class Receivable(models.Model):
 
   class Meta:
     db_table = 'receivables'
+    indexes = [
+      models.Index(fields=['store_id', 'created_at', 'id'], name='receivables_store_created_idx'),
+    ]
     ordering = ['-created_at']
     
@@ -6,17 +6,18 @@ from rest_framework.request import Request
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from financials.models.expense import Expense
 from financials.serializers.expense import ExpenseSerializer
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 
 class ExpenseListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all expenses",
-        responses={200: ExpenseSerializer(many=True)}
+        responses={200: keyset_page_serializer(ExpenseSerializer)}
     )
     def get(self, request: Request, store_id):
         expenses = Expense.objects.filter(store_id=store_id)
-        serializer = ExpenseSerializer(expenses, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginated_list_response(request, expenses, ExpenseSerializer, view=self)
     
     @extend_schema(
         description="Create a new expense",
@@ -6,17 +6,18 @@ from rest_framework.request import Request
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from financials.models.payable import Payable
 from financials.serializers.payable import PayableSerializer
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 
 class PayableListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all payables",
-        responses={200: PayableSerializer(many=True)}
+        responses={200: keyset_page_serializer(PayableSerializer)}
     )
     def get(self, request: Request, store_id):
         payables = Payable.objects.filter(store_id=store_id)
-        serializer = PayableSerializer(payables, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginated_list_response(request, payables, PayableSerializer, view=self)
     
     @extend_schema(
         description="Create a new payable",
@@ -6,17 +6,18 @@ from rest_framework.request import Request
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from financials.models.payment_in import PaymentIn
 from financials.serializers.payment_in import PaymentInSerializer
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 
 class PaymentInListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all incoming payments",
-        responses={200: PaymentInSerializer(many=True)}
+        responses={200: keyset_page_serializer(PaymentInSerializer)}
     )
     def get(self, request: Request, store_id):
         payments = PaymentIn.objects.filter(store_id=store_id)
-        serializer = PaymentInSerializer(payments, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginated_list_response(request, payments, PaymentInSerializer, view=self)
     
     @extend_schema(
         description="Create a new incoming payment",
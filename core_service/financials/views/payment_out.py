@@ -6,17 +6,18 @@ from rest_framework.request import Request
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from financials.models.payment_out import PaymentOut
 from financials.serializers.payment_out import PaymentOutSerializer
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 
 class PaymentOutListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all outgoing payments",
-        responses={200: PaymentOutSerializer(many=True)}
+        responses={200: keyset_page_serializer(PaymentOutSerializer)}
     )
     def get(self, request: Request, store_id):
         payments = PaymentOut.objects.filter(store_id=store_id)
-        serializer = PaymentOutSerializer(payments, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginated_list_response(request, payments, PaymentOutSerializer, view=self)
     
     @extend_schema(
         description="Create a new outgoing payment",
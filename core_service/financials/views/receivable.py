@@ -6,17 +6,18 @@ from rest_framework.request import Request
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from financials.models.receivable import Receivable
 from financials.serializers.receivable import ReceivableSerializer
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 
 class ReceivableListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all receivables",
-        responses={200: ReceivableSerializer(many=True)}
+        responses={200: keyset_page_serializer(ReceivableSerializer)}
     )
     def get(self, request: Request, store_id):
         receivables = Receivable.objects.filter(store_id=store_id)
-        serializer = ReceivableSerializer(receivables, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginated_list_response(request, receivables, ReceivableSerializer, view=self)
     
     @extend_schema(
         description="Create a new receivable",
@@ -0,0 +1,129 @@
+import contextvars
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+from companies.models.store import Store
+from inventory.models.product import Product
+from inventory.models.stock_checkpoint import StockCheckpoint
+from inventory.models.stock_movement import StockMovement
+
+# Reason and reference id for movements recorded in the current context; stock
+# changes made outside a stock_movement_reason block are manual adjustments
+_current_reason = contextvars.ContextVar('stock_movement_reason', default=None)
+
+
+@contextmanager
+def stock_movement_reason(reason, reference_id=None):
+    """Label the stock movements recorded inside the block, e.g. with the sale that caused them"""
+    token = _current_reason.set((reason, reference_id))
+    try:
+        yield
+    finally:
+        _current_reason.reset(token)
+
+
+def record_movements(store_id, changes, reason=None):
+    """
+    Append one movement per (product_id, quantity_change, quantity_after) to the
+    journal, in the caller's transaction. Lines that do not change stock are skipped.
+    """
+    current_reason, reference_id = _current_reason.get() or (StockMovement.Reason.ADJUSTMENT, None)
+    movements = [
+        StockMovement(
+            store_id=store_id,
+            product_id=product_id,
+            quantity_change=Decimal(quantity_change),
+            quantity_after=Decimal(quantity_after),
+            reason=reason or current_reason,
+            reference_id=reference_id
+        )
+        for product_id, quantity_change, quantity_after in changes
+        if quantity_change
+    ]
+    if movements:
+        StockMovement.objects.bulk_create(movements)
+
+
+def _balances(store_id, at):
+    """
+    {product_id: quantity} as of ``at``: the latest checkpoint at or before it plus
+    the movements after the checkpoint, so only a bounded slice of the journal is read.
+    """
+    checkpoint_at = StockCheckpoint.objects.filter(
+        store_id=store_id,
+        taken_at__lte=at
+    ).aggregate(latest=Max('taken_at'))['latest']
+
+    balances = {}
+    movements = StockMovement.objects.filter(store_id=store_id, created_at__lte=at)
+    if checkpoint_at is not None:
+        balances = dict(
+            StockCheckpoint.objects.filter(store_id=store_id, taken_at=checkpoint_at).values_list('product_id', 'quantity')
+        )
+        movements = movements.filter(created_at__gt=checkpoint_at)
+
+    for product_id, change in movements.order_by().values('product_id').annotate(
+        change=Sum('quantity_change')
+    ).values_list('product_id', 'change'):
+        balances[product_id] = balances.get(product_id, Decimal('0')) + change
+    return balances
+
+
+def stock_at(store, at, product_ids=None):
+    """{product_id: quantity} for the products a store held stock of at ``at``"""
+    store_id = getattr(store, 'pk', store)
+    balances = _balances(store_id, at)
+    if product_ids is not None:
+        wanted = {str(product_id) for product_id in product_ids}
+        balances = {product_id: quantity for product_id, quantity in balances.items() if str(product_id) in wanted}
+    return {product_id: quantity for product_id, quantity in balances.items() if quantity}
+
+
+def stock_value_at(store, at):
+    """
+    Value of a store's stock at ``at``, priced at the products' current sale
+    prices, as the inventory report does. Returns (value, {product_id: quantity}).
+    """
+    quantities = stock_at(store, at)
+    prices = dict(Product.objects.filter(pk__in=quantities).values_list('id', 'sale_price'))
+    value = sum(
+        (quantity * prices[product_id] for product_id, quantity in quantities.items() if product_id in prices),
+        Decimal('0')
+    )
+    return value, quantities
+
+
+def create_checkpoint(store, at=None):
+    """
+    Fold the journal into a checkpoint of every product's stock as of ``at``
+    (default: STOCK_CHECKPOINT_LAG seconds ago, so transactions still in flight
+    have committed their movements). Returns the number of rows written; nothing
+    is written if no stock moved since the previous checkpoint.
+    """
+    store_id = getattr(store, 'pk', store)
+    at = at or timezone.now() - timedelta(seconds=settings.STOCK_CHECKPOINT_LAG)
+
+    with transaction.atomic():
+        # One checkpoint run per store at a time
+        Store.objects.select_for_update().filter(pk=store_id).first()
+
+        latest = StockCheckpoint.objects.filter(store_id=store_id).aggregate(latest=Max('taken_at'))['latest']
+        if latest is not None and latest >= at:
+            return 0
+        pending = StockMovement.objects.filter(store_id=store_id, created_at__lte=at)
+        if latest is not None:
+            pending = pending.filter(created_at__gt=latest)
+        if not pending.exists():
+            return 0
+
+        # Zero balances are kept so a checkpoint is never empty for a store with history
+        checkpoints = [
+            StockCheckpoint(store_id=store_id, product_id=product_id, quantity=quantity, taken_at=at)
+            for product_id, quantity in _balances(store_id, at).items()
+        ]
+        StockCheckpoint.objects.bulk_create(checkpoints, batch_size=1000)
+    return len(checkpoints)
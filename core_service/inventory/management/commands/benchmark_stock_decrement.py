@@ -0,0 +1,101 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from inventory.ledger import record_movements
+from inventory.models.inventory import Inventory
+from inventory.services import InsufficientStockError, decrement_stock
+
+class Command(BaseCommand):
+    help = (
+        'Hammers one inventory row from many threads to measure stock decrement throughput '
+        'and check that no updates are lost. The row is restored afterwards. Every change, '
+        'including the setup and the restore, is journaled as stock movements, so the '
+        'ledger keeps matching the row; prefer a scratch inventory row.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inventory', required=True, help='UUID of the inventory row to decrement')
+        parser.add_argument('--threads', type=int, default=16, help='Number of concurrent threads')
+        parser.add_argument('--operations', type=int, default=200, help='Decrements per thread')
+        parser.add_argument('--quantity', type=int, default=1, help='Quantity taken per decrement')
+        parser.add_argument('--stock', type=int, default=None, help='Starting stock (defaults to enough for every decrement)')
+        parser.add_argument('--legacy', action='store_true', help='Also run the old get/modify/save decrement for comparison')
+
+    def handle(self, *args, **options):
+        try:
+            inventory = Inventory.objects.get(id=options['inventory'])
+        except Inventory.DoesNotExist:
+            raise CommandError(f"Inventory {options['inventory']} not found")
+
+        original = Inventory.objects.filter(pk=inventory.pk).values('quantity', 'low_stock_notified').get()
+        total = options['threads'] * options['operations'] * options['quantity']
+        # Keep the row above its threshold so the benchmark sends no low stock alerts
+        stock = options['stock'] if options['stock'] is not None else int(inventory.low_stock_threshold) + total + 1
+
+        try:
+            self.run('conditional update', inventory, stock, options, self.conditional_decrement)
+            if options['legacy']:
+                self.run('get/modify/save', inventory, stock, options, self.legacy_decrement)
+        finally:
+            self.set_quantity(inventory, **original)
+
+    def set_quantity(self, inventory, quantity, **fields):
+        """Overwrite the row's stock with a journaled adjustment so the ledger stays in step"""
+        quantity = Decimal(quantity)
+        with transaction.atomic():
+            current = Inventory.objects.select_for_update().values_list('quantity', flat=True).get(pk=inventory.pk)
+            Inventory.objects.filter(pk=inventory.pk).update(quantity=quantity, **fields)
+            record_movements(inventory.store_id, [(inventory.product_id, quantity - current, quantity)])
+
+    def conditional_decrement(self, inventory, quantity):
+        try:
+            decrement_stock(inventory.store_id, {inventory.product_id: quantity})
+            return True
+        except InsufficientStockError:
+            return False
+
+    def legacy_decrement(self, inventory, quantity):
+        row = Inventory.objects.get(pk=inventory.pk)
+        if row.quantity < quantity:
+            return False
+        row.quantity -= quantity
+        row.save()
+        return True
+
+    def run(self, label, inventory, stock, options, decrement):
+        self.set_quantity(inventory, stock, low_stock_notified=False)
+        succeeded = 0
+        lock = threading.Lock()
+
+        def worker():
+            nonlocal succeeded
+            done = 0
+            try:
+                for _ in range(options['operations']):
+                    if decrement(inventory, options['quantity']):
+                        done += 1
+            finally:
+                connection.close()
+            with lock:
+                succeeded += done
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            for future in [executor.submit(worker) for _ in range(options['threads'])]:
+                future.result()
+        elapsed = time.monotonic() - started
+
+        final = Inventory.objects.get(pk=inventory.pk).quantity
+        expected = Decimal(stock - succeeded * options['quantity'])
+        attempted = options['threads'] * options['operations']
+        summary = (
+            f'{label}: {succeeded}/{attempted} decrements in {elapsed:.2f}s '
+            f'({attempted / elapsed:.0f} ops/s), final stock {final}, expected {expected}'
+        )
+        if final == expected and final >= 0:
+            self.stdout.write(self.style.SUCCESS(summary))
+        else:
+            self.stdout.write(self.style.ERROR(f'{summary} (off by {final - expected}: lost updates or oversold)'))
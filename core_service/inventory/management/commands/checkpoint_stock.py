@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from companies.models.store import Store
+from inventory.ledger import create_checkpoint
+
+class Command(BaseCommand):
+    help = 'Folds the stock movement journal into per-store checkpoints. Run it periodically (e.g. nightly from cron).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--store', action='append', help='Store id to checkpoint (repeatable); defaults to every store')
+
+    def handle(self, *args, **options):
+        store_ids = options['store'] or Store.objects.values_list('id', flat=True)
+        stores = written = 0
+        for store_id in store_ids:
+            # Stores without movements since their last checkpoint are skipped
+            rows = create_checkpoint(store_id)
+            if rows:
+                stores += 1
+                written += rows
+        self.stdout.write(self.style.SUCCESS(f'Checkpointed {stores} store(s), {written} row(s)'))
@@ -0,0 +1,63 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from core_service.rabbitmq_client import RabbitMQClient
+from inventory.outbox import outbox_backlog, purge_published_events, relay_batch
+
+class Command(BaseCommand):
+    help = 'Publishes outbox events (low stock alerts) to RabbitMQ with publisher confirms.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Publish all pending events and exit instead of polling')
+        parser.add_argument('--batch-size', type=int, default=100, help='Events published per transaction')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait between polls when the outbox is empty')
+        parser.add_argument('--retention-days', type=int, default=7, help='Delete published events older than this many days')
+        parser.add_argument('--stats-interval', type=float, default=60.0, help='Seconds between backlog and publish latency reports')
+
+    def handle(self, *args, **options):
+        publisher = RabbitMQClient()
+        poll_interval = options['poll_interval']
+        last_purge = None
+        last_stats = time.monotonic()
+        self.stdout.write(self.style.SUCCESS('Starting outbox relay...'))
+
+        try:
+            while True:
+                close_old_connections()
+                published, failed = relay_batch(publisher, options['batch_size'])
+                if published:
+                    self.stdout.write(self.style.SUCCESS(f'Published {published} outbox event(s)'))
+
+                if last_purge is None or time.monotonic() - last_purge > 3600:
+                    purged = purge_published_events(options['retention_days'])
+                    if purged:
+                        self.stdout.write(f'Purged {purged} published outbox event(s)')
+                    last_purge = time.monotonic()
+
+                if time.monotonic() - last_stats > options['stats_interval']:
+                    self.report_stats(publisher)
+                    last_stats = time.monotonic()
+
+                if failed:
+                    self.stdout.write(self.style.ERROR('Publishing failed, pending events left in the outbox'))
+                elif published == options['batch_size']:
+                    continue
+                if options['once']:
+                    break
+                # Back off while the outbox is empty or the broker is failing
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Stopping outbox relay...'))
+        finally:
+            self.report_stats(publisher)
+            publisher.close()
+
+    def report_stats(self, publisher):
+        pending, oldest_age = outbox_backlog()
+        metrics = publisher.metrics.snapshot()
+        latency = metrics['publish_latency_ms']
+        self.stdout.write(
+            f"Outbox backlog: {pending} pending (oldest {oldest_age:.0f}s); "
+            f"published {metrics['published']}, failed {metrics['failed']}, "
+            f"publish latency p50 {latency['p50']}ms p95 {latency['p95']}ms max {latency['max']}ms"
+        )
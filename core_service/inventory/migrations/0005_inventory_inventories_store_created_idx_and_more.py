@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-17 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_stocktransfer'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventory',
+            index=models.Index(fields=['store', 'created_at', 'id'], name='inventories_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['store_id', 'created_at', 'id'], name='products_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stocktransfer',
+            index=models.Index(fields=['source_store', 'created_at', 'id'], name='transfers_source_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stocktransfer',
+            index=models.Index(fields=['destination_store', 'created_at', 'id'], name='transfers_dest_created_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.7 on 2026-10-17 18:05
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def record_opening_balances(apps, schema_editor):
+    # Start the journal from the quantities currently on hand
+    Inventory = apps.get_model('inventory', 'Inventory')
+    StockMovement = apps.get_model('inventory', 'StockMovement')
+    batch = []
+    for store_id, product_id, quantity in Inventory.objects.exclude(quantity=0).values_list(
+        'store_id', 'product_id', 'quantity'
+    ).iterator(chunk_size=2000):
+        batch.append(StockMovement(
+            store_id=store_id,
+            product_id=product_id,
+            quantity_change=quantity,
+            quantity_after=quantity,
+            reason='OPENING'
+        ))
+        if len(batch) >= 2000:
+            StockMovement.objects.bulk_create(batch)
+            batch = []
+    StockMovement.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_alter_store_name'),
+        ('inventory', '0006_outboxevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('quantity_change', models.DecimalField(decimal_places=4, max_digits=19)),
+                ('quantity_after', models.DecimalField(decimal_places=4, max_digits=19)),
+                ('reason', models.CharField(choices=[('OPENING', 'Opening balance'), ('SALE', 'Sale'), ('PURCHASE', 'Purchase'), ('TRANSFER', 'Stock transfer'), ('ADJUSTMENT', 'Manual adjustment'), ('DELETION', 'Inventory deleted')], max_length=20)),
+                ('reference_id', models.UUIDField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('product', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_movements', to='inventory.product')),
+                ('store', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_movements', to='companies.store')),
+            ],
+            options={
+                'db_table': 'stock_movements',
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(fields=['store', 'created_at', 'id'], name='stock_movements_store_idx'),
+                    models.Index(fields=['product', 'store', 'created_at'], name='stock_movements_product_idx'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockCheckpoint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('quantity', models.DecimalField(decimal_places=4, max_digits=19)),
+                ('taken_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('product', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_checkpoints', to='inventory.product')),
+                ('store', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_checkpoints', to='companies.store')),
+            ],
+            options={
+                'db_table': 'stock_checkpoints',
+                'ordering': ['-taken_at'],
+                'indexes': [models.Index(fields=['store', 'taken_at'], name='stock_checkpoints_store_idx')],
+                'unique_together': {('store', 'product', 'taken_at')},
+            },
+        ),
+        migrations.RunPython(record_opening_balances, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
 from .product import Product
 from .product_category import ProductCategory
 from .product_unit import ProductUnit
+from .outbox_event import OutboxEvent
+from .stock_movement import StockMovement
+from .stock_checkpoint import StockCheckpoint
 
-__all__ = ['Product', 'ProductCategory', 'ProductUnit']
\ No newline at end of file
+__all__ = ['Product', 'ProductCategory', 'ProductUnit', 'OutboxEvent', 'StockMovement', 'StockCheckpoint']
\ No newline at end of file
@@ -1,7 +1,7 @@
 from django.db import models
 import uuid
 from decimal import Decimal
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 import logging
@@ -32,6 +32,9 @@ class Inventory(models.Model):
 
     class Meta:
         db_table = 'inventories'
+        indexes = [
+            models.Index(fields=['store', 'created_at', 'id'], name='inventories_store_created_idx'),
+        ]
         ordering = ['-created_at']
         unique_together = ['product', 'store']
 
@@ -41,9 +44,11 @@ class Inventory(models.Model):
 @receiver(pre_save, sender=Inventory)
 def check_stock_level_change(sender, instance, **kwargs):
     """Check if stock is crossing the threshold"""
+    instance._previous_quantity = Decimal('0')
     if instance.pk:  # Only for updates
         try:
             old_instance = Inventory.objects.get(pk=instance.pk)
+            instance._previous_quantity = old_instance.quantity
             
             # Reset notification flag if stock goes above threshold
             if instance.quantity > instance.low_stock_threshold:
@@ -61,32 +66,55 @@ def check_stock_level_change(sender, instance, **kwargs):
         except Inventory.DoesNotExist:
             pass
 
+def notify_low_stock(inventory):
+    """
+    Queue a low stock alert for an inventory row in the outbox and mark the row as
+    notified. Runs in the caller's transaction, so the alert is only sent if the
+    stock change commits; the relay_outbox command publishes it.
+    """
+    # Import here to avoid circular imports
+    from inventory.outbox import LOW_STOCK_ROUTING_KEY, enqueue_event
+
+    enqueue_event(LOW_STOCK_ROUTING_KEY, {
+        'type': 'low_stock_alert',
+        'inventory_id': str(inventory.id),
+        'product_name': inventory.product.name,
+        'store_name': inventory.store.name,
+        'current_quantity': float(inventory.quantity),
+        'threshold': float(inventory.low_stock_threshold),
+        'store_id': str(inventory.store.id),
+        'company_id': str(inventory.store.company_id.id),
+        'timestamp': timezone.now().isoformat()
+    })
+    Inventory.objects.filter(pk=inventory.pk).update(low_stock_notified=True)
+    logger.info(f"Low stock notification queued for {inventory.product.name}")
+
 @receiver(post_save, sender=Inventory)
 def handle_low_stock_notification(sender, instance, created, **kwargs):
     """Send notification if stock is low"""
     if hasattr(instance, '_should_notify') and instance._should_notify:
-        # Import here to avoid circular imports
-        from core_service.rabbitmq_client import rabbitmq_client
-        
-        print(instance.store.company_id.id)
-        # Prepare data for notification
-        notification_data = {
-            'inventory_id': str(instance.id),
-            'product_name': instance.product.name,
-            'store_name': instance.store.name,
-            'current_quantity': float(instance.quantity),
-            'threshold': float(instance.low_stock_threshold),
-            'store_id': str(instance.store.id),
-            'company_id': str(instance.store.company_id.id),
-            'timestamp': timezone.now().isoformat()
-        }
-        
-        # Send notification
-        success = rabbitmq_client.send_low_stock_notification(notification_data)
-        
-        if success:
-            # Mark as notified
-            Inventory.objects.filter(pk=instance.pk).update(low_stock_notified=True)
-            logger.info(f"Low stock notification sent for {instance.product.name}")
-        else:
-            logger.error(f"Failed to send notification for {instance.product.name}")
\ No newline at end of file
+        notify_low_stock(instance)
+
+@receiver(post_save, sender=Inventory)
+def record_stock_movement(sender, instance, created, raw=False, **kwargs):
+    """Journal the quantity change made by this save"""
+    # Import here to avoid circular imports
+    from inventory.ledger import record_movements
+
+    if raw or not hasattr(instance, '_previous_quantity'):
+        return
+    quantity = Decimal(str(instance.quantity))
+    record_movements(instance.store_id, [(instance.product_id, quantity - instance._previous_quantity, quantity)])
+    del instance._previous_quantity
+
+@receiver(post_delete, sender=Inventory)
+def record_stock_removal(sender, instance, **kwargs):
+    """Journal the stock that disappears with a deleted inventory row"""
+    from inventory.ledger import record_movements
+    from inventory.models.stock_movement import StockMovement
+
+    record_movements(
+        instance.store_id,
+        [(instance.product_id, -instance.quantity, Decimal('0'))],
+        reason=StockMovement.Reason.DELETION
+    )
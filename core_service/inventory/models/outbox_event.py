@@ -0,0 +1,28 @@
+from django.db import models
+from django.db.models import Q
+import uuid
+
+class OutboxEvent(models.Model):
+    """
+    A message waiting to be published to RabbitMQ. Rows are written in the same
+    transaction as the change that caused them, so an event exists if and only if
+    that change committed; the relay_outbox command publishes them afterwards.
+    """
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
+    routing_key = models.CharField(max_length=100)
+    payload = models.JSONField()
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    published_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'outbox_events'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='outbox_unpublished_idx', condition=Q(published_at__isnull=True)),
+        ]
+
+    def __str__(self):
+        return f"{self.routing_key} event {self.id}"
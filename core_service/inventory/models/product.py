@@ -21,6 +21,9 @@ class Product(models.Model):
 
   class Meta:
     db_table = 'products'
+    indexes = [
+      models.Index(fields=['store_id', 'created_at', 'id'], name='products_store_created_idx'),
+    ]
     unique_together = ['store_id', 'name']
 
  
@@ -0,0 +1,36 @@
+from django.db import models
+import uuid
+
+class StockCheckpoint(models.Model):
+    """
+    A product's stock in a store as of taken_at, folded from the StockMovement
+    journal by the checkpoint_stock command. Each run writes one row per product
+    with stock for a store, all sharing the same taken_at.
+    """
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
+    store = models.ForeignKey(
+        'companies.Store',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='stock_checkpoints'
+    )
+    product = models.ForeignKey(
+        'inventory.Product',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='stock_checkpoints'
+    )
+    quantity = models.DecimalField(max_digits=19, decimal_places=4)
+    taken_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'stock_checkpoints'
+        ordering = ['-taken_at']
+        indexes = [
+            models.Index(fields=['store', 'taken_at'], name='stock_checkpoints_store_idx'),
+        ]
+        unique_together = ['store', 'product', 'taken_at']
+
+    def __str__(self):
+        return f"{self.product_id} at {self.store_id}: {self.quantity} as of {self.taken_at}"
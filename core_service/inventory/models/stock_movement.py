@@ -0,0 +1,56 @@
+from django.db import models
+import uuid
+
+class StockMovement(models.Model):
+    """
+    One change to a store's stock of a product. The journal is append-only: rows are
+    never updated or deleted, and they outlive the inventory row, product or store
+    they describe (the foreign keys are not enforced). Stock at any moment is the
+    latest StockCheckpoint before it plus the movements since.
+    """
+    class Reason(models.TextChoices):
+        OPENING = 'OPENING', 'Opening balance'
+        SALE = 'SALE', 'Sale'
+        PURCHASE = 'PURCHASE', 'Purchase'
+        TRANSFER = 'TRANSFER', 'Stock transfer'
+        ADJUSTMENT = 'ADJUSTMENT', 'Manual adjustment'
+        DELETION = 'DELETION', 'Inventory deleted'
+
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
+    store = models.ForeignKey(
+        'companies.Store',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='stock_movements'
+    )
+    product = models.ForeignKey(
+        'inventory.Product',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='stock_movements'
+    )
+    quantity_change = models.DecimalField(max_digits=19, decimal_places=4)
+    quantity_after = models.DecimalField(max_digits=19, decimal_places=4)
+    reason = models.CharField(max_length=20, choices=Reason.choices)
+    # Id of the sale, purchase or transfer behind the movement, if any
+    reference_id = models.UUIDField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'stock_movements'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['store', 'created_at', 'id'], name='stock_movements_store_idx'),
+            models.Index(fields=['product', 'store', 'created_at'], name='stock_movements_product_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Stock movements are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Stock movements are append-only")
+
+    def __str__(self):
+        return f"{self.reason} {self.quantity_change:+} of {self.product_id} at {self.store_id}"
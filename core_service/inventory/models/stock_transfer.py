@@ -43,6 +43,10 @@ class StockTransfer(models.Model):
     
     class Meta:
         db_table = 'stock_transfers'
+        indexes = [
+            models.Index(fields=['source_store', 'created_at', 'id'], name='transfers_source_created_idx'),
+            models.Index(fields=['destination_store', 'created_at', 'id'], name='transfers_dest_created_idx'),
+        ]
         ordering = ['-created_at']
 
 
@@ -0,0 +1,75 @@
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from inventory.models.outbox_event import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+LOW_STOCK_ROUTING_KEY = 'low_stock_notifications'
+
+
+def enqueue_event(routing_key, payload):
+    """
+    Record a message for the relay to publish. Call it inside the transaction that
+    makes the change: the event commits or rolls back with it.
+    """
+    return OutboxEvent.objects.create(routing_key=routing_key, payload=payload)
+
+
+def relay_batch(publisher, batch_size=100):
+    """
+    Publish up to batch_size pending events, oldest first, and mark them published.
+    publisher.publish_batch([(routing_key, payload), ...]) must publish in order with
+    broker confirms and return (confirmed_count, error). The batch stops at the first
+    failure so events keep their order; the failed event is retried on the next call.
+    Delivery is at-least-once: an event whose confirmation arrives just before a
+    crash is published again.
+    Returns (published, failed) counts.
+    """
+    with transaction.atomic():
+        # SKIP LOCKED lets several relays drain the table without double-publishing
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True).filter(
+                published_at__isnull=True
+            ).order_by('created_at')[:batch_size]
+        )
+        if not events:
+            return 0, 0
+
+        confirmed, error = publisher.publish_batch([(event.routing_key, event.payload) for event in events])
+        now = timezone.now()
+
+        if confirmed:
+            OutboxEvent.objects.filter(pk__in=[event.pk for event in events[:confirmed]]).update(
+                published_at=now,
+                attempts=F('attempts') + 1,
+                last_error='',
+                updated_at=now
+            )
+        if error is not None:
+            failed_event = events[confirmed]
+            logger.warning(f"Failed to publish outbox event {failed_event.id}: {error}")
+            OutboxEvent.objects.filter(pk=failed_event.pk).update(
+                attempts=F('attempts') + 1,
+                last_error=str(error),
+                updated_at=now
+            )
+
+    return confirmed, 0 if error is None else 1
+
+
+def outbox_backlog():
+    """Number of unpublished events and the age in seconds of the oldest one"""
+    pending = OutboxEvent.objects.filter(published_at__isnull=True)
+    oldest = pending.order_by('created_at').values_list('created_at', flat=True).first()
+    age = (timezone.now() - oldest).total_seconds() if oldest else 0
+    return pending.count(), age
+
+
+def purge_published_events(retention_days=7):
+    """Delete events published more than retention_days ago"""
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted, _ = OutboxEvent.objects.filter(published_at__lt=cutoff).delete()
+    return deleted
@@ -9,6 +9,15 @@ from companies.serializers.store import StoreSerializer
 from inventory.serializers.product_unit import ProductUnitSerializer
 from inventory.serializers.product_category import ProductCategorySerializer
 
+# Relations read by ProductSerializer, for select_related on product querysets
+PRODUCT_RELATED_FIELDS = (
+    'product_unit',
+    'product_category',
+    'color_id',
+    'collection_id__store_id',
+    'collection_id__season_id',
+)
+
 class ProductSerializer(serializers.ModelSerializer):
    
     product_unit = ProductUnitSerializer(read_only=True)
@@ -48,13 +57,11 @@ class ProductSerializer(serializers.ModelSerializer):
         
     def get_color(self, obj):
         """Get the color details"""
-        color = Color.objects.get(id=obj.color_id.id)
-        return ColorSerializer(color).data
+        return ColorSerializer(obj.color_id).data
         
     def get_collection(self, obj):
         """Get the collection details"""
-        collection = Collection.objects.get(id=obj.collection_id.id)
-        return CollectionSerializer(collection).data
+        return CollectionSerializer(obj.collection_id).data
 
     def validate(self, attrs):
         sale_price = attrs.get('sale_price')
@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from inventory.models.stock_movement import StockMovement
+
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source='product.name', read_only=True, default=None)
+
+    class Meta:
+        model = StockMovement
+        fields = [
+            'id', 'store_id', 'product_id', 'product_name', 'quantity_change',
+            'quantity_after', 'reason', 'reference_id', 'created_at'
+        ]
+        read_only_fields = fields
@@ -4,6 +4,8 @@ from decimal import Decimal
 from inventory.models.stock_transfer import StockTransfer
 from inventory.models.inventory import Inventory
 from inventory.models.product import Product
+from inventory.models.stock_movement import StockMovement
+from inventory.ledger import stock_movement_reason
 
 class StockTransferSerializer(serializers.ModelSerializer):
     class Meta:
@@ -84,22 +86,23 @@ class StockTransferSerializer(serializers.ModelSerializer):
         # Create the transfer record
         transfer = StockTransfer.objects.create(**validated_data)
         
-        # Update source inventory
-        source_inventory = Inventory.objects.select_for_update().get(
-            store=validated_data['source_store'],
-            product=validated_data['product']
-        )
-        source_inventory.quantity -= Decimal(str(validated_data['quantity']))
-        source_inventory.save()
-
-        # Create or update destination inventory
-        destination_inventory, created = Inventory.objects.select_for_update().get_or_create(
-            store=validated_data['destination_store'],
-            product=destination_product,
-            defaults={'quantity': Decimal('0')}
-        )
-        destination_inventory.quantity += Decimal(str(validated_data['quantity']))
-        destination_inventory.save()
+        with stock_movement_reason(StockMovement.Reason.TRANSFER, transfer.id):
+            # Update source inventory
+            source_inventory = Inventory.objects.select_for_update().get(
+                store=validated_data['source_store'],
+                product=validated_data['product']
+            )
+            source_inventory.quantity -= Decimal(str(validated_data['quantity']))
+            source_inventory.save()
+
+            # Create or update destination inventory
+            destination_inventory, created = Inventory.objects.select_for_update().get_or_create(
+                store=validated_data['destination_store'],
+                product=destination_product,
+                defaults={'quantity': Decimal('0')}
+            )
+            destination_inventory.quantity += Decimal(str(validated_data['quantity']))
+            destination_inventory.save()
 
         # Mark transfer as completed
         transfer.status = StockTransfer.COMPLETED
@@ -121,38 +124,39 @@ class StockTransferSerializer(serializers.ModelSerializer):
             validated_data['destination_store']
         )
 
-        # Revert old source inventory
-        old_source_inventory = Inventory.objects.select_for_update().get(
-            store=instance.source_store,
-            product=instance.product
-        )
-        old_source_inventory.quantity += Decimal(str(instance.quantity))
-        old_source_inventory.save()
+        with stock_movement_reason(StockMovement.Reason.TRANSFER, instance.id):
+            # Revert old source inventory
+            old_source_inventory = Inventory.objects.select_for_update().get(
+                store=instance.source_store,
+                product=instance.product
+            )
+            old_source_inventory.quantity += Decimal(str(instance.quantity))
+            old_source_inventory.save()
 
-        # Revert old destination inventory
-        old_destination_inventory = Inventory.objects.select_for_update().get(
-            store=instance.destination_store,
-            product=instance.product
-        )
-        old_destination_inventory.quantity -= Decimal(str(instance.quantity))
-        old_destination_inventory.save()
+            # Revert old destination inventory
+            old_destination_inventory = Inventory.objects.select_for_update().get(
+                store=instance.destination_store,
+                product=instance.product
+            )
+            old_destination_inventory.quantity -= Decimal(str(instance.quantity))
+            old_destination_inventory.save()
 
-        # Apply new transfer quantities
-        new_source_inventory = Inventory.objects.select_for_update().get(
-            store=validated_data['source_store'],
-            product=validated_data['product']
-        )
-        new_source_inventory.quantity -= Decimal(str(validated_data['quantity']))
-        new_source_inventory.save()
-
-        # Create or update new destination inventory
-        new_destination_inventory, created = Inventory.objects.select_for_update().get_or_create(
-            store=validated_data['destination_store'],
-            product=destination_product,
-            defaults={'quantity': Decimal('0')}
-        )
-        new_destination_inventory.quantity += Decimal(str(validated_data['quantity']))
-        new_destination_inventory.save()
+            # Apply new transfer quantities
+            new_source_inventory = Inventory.objects.select_for_update().get(
+                store=validated_data['source_store'],
+                product=validated_data['product']
+            )
+            new_source_inventory.quantity -= Decimal(str(validated_data['quantity']))
+            new_source_inventory.save()
+
+            # Create or update new destination inventory
+            new_destination_inventory, created = Inventory.objects.select_for_update().get_or_create(
+                store=validated_data['destination_store'],
+                product=destination_product,
+                defaults={'quantity': Decimal('0')}
+            )
+            new_destination_inventory.quantity += Decimal(str(validated_data['quantity']))
+            new_destination_inventory.save()
 
         # Update the transfer record
         for attr, value in validated_data.items():
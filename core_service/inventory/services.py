@@ -0,0 +1,124 @@
+from decimal import Decimal
+from django.db import connection, transaction
+from django.utils import timezone
+from inventory.ledger import record_movements
+from inventory.models.inventory import Inventory, notify_low_stock
+
+
+class MissingInventoryError(Exception):
+    pass
+
+
+class InsufficientStockError(Exception):
+    def __init__(self, product_ids):
+        self.product_ids = product_ids
+        super().__init__(f"Insufficient inventory for products {', '.join(str(product_id) for product_id in product_ids)}")
+
+
+# One conditional UPDATE for a whole batch of lines. Each row is only touched if it
+# still holds enough stock, so concurrent sales never oversell or lose an update:
+# the row lock is held just for the statement and no read-modify-write happens in Python.
+# low_stock_notified is reset when the row ends up above its threshold, as the
+# Inventory pre_save signal does for saves.
+_ADJUST_STOCK_SQL = """
+    UPDATE inventories AS inv
+    SET quantity = inv.quantity + lines.delta,
+        low_stock_notified = CASE
+            WHEN inv.quantity + lines.delta > inv.low_stock_threshold THEN FALSE
+            ELSE inv.low_stock_notified
+        END,
+        updated_at = %s
+    FROM (VALUES {values}) AS lines (product_id, delta)
+    WHERE inv.store_id = %s
+      AND inv.product_id = lines.product_id
+      AND (lines.delta >= 0 OR inv.quantity + lines.delta >= 0)
+    RETURNING inv.id, inv.product_id, inv.quantity, inv.quantity - lines.delta,
+              inv.low_stock_threshold, inv.low_stock_notified
+"""
+
+
+def _adjust_stock(store_id, deltas):
+    """
+    Apply signed quantity deltas ({product_id: delta}) to a store's inventory and
+    return one (id, product_id, quantity, previous_quantity, threshold, notified)
+    row per line that could be applied.
+    """
+    # Lines are sorted so concurrent batches lock rows in the same order
+    lines = sorted(deltas.items(), key=lambda line: str(line[0]))
+    values = ', '.join(['(%s::uuid, %s::numeric)'] * len(lines))
+    params = [timezone.now()]
+    for product_id, delta in lines:
+        params.extend([str(product_id), Decimal(delta)])
+    params.append(str(store_id))
+
+    with connection.cursor() as cursor:
+        cursor.execute(_ADJUST_STOCK_SQL.format(values=values), params)
+        return cursor.fetchall()
+
+
+def _record_rows(store_id, rows):
+    """Journal the changes made by _adjust_stock, which bypasses the Inventory save signals"""
+    record_movements(store_id, [
+        (product_id, quantity - previous_quantity, quantity)
+        for _, product_id, quantity, previous_quantity, _, _ in rows
+    ])
+
+
+def _notify_crossings(rows):
+    """Queue a low stock alert in the outbox for each row that crossed its threshold"""
+    crossed = [
+        inventory_id
+        for inventory_id, _, quantity, previous_quantity, threshold, notified in rows
+        if previous_quantity > threshold and quantity <= threshold and not notified
+    ]
+    if not crossed:
+        return
+
+    for inventory in Inventory.objects.filter(pk__in=crossed).select_related('product', 'store__company_id'):
+        notify_low_stock(inventory)
+
+
+def decrement_stock(store, quantities):
+    """
+    Reserve and take the given quantities ({product_id: quantity}) out of a store's
+    inventory. All lines are applied or none are: if any product has no inventory
+    row or not enough stock, nothing changes and MissingInventoryError or
+    InsufficientStockError is raised.
+    Returns {product_id: remaining quantity}.
+    """
+    store_id = getattr(store, 'pk', store)
+    with transaction.atomic():
+        rows = _adjust_stock(store_id, {product_id: -Decimal(quantity) for product_id, quantity in quantities.items()})
+        if len(rows) < len(quantities):
+            applied = {str(row[1]) for row in rows}
+            failed = [product_id for product_id in quantities if str(product_id) not in applied]
+            existing = {
+                str(product_id)
+                for product_id in Inventory.objects.filter(store_id=store_id, product_id__in=failed).values_list('product_id', flat=True)
+            }
+            missing = [product_id for product_id in failed if str(product_id) not in existing]
+            # Raising rolls back the lines that were applied
+            if missing:
+                raise MissingInventoryError(f"No inventory record found for products {', '.join(str(product_id) for product_id in missing)}")
+            raise InsufficientStockError(failed)
+
+        _record_rows(store_id, rows)
+        _notify_crossings(rows)
+    return {row[1]: row[2] for row in rows}
+
+
+def increment_stock(store, quantities):
+    """
+    Return the given quantities ({product_id: quantity}) to a store's inventory.
+    Raises MissingInventoryError if a product has no inventory row.
+    Returns {product_id: new quantity}.
+    """
+    store_id = getattr(store, 'pk', store)
+    with transaction.atomic():
+        rows = _adjust_stock(store_id, {product_id: Decimal(quantity) for product_id, quantity in quantities.items()})
+        if len(rows) < len(quantities):
+            applied = {str(row[1]) for row in rows}
+            missing = [product_id for product_id in quantities if str(product_id) not in applied]
+            raise MissingInventoryError(f"No inventory record found for products {', '.join(str(product_id) for product_id in missing)}")
+        _record_rows(store_id, rows)
+    return {row[1]: row[2] for row in rows}
@@ -1,3 +1,180 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from clothings.models import Collection, Color, Season
+from companies.models.company import Company
+from companies.models.store import Store
+from inventory.ledger import create_checkpoint, stock_at, stock_movement_reason
+from inventory.models.inventory import Inventory
+from inventory.models.product import Product
+from inventory.models.product_category import ProductCategory
+from inventory.models.product_unit import ProductUnit
+from inventory.models.stock_checkpoint import StockCheckpoint
+from inventory.models.stock_movement import StockMovement
+from inventory.views.inventory import InventoryListView
+from inventory.views.product import ProductListView
 
-# Create your tests here.
+
+class ListQueryCountTests(TestCase):
+    """The product and inventory lists must cost a constant number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name='Query Count Co')
+        cls.store = Store.objects.create(company_id=company, name='Query Count Store', location='Nairobi')
+        unit = ProductUnit.objects.create(store_id=cls.store, name='Piece')
+        category = ProductCategory.objects.create(store_id=cls.store, name='Shirts')
+        season = Season.objects.create(store_id=cls.store, name='Summer', start_date=date(2025, 1, 1), end_date=date(2025, 6, 30))
+        collection = Collection.objects.create(store_id=cls.store, season_id=season, name='Linen', release_date=date(2025, 1, 1))
+
+        for i in range(30):
+            color = Color.objects.create(store_id=cls.store, name=f'Color {i}', color_code=f'#{i:06d}')
+            product = Product.objects.create(
+                store_id=cls.store,
+                color_id=color,
+                collection_id=collection,
+                name=f'Product {i}',
+                product_unit=unit,
+                product_category=category,
+                purchase_price=Decimal('10'),
+                sale_price=Decimal('15')
+            )
+            Inventory.objects.create(product=product, store=cls.store, quantity=Decimal('100'))
+
+    def get(self, view, path):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=SimpleNamespace(is_authenticated=True))
+        return view.as_view()(request, store_id=self.store.id)
+
+    def test_product_list_query_count(self):
+        with self.assertNumQueries(1):
+            response = self.get(ProductListView, '/products/?page_size=30')
+        self.assertEqual(len(response.data['results']), 30)
+
+    def test_unpaginated_product_list_query_count(self):
+        with self.assertNumQueries(1):
+            response = self.get(ProductListView, '/products/?paginate=false')
+        self.assertEqual(len(response.data), 30)
+
+    def test_inventory_list_query_count(self):
+        with self.assertNumQueries(1):
+            response = self.get(InventoryListView, '/inventories/?page_size=30')
+        self.assertEqual(len(response.data['results']), 30)
+        self.assertEqual(response.data['results'][0]['product']['collection']['season']['name'], 'Summer')
+
+
+class KeysetPaginationTests(TestCase):
+    """List pages follow (created_at, id) and never skip or repeat rows"""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name='Pagination Co')
+        cls.store = Store.objects.create(company_id=company, name='Pagination Store', location='Nairobi')
+        unit = ProductUnit.objects.create(store_id=cls.store, name='Piece')
+        category = ProductCategory.objects.create(store_id=cls.store, name='Shirts')
+        season = Season.objects.create(store_id=cls.store, name='Summer', start_date=date(2025, 1, 1), end_date=date(2025, 6, 30))
+        collection = Collection.objects.create(store_id=cls.store, season_id=season, name='Linen', release_date=date(2025, 1, 1))
+
+        for i in range(7):
+            color = Color.objects.create(store_id=cls.store, name=f'Color {i}', color_code=f'#{i:06d}')
+            Product.objects.create(
+                store_id=cls.store,
+                color_id=color,
+                collection_id=collection,
+                name=f'Product {i}',
+                product_unit=unit,
+                product_category=category,
+                purchase_price=Decimal('10'),
+                sale_price=Decimal('15')
+            )
+        # Five of the seven products share a timestamp, so pages must break ties on id
+        created_at = timezone.now()
+        products = list(Product.objects.filter(store_id=cls.store).order_by('name'))
+        for product, offset in zip(products, (0, 0, 0, 0, 0, 1, 2)):
+            Product.objects.filter(pk=product.pk).update(created_at=created_at - timedelta(seconds=offset))
+
+    def get(self, path):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=SimpleNamespace(is_authenticated=True))
+        return ProductListView.as_view()(request, store_id=self.store.id)
+
+    def test_walk_pages_with_tied_timestamps(self):
+        seen = []
+        path = '/products/?page_size=3'
+        pages = 0
+        while path:
+            response = self.get(path)
+            self.assertEqual(response.status_code, 200)
+            seen += [product['id'] for product in response.data['results']]
+            path = response.data['next']
+            pages += 1
+
+        self.assertEqual(pages, 3)
+        expected = Product.objects.filter(store_id=self.store).order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual(seen, [str(pk) for pk in expected])
+
+    def test_second_page_from_next_link(self):
+        first = self.get('/products/?page_size=4')
+        cursor = parse_qs(urlparse(first.data['next']).query)['cursor'][0]
+
+        second = self.get(f'/products/?page_size=4&cursor={cursor}')
+        self.assertEqual(len(second.data['results']), 3)
+        self.assertIsNone(second.data['next'])
+        first_ids = {product['id'] for product in first.data['results']}
+        self.assertFalse(first_ids & {product['id'] for product in second.data['results']})
+
+    def test_invalid_cursor(self):
+        response = self.get('/products/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+
+class StockLedgerTests(TestCase):
+    """Every stock change is journaled and past stock is rebuilt from checkpoints"""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name='Ledger Co')
+        cls.store = Store.objects.create(company_id=company, name='Ledger Store', location='Nairobi')
+        unit = ProductUnit.objects.create(store_id=cls.store, name='Piece')
+        category = ProductCategory.objects.create(store_id=cls.store, name='Shirts')
+        season = Season.objects.create(store_id=cls.store, name='Summer', start_date=date(2025, 1, 1), end_date=date(2025, 6, 30))
+        collection = Collection.objects.create(store_id=cls.store, season_id=season, name='Linen', release_date=date(2025, 1, 1))
+        color = Color.objects.create(store_id=cls.store, name='Blue', color_code='#0000ff')
+        cls.product = Product.objects.create(
+            store_id=cls.store,
+            color_id=color,
+            collection_id=collection,
+            name='Product',
+            product_unit=unit,
+            product_category=category,
+            purchase_price=Decimal('10'),
+            sale_price=Decimal('15')
+        )
+
+    def test_movements_and_checkpoints(self):
+        inventory = Inventory.objects.create(product=self.product, store=self.store, quantity=Decimal('100'))
+        with stock_movement_reason(StockMovement.Reason.SALE):
+            inventory.quantity = Decimal('70')
+            inventory.save()
+        after_sale = timezone.now()
+
+        movements = list(StockMovement.objects.filter(store=self.store).order_by('created_at'))
+        self.assertEqual([m.reason for m in movements], [StockMovement.Reason.ADJUSTMENT, StockMovement.Reason.SALE])
+        self.assertEqual([m.quantity_change for m in movements], [Decimal('100'), Decimal('-30')])
+
+        self.assertEqual(create_checkpoint(self.store, at=after_sale), 1)
+        # Nothing moved since, so a second run writes nothing
+        self.assertEqual(create_checkpoint(self.store, at=timezone.now()), 0)
+        self.assertEqual(StockCheckpoint.objects.get(store=self.store).quantity, Decimal('70'))
+
+        inventory.quantity = Decimal('75')
+        inventory.save()
+        self.assertEqual(stock_at(self.store, after_sale), {self.product.id: Decimal('70')})
+        self.assertEqual(stock_at(self.store, timezone.now()), {self.product.id: Decimal('75')})
+
+        inventory.delete()
+        self.assertEqual(stock_at(self.store, timezone.now()), {})
@@ -10,6 +10,7 @@ from inventory.views import (
 from inventory.views.inventory import InventoryListView, InventoryDetailView
 from inventory.views.product_search import ProductSearchView
 from inventory.views.stock_transfer import StockTransferListView, StockTransferDetailView
+from inventory.views.stock_movement import StockMovementListView, InventoryHistoryView
 
 urlpatterns = [
     # Product URLs
@@ -26,12 +27,16 @@ urlpatterns = [
     
     # Inventory URLs
     path('stores/<uuid:store_id>/inventories/', InventoryListView.as_view(), name='inventory-list'),
+    path('stores/<uuid:store_id>/inventories/history/', InventoryHistoryView.as_view(), name='inventory-history'),
     path('stores/<uuid:store_id>/inventories/<uuid:id>/', InventoryDetailView.as_view(), name='inventory-detail'),
 
     # Stock Transfer URLs
     path('stores/<uuid:store_id>/transfers/', StockTransferListView.as_view(), name='stock-transfer-list'),
     path('stores/<uuid:store_id>/transfers/<uuid:id>/', StockTransferDetailView.as_view(), name='stock-transfer-detail'),
 
+    # Stock Movement URLs
+    path('stores/<uuid:store_id>/stock-movements/', StockMovementListView.as_view(), name='stock-movement-list'),
+
     # Product Search URL
     path('companies/<uuid:company_id>/product-search/<str:search_term>/', ProductSearchView.as_view(), name='product-search-with-term'),
 ] 
\ No newline at end of file
@@ -7,18 +7,23 @@ from rest_framework.request import Request
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from inventory.models.inventory import Inventory
 from inventory.serializers.inventory import InventorySerializer
+from inventory.serializers.product import PRODUCT_RELATED_FIELDS
 from companies.models.store import Store
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 
 class InventoryListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all inventory items for a specific store",
-        responses={200: InventorySerializer(many=True)}
+        responses={200: keyset_page_serializer(InventorySerializer)}
     )
     def get(self, request: Request, store_id):
-        inventories = Inventory.objects.filter(store_id=store_id)
-        serializer = InventorySerializer(inventories, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        inventories = Inventory.objects.filter(store_id=store_id).select_related(
+            'store',
+            *(f'product__{field}' for field in PRODUCT_RELATED_FIELDS)
+        )
+        return paginated_list_response(request, inventories, InventorySerializer, view=self)
     
     @extend_schema(
         description="Create a new inventory item for a specific store",
@@ -11,17 +11,19 @@ from inventory.models.inventory import Inventory
 from companies.models.store import Store
 from inventory.models.product import Product
 from inventory.serializers.product import ProductSerializer
+from inventory.serializers.product import PRODUCT_RELATED_FIELDS
 import os
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 class ProductListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all products for a specific store",
-        responses={200: ProductSerializer(many=True)}
+        responses={200: keyset_page_serializer(ProductSerializer)}
     )
     def get(self, request: Request, store_id):
-        products = Product.objects.filter(store_id_id=store_id)
-        serializer = ProductSerializer(products, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        products = Product.objects.filter(store_id_id=store_id).select_related(*PRODUCT_RELATED_FIELDS)
+        return paginated_list_response(request, products, ProductSerializer, view=self)
     
     @extend_schema(
         description="Create a new product and initialize inventory for the store",
@@ -0,0 +1,89 @@
+#type:ignore
+from datetime import datetime, time
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.request import Request
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+from inventory.ledger import stock_value_at
+from inventory.models.product import Product
+from inventory.models.stock_movement import StockMovement
+from inventory.serializers.stock_movement import StockMovementSerializer
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
+
+
+def parse_point_in_time(value):
+    """
+    ISO datetime or date from a query parameter; a bare date means the end of
+    that day. Returns None if the value cannot be parsed.
+    """
+    try:
+        at = parse_datetime(value)
+        if at is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            at = datetime.combine(day, time.max)
+    except ValueError:
+        return None
+    if timezone.is_naive(at):
+        at = timezone.make_aware(at)
+    return at
+
+
+class StockMovementListView(APIView):
+    @extend_schema(
+        parameters=[
+            *KEYSET_PAGINATION_PARAMETERS,
+            OpenApiParameter(name='product_id', type=str, description='Only movements of this product'),
+            OpenApiParameter(name='reason', type=str, description='Only movements with this reason'),
+        ],
+        description="Get the stock movement journal of a specific store, newest first",
+        responses={200: keyset_page_serializer(StockMovementSerializer)}
+    )
+    def get(self, request: Request, store_id):
+        movements = StockMovement.objects.filter(store_id=store_id).select_related('product')
+        if request.query_params.get('product_id'):
+            movements = movements.filter(product_id=request.query_params['product_id'])
+        if request.query_params.get('reason'):
+            movements = movements.filter(reason=request.query_params['reason'])
+        return paginated_list_response(request, movements, StockMovementSerializer, view=self)
+
+
+class InventoryHistoryView(APIView):
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='at', type=str, required=True, description='ISO datetime, or a date for the end of that day'),
+        ],
+        description="Get a store's stock and its value at a past point in time",
+        responses={
+            200: OpenApiResponse(description="Stock held at the given time"),
+            400: OpenApiResponse(description="Missing or invalid 'at' parameter")
+        }
+    )
+    def get(self, request: Request, store_id):
+        at = parse_point_in_time(request.query_params.get('at', ''))
+        if at is None:
+            return Response(
+                data={'error': "Query parameter 'at' must be an ISO date or datetime"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        value, quantities = stock_value_at(store_id, at)
+        names = dict(Product.objects.filter(pk__in=quantities).values_list('id', 'name'))
+        products = [
+            {
+                'product_id': product_id,
+                'product_name': names.get(product_id),
+                'quantity': float(quantity)
+            }
+            for product_id, quantity in quantities.items()
+        ]
+        products.sort(key=lambda product: product['product_name'] or '')
+        return Response(data={
+            'at': at,
+            'stock_value': float(value),
+            'products': products
+        }, status=status.HTTP_200_OK)
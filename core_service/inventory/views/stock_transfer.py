@@ -10,7 +10,10 @@ from decimal import Decimal
 from inventory.models.stock_transfer import StockTransfer
 from inventory.serializers.stock_transfer import StockTransferSerializer
 from inventory.models.inventory import Inventory
+from inventory.models.stock_movement import StockMovement
+from inventory.ledger import stock_movement_reason
 from django.db import transaction
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 class StockTransferListView(APIView):
 
@@ -23,9 +26,9 @@ class StockTransferListView(APIView):
                 location=OpenApiParameter.PATH,
                 description="UUID of the store to get transfers for"
             )
-        ],
+        ] + KEYSET_PAGINATION_PARAMETERS,
         responses={
-            200: StockTransferSerializer(many=True),
+            200: keyset_page_serializer(StockTransferSerializer),
             404: OpenApiResponse(description="Store not found")
         }
     )
@@ -33,8 +36,7 @@ class StockTransferListView(APIView):
         transfers = StockTransfer.objects.filter(
             Q(source_store=store_id) | Q(destination_store=store_id)
         ).select_related('source_store', 'destination_store', 'product')
-        serializer = StockTransferSerializer(transfers, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginated_list_response(request, transfers, StockTransferSerializer, view=self)
     
     @extend_schema(
         description="Create a new stock transfer from this store to another store",
@@ -171,21 +173,22 @@ class StockTransferDetailView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Return the quantity to source inventory
-        source_inventory = Inventory.objects.select_for_update().get(
-            store=transfer.source_store,
-            product=transfer.product
-        )
-        source_inventory.quantity += Decimal(str(transfer.quantity))
-        source_inventory.save()
+        with stock_movement_reason(StockMovement.Reason.TRANSFER, transfer.id):
+            # Return the quantity to source inventory
+            source_inventory = Inventory.objects.select_for_update().get(
+                store=transfer.source_store,
+                product=transfer.product
+            )
+            source_inventory.quantity += Decimal(str(transfer.quantity))
+            source_inventory.save()
 
-        destination_inventory = Inventory.objects.select_for_update().get(
-            store=transfer.destination_store,
-            product=transfer.product
-        )
+            destination_inventory = Inventory.objects.select_for_update().get(
+                store=transfer.destination_store,
+                product=transfer.product
+            )
         
-        destination_inventory.quantity -= Decimal(str(transfer.quantity))
-        destination_inventory.save()
+            destination_inventory.quantity -= Decimal(str(transfer.quantity))
+            destination_inventory.save()
             
         # Mark as cancelled
         transfer.status = StockTransfer.CANCELLED
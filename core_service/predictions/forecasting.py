@@ -0,0 +1,208 @@
+from datetime import date, datetime, timedelta
+import numpy as np
+
+# Pure forecasting functions. This module does not touch the database or Django
+# models, so it can be imported by worker processes started with the spawn method.
+# Prophet is imported only when its backend is actually used.
+
+DEFAULT_BACKEND = 'holt_winters'
+
+# Smoothing parameters tried when fitting Holt-Winters; every combination is fitted at once
+_SMOOTHING_GRID = np.array([0.1, 0.3, 0.5, 0.7, 0.9])
+SEASON_LENGTH = 12
+
+
+def _next_month_starts(last_date: str, num_periods: int) -> list:
+    current = datetime.strptime(last_date, '%Y-%m-%d').date().replace(day=1)
+    months = []
+    for _ in range(num_periods):
+        current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+        months.append(current.strftime('%Y-%m-%d'))
+    return months
+
+
+class Forecaster:
+    """
+    Base class for forecasting backends. predict() returns a list of
+    {'date', 'predicted_value'} dicts, or raises ValueError if the history
+    is too short for the model.
+    """
+    name = None
+    min_points = 1
+
+    def predict(self, historical_data: list, num_future_periods: int) -> list:
+        raise NotImplementedError
+
+
+class TrendForecaster(Forecaster):
+    name = 'trend_based'
+
+    def predict(self, historical_data: list, num_future_periods: int) -> list:
+        return trend_based_prediction(historical_data, num_future_periods)
+
+
+class HoltWintersForecaster(Forecaster):
+    """
+    Additive Holt-Winters exponential smoothing in NumPy. The level/trend/season
+    recursions run once over the history for the whole smoothing grid in parallel,
+    and the parameters with the lowest one-step-ahead squared error are kept.
+    Seasonality is only modelled once two full seasons of history are available.
+    """
+    name = 'holt_winters'
+    min_points = 3
+
+    def predict(self, historical_data: list, num_future_periods: int) -> list:
+        values = np.array([float(d['value']) for d in historical_data])
+        if len(values) < self.min_points:
+            raise ValueError('Not enough history for Holt-Winters')
+
+        seasonal = len(values) >= 2 * SEASON_LENGTH
+        season_length = SEASON_LENGTH if seasonal else 1
+        gammas = _SMOOTHING_GRID if seasonal else np.array([0.0])
+        alpha, beta, gamma = (grid.ravel() for grid in np.meshgrid(_SMOOTHING_GRID, _SMOOTHING_GRID, gammas, indexing='ij'))
+        num_fits = alpha.size
+
+        if seasonal:
+            first, second = values[:season_length], values[season_length:2 * season_length]
+            level = np.full(num_fits, first.mean())
+            trend = np.full(num_fits, (second.mean() - first.mean()) / season_length)
+            season = np.tile(first - first.mean(), (num_fits, 1))
+            start = season_length
+        else:
+            level = np.full(num_fits, values[0])
+            trend = np.full(num_fits, values[1] - values[0])
+            season = np.zeros((num_fits, 1))
+            start = 1
+
+        sse = np.zeros(num_fits)
+        for t in range(start, len(values)):
+            s = season[:, t % season_length]
+            sse += (values[t] - (level + trend + s)) ** 2
+            new_level = alpha * (values[t] - s) + (1 - alpha) * (level + trend)
+            trend = beta * (new_level - level) + (1 - beta) * trend
+            season[:, t % season_length] = gamma * (values[t] - new_level) + (1 - gamma) * s
+            level = new_level
+
+        best = int(np.argmin(sse))
+        last = len(values) - 1
+        steps = np.arange(1, num_future_periods + 1)
+        forecast = level[best] + steps * trend[best] + season[best, (last + steps) % season_length]
+
+        return [
+            {'date': month, 'predicted_value': max(0.0, float(value))}  # Ensure non-negative predictions
+            for month, value in zip(_next_month_starts(historical_data[-1]['date'], num_future_periods), forecast)
+        ]
+
+
+class ProphetForecaster(Forecaster):
+    name = 'prophet'
+    min_points = 6
+
+    def predict(self, historical_data: list, num_future_periods: int) -> list:
+        # Check if we have enough non-zero data points for Prophet
+        non_zero_data = [d for d in historical_data if float(d['value']) > 0]
+        if len(non_zero_data) < self.min_points:
+            raise ValueError('Not enough history for Prophet')
+
+        # Prophet and pandas are heavy imports; only pay for them when this backend is used
+        import pandas as pd
+        from prophet import Prophet
+
+        df = pd.DataFrame([
+            {'ds': pd.to_datetime(d['date']), 'y': float(d['value'])}
+            for d in historical_data
+        ])
+
+        model = Prophet(
+            seasonality_mode='additive',
+            yearly_seasonality=True,
+            weekly_seasonality=True,
+            daily_seasonality=False
+        )
+        model.fit(df)
+
+        future = model.make_future_dataframe(periods=num_future_periods, freq='MS')
+        forecast = model.predict(future)
+
+        # Get only the future predictions
+        future_predictions = forecast.tail(num_future_periods)
+
+        return [
+            {
+                'date': row['ds'].strftime('%Y-%m-%d'),
+                'predicted_value': max(0, float(row['yhat']))  # Ensure non-negative predictions
+            }
+            for _, row in future_predictions.iterrows()
+        ]
+
+
+FORECASTERS = {
+    forecaster.name: forecaster
+    for forecaster in (HoltWintersForecaster(), ProphetForecaster(), TrendForecaster())
+}
+
+# Backends that can be requested explicitly (trend_based is the fallback for all of them)
+FORECAST_BACKENDS = tuple(FORECASTERS)
+
+
+def get_forecaster(name: str) -> Forecaster:
+    try:
+        return FORECASTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown forecasting backend '{name}'. Use one of: {', '.join(FORECAST_BACKENDS)}")
+
+
+def predict_future_months(historical_data: list, num_future_periods: int, metric: str = 'revenue', backend: str = DEFAULT_BACKEND) -> tuple[list, str]:
+    """
+    Predict future values with the requested backend, falling back to a simple
+    trend-based approach when the history is too short or the backend fails.
+    Returns both predictions and the method used.
+    """
+    forecaster = get_forecaster(backend)
+    try:
+        return forecaster.predict(historical_data, num_future_periods), forecaster.name
+    except Exception:
+        return trend_based_prediction(historical_data, num_future_periods), TrendForecaster.name
+
+def trend_based_prediction(historical_data: list, num_future_periods: int) -> list:
+    """
+    Make predictions based on simple trend analysis when there isn't enough data for Prophet.
+    """
+    if not historical_data:
+        return []
+    
+    # Convert to numpy arrays for easier calculation
+    dates = [datetime.strptime(d['date'], '%Y-%m-%d') for d in historical_data]
+    values = [float(d['value']) for d in historical_data]
+    
+    # Calculate simple moving average and trend
+    if len(values) > 1:
+        # Calculate trend (average change per period)
+        changes = [values[i] - values[i-1] for i in range(1, len(values))]
+        avg_change = sum(changes) / len(changes)
+        
+        # Use last known value and trend for prediction
+        last_value = values[-1]
+        last_date = dates[-1]
+        
+        predictions = []
+        for i in range(num_future_periods):
+            next_date = last_date + timedelta(days=30 * (i + 1))
+            predicted_value = max(0, last_value + (avg_change * (i + 1)))  # Ensure non-negative
+            predictions.append({
+                'date': next_date.strftime('%Y-%m-%d'),
+                'predicted_value': predicted_value
+            })
+    else:
+        # If only one data point, use it as constant prediction
+        last_value = values[0]
+        last_date = dates[0]
+        predictions = []
+        for i in range(num_future_periods):
+            next_date = last_date + timedelta(days=30 * (i + 1))
+            predictions.append({
+                'date': next_date.strftime('%Y-%m-%d'),
+                'predicted_value': last_value
+            })
+    
+    return predictions 
\ No newline at end of file
@@ -0,0 +1,50 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from companies.models import Store
+from predictions.forecasting import FORECAST_BACKENDS
+from predictions.services import HISTORY_METRICS, batch_forecast
+
+class Command(BaseCommand):
+    help = 'Forecasts every active store of a company (or of all companies) in parallel and caches the results.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', action='append', dest='companies', help='Company ID to forecast (repeatable; defaults to all companies)')
+        parser.add_argument('--metric', action='append', dest='metrics', choices=HISTORY_METRICS, help='Metric to forecast (repeatable; defaults to all)')
+        parser.add_argument('--projection-months', type=int, default=6, help='Forecast horizon')
+        parser.add_argument('--historical-months', type=int, default=12, help='History length used to fit each model')
+        parser.add_argument('--backend', choices=FORECAST_BACKENDS, default=None, help='Forecasting backend (defaults to FORECAST_BACKEND)')
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (defaults to FORECAST_BATCH_WORKERS)')
+        parser.add_argument('--refresh', action='store_true', help='Refit forecasts even if they are cached')
+        parser.add_argument('--output', help='Write all forecasts to this JSON file')
+
+    def handle(self, *args, **options):
+        if options['workers'] is not None and options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+
+        stores = Store.objects.filter(is_active='active')
+        if options['companies']:
+            stores = stores.filter(company_id__in=options['companies'])
+        store_ids = [str(store_id) for store_id in stores.values_list('id', flat=True)]
+        metrics = tuple(options['metrics'] or HISTORY_METRICS)
+
+        started = time.monotonic()
+        forecasts = batch_forecast(
+            store_ids,
+            metrics,
+            options['historical_months'],
+            options['projection_months'],
+            max_workers=options['workers'],
+            refresh=options['refresh'],
+            backend=options['backend']
+        )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(forecasts, f, indent=2)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Forecast {len(metrics)} metrics for {len(store_ids)} stores in {time.monotonic() - started:.1f}s'
+            )
+        )
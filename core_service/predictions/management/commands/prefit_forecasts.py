@@ -0,0 +1,55 @@
+import time
+from django.core.management.base import BaseCommand
+from companies.models import Store, Company
+from predictions.forecasting import FORECAST_BACKENDS
+from predictions.services import HISTORY_METRICS, forecast_metric
+
+class Command(BaseCommand):
+    help = 'Pre-fits and caches forecasts for all active stores. Intended to run nightly (e.g. from cron).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projection-months', type=int, default=6, help='Forecast horizon to pre-fit (matches the API default)')
+        parser.add_argument('--historical-months', type=int, default=12, help='History length to pre-fit (matches the API default)')
+        parser.add_argument('--backend', choices=FORECAST_BACKENDS, default=None, help='Forecasting backend to pre-fit (defaults to FORECAST_BACKEND)')
+        parser.add_argument('--include-companies', action='store_true', help='Also pre-fit company-level forecasts for active companies')
+
+    def handle(self, *args, **options):
+        num_projection_months = options['projection_months']
+        num_historical_months = options['historical_months']
+
+        targets = [
+            (str(store_id), False)
+            for store_id in Store.objects.filter(is_active='active').values_list('id', flat=True)
+        ]
+        if options['include_companies']:
+            targets += [
+                (str(company_id), True)
+                for company_id in Company.objects.filter(is_active=True).values_list('id', flat=True)
+            ]
+
+        started = time.monotonic()
+        fitted = 0
+        failed = 0
+        for identifier, is_company in targets:
+            for metric in HISTORY_METRICS:
+                try:
+                    forecast_metric(
+                        identifier,
+                        metric,
+                        num_historical_months,
+                        num_projection_months,
+                        is_company=is_company,
+                        refresh=True,
+                        backend=options['backend']
+                    )
+                    fitted += 1
+                except Exception as e:
+                    failed += 1
+                    scope = 'company' if is_company else 'store'
+                    self.stdout.write(self.style.ERROR(f'Failed to forecast {metric} for {scope} {identifier}: {e}'))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Pre-fitted {fitted} forecasts for {len(targets)} targets in {time.monotonic() - started:.1f}s ({failed} failed)'
+            )
+        )
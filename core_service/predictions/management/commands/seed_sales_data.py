@@ -7,6 +7,7 @@ from companies.models import Store
 from inventory.models import Product, ProductCategory, ProductUnit
 from transactions.models import Sale, SaleItem, Customer
 from clothings.models import Color, Collection, Season
+from reports.rollups import rebuild_daily_sales
 
 class Command(BaseCommand):
     help = 'Seeds sample sales data for testing predictions'
@@ -158,6 +159,9 @@ class Command(BaseCommand):
                         created_at=sale_date
                     )
 
+        # Seeded sales bypass the sale serializer, so rebuild the store's rollup
+        rebuild_daily_sales(store_ids=[store_id])
+
         self.stdout.write(
             self.style.SUCCESS(
                 f'Successfully seeded {total_customers} customers and {total_sales} sales for store {store_id} over {months} months'
@@ -1,16 +1,26 @@
 from decimal import Decimal
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
+import hashlib
+import json
+import multiprocessing
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Sum, F, Count
+from django.db.models import Sum, F, Count, DateField
+from django.db.models.functions import TruncMonth
 from transactions.models import Sale, SaleItem, Customer
 from inventory.models import Product
 from companies.models import Store, Company
-import pandas as pd
-from prophet import Prophet
+from reports.models import DailySalesFact
+from predictions.forecasting import predict_future_months, trend_based_prediction
 
 def calculate_monthly_revenue(store_id: str, year: int, month: int) -> Decimal:
     """
-    Calculate total revenue for a given store, year, and month.
+    Calculate total revenue for a given store, year, and month from the daily sales rollup.
     """
     start_date = timezone.make_aware(datetime(year, month, 1))
     if month == 12:
@@ -18,19 +28,19 @@ def calculate_monthly_revenue(store_id: str, year: int, month: int) -> Decimal:
     else:
         end_date = timezone.make_aware(datetime(year, month + 1, 1))
 
-    revenue = SaleItem.objects.filter(
-        sale__store_id=store_id,
-        sale__created_at__gte=start_date,
-        sale__created_at__lt=end_date
-    ).select_related('product', 'sale').aggregate(
-        total=Sum(F('quantity') * F('product__sale_price'))
+    revenue = DailySalesFact.objects.filter(
+        store_id=store_id,
+        day__gte=start_date.date(),
+        day__lt=end_date.date()
+    ).aggregate(
+        total=Sum('revenue')
     )['total']
 
     return Decimal('0.00') if revenue is None else revenue
 
 def calculate_monthly_profit(store_id: str, year: int, month: int) -> Decimal:
     """
-    Calculate total profit for a given store, year, and month.
+    Calculate total profit for a given store, year, and month from the daily sales rollup.
     """
     start_date = timezone.make_aware(datetime(year, month, 1))
     if month == 12:
@@ -38,12 +48,12 @@ def calculate_monthly_profit(store_id: str, year: int, month: int) -> Decimal:
     else:
         end_date = timezone.make_aware(datetime(year, month + 1, 1))
 
-    profit = SaleItem.objects.filter(
-        sale__store_id=store_id,
-        sale__created_at__gte=start_date,
-        sale__created_at__lt=end_date
-    ).select_related('product', 'sale').aggregate(
-        total=Sum(F('quantity') * (F('product__sale_price') - F('product__purchase_price')))
+    profit = DailySalesFact.objects.filter(
+        store_id=store_id,
+        day__gte=start_date.date(),
+        day__lt=end_date.date()
+    ).aggregate(
+        total=Sum(F('revenue') - F('cost'))
     )['total']
 
     return Decimal('0.00') if profit is None else profit
@@ -80,12 +90,12 @@ def calculate_company_monthly_revenue(company_id: str, year: int, month: int) ->
     stores = Store.objects.filter(company_id=company_id)
     store_ids = list(stores.values_list('id', flat=True))
 
-    revenue = SaleItem.objects.filter(
-        sale__store_id__in=store_ids,
-        sale__created_at__gte=start_date,
-        sale__created_at__lt=end_date
-    ).select_related('product', 'sale').aggregate(
-        total=Sum(F('quantity') * F('product__sale_price'))
+    revenue = DailySalesFact.objects.filter(
+        store_id__in=store_ids,
+        day__gte=start_date.date(),
+        day__lt=end_date.date()
+    ).aggregate(
+        total=Sum('revenue')
     )['total']
 
     return Decimal('0.00') if revenue is None else revenue
@@ -104,12 +114,12 @@ def calculate_company_monthly_profit(company_id: str, year: int, month: int) ->
     stores = Store.objects.filter(company_id=company_id)
     store_ids = list(stores.values_list('id', flat=True))
 
-    profit = SaleItem.objects.filter(
-        sale__store_id__in=store_ids,
-        sale__created_at__gte=start_date,
-        sale__created_at__lt=end_date
-    ).select_related('product', 'sale').aggregate(
-        total=Sum(F('quantity') * (F('product__sale_price') - F('product__purchase_price')))
+    profit = DailySalesFact.objects.filter(
+        store_id__in=store_ids,
+        day__gte=start_date.date(),
+        day__lt=end_date.date()
+    ).aggregate(
+        total=Sum(F('revenue') - F('cost'))
     )['total']
 
     return Decimal('0.00') if profit is None else profit
@@ -137,14 +147,40 @@ def calculate_company_monthly_customers(company_id: str, year: int, month: int)
 
     return customer_count
 
-def get_historical_monthly_data(identifier: str, metric_calculator_func: callable, num_months: int = 12, is_company: bool = False) -> list:
+HISTORY_METRICS = ('revenue', 'profit', 'customers')
+
+def _month_starts(num_months: int, end_date: date = None) -> list:
     """
-    Retrieve historical data for the specified metric over the past num_months.
-    Supports both store-level and company-level metrics.
+    First day of each of the num_months calendar months ending with the month of end_date.
     """
-    current_date = timezone.now()
-    historical_data = []
+    end_date = end_date or timezone.localdate()
+    last = end_date.year * 12 + (end_date.month - 1)
+    return [date(index // 12, index % 12 + 1, 1) for index in range(last - num_months + 1, last + 1)]
 
+def _empty_history(months: list, metrics: tuple) -> dict:
+    history = {'months': list(months)}
+    for metric in metrics:
+        history[metric] = [0.0] * len(months)
+    return history
+
+def _add_sales(history: dict, row: dict, metrics: tuple, positions: dict) -> None:
+    """Fill one grouped rollup row (month, total_revenue, total_cost) into a history"""
+    position = positions.get(row['month'])
+    if position is None:
+        return
+    revenue = float(row['total_revenue'] or 0)
+    values = {'revenue': revenue, 'profit': revenue - float(row['total_cost'] or 0)}
+    for metric in ('revenue', 'profit'):
+        if metric in metrics:
+            history[metric][position] = values[metric]
+
+def get_monthly_history(identifier: str, num_months: int = 12, is_company: bool = False, metrics: tuple = HISTORY_METRICS) -> dict:
+    """
+    Dense monthly history for a store or company as {'months': [month starts], metric:
+    [floats]}, with one list per requested metric and zero for months without activity.
+    Revenue and profit come from one grouped query over the daily sales rollup, new
+    customers from one grouped query over customers; only the needed queries run.
+    """
     # Validate identifier exists
     if is_company:
         if not Company.objects.filter(id=identifier).exists():
@@ -153,103 +189,203 @@ def get_historical_monthly_data(identifier: str, metric_calculator_func: callabl
         if not Store.objects.filter(id=identifier).exists():
             raise ValueError(f"Store with ID {identifier} not found")
 
-    for i in range(num_months):
-        target_date = current_date - timedelta(days=30 * i)
-        year = target_date.year
-        month = target_date.month
+    months = _month_starts(num_months)
+    positions = {month: position for position, month in enumerate(months)}
+    history = _empty_history(months, metrics)
+
+    if 'revenue' in metrics or 'profit' in metrics:
+        facts = DailySalesFact.objects.filter(day__gte=months[0])
+        facts = facts.filter(store__company_id=identifier) if is_company else facts.filter(store_id=identifier)
+        # The aliases must not shadow the revenue and cost columns they sum
+        monthly_sales = facts.annotate(month=TruncMonth('day')).values('month').annotate(
+            total_revenue=Sum('revenue'),
+            total_cost=Sum('cost')
+        ).order_by()
+        for row in monthly_sales:
+            _add_sales(history, row, metrics, positions)
 
-        value = metric_calculator_func(identifier, year, month)
-        historical_data.append({
-            'date': f"{year}-{month:02d}-01",
-            'value': value
-        })
+    if 'customers' in metrics:
+        customers = Customer.objects.filter(created_at__gte=timezone.make_aware(datetime.combine(months[0], time.min)))
+        customers = customers.filter(store_id__company_id=identifier) if is_company else customers.filter(store_id=identifier)
+        monthly_customers = customers.annotate(
+            month=TruncMonth('created_at', output_field=DateField())
+        ).values('month').annotate(count=Count('id')).order_by()
+        for row in monthly_customers:
+            position = positions.get(row['month'])
+            if position is not None:
+                history['customers'][position] = float(row['count'])
 
-    return sorted(historical_data, key=lambda x: x['date'])
+    return history
 
-def predict_future_months(historical_data: list, num_future_periods: int, metric: str = 'revenue') -> tuple[list, str]:
+def get_historical_monthly_data(identifier: str, metric: str, num_months: int = 12, is_company: bool = False) -> list:
     """
-    Predict future values using Prophet if enough data is available, otherwise use a simple trend-based approach.
+    Retrieve historical data for the specified metric ('revenue', 'profit' or 'customers')
+    over the past num_months calendar months, oldest first.
+    Supports both store-level and company-level metrics.
+    """
+    if metric not in HISTORY_METRICS:
+        raise ValueError(f"Unknown metric '{metric}'")
+
+    history = get_monthly_history(identifier, num_months, is_company, metrics=(metric,))
+    return _history_records(history, metric)
+
+def _history_records(history: dict, metric: str) -> list:
+    return [
+        {'date': month.strftime('%Y-%m-%d'), 'value': value}
+        for month, value in zip(history['months'], history[metric])
+    ]
+
+def get_monthly_history_by_store(store_ids: list, num_months: int = 12, metrics: tuple = HISTORY_METRICS) -> dict:
+    """
+    Dense monthly histories for many stores at once, as {store_id: history} in the
+    same shape as get_monthly_history. Each source is read with a single query
+    grouped by store and month, regardless of the number of stores.
+    """
+    months = _month_starts(num_months)
+    positions = {month: position for position, month in enumerate(months)}
+    histories = {str(store_id): _empty_history(months, metrics) for store_id in store_ids}
+
+    if 'revenue' in metrics or 'profit' in metrics:
+        monthly_sales = DailySalesFact.objects.filter(
+            store_id__in=store_ids,
+            day__gte=months[0]
+        ).annotate(month=TruncMonth('day')).values('store_id', 'month').annotate(
+            total_revenue=Sum('revenue'),
+            total_cost=Sum('cost')
+        ).order_by()
+        for row in monthly_sales:
+            _add_sales(histories[str(row['store_id'])], row, metrics, positions)
+
+    if 'customers' in metrics:
+        monthly_customers = Customer.objects.filter(
+            store_id__in=store_ids,
+            created_at__gte=timezone.make_aware(datetime.combine(months[0], time.min))
+        ).annotate(
+            month=TruncMonth('created_at', output_field=DateField())
+        ).values('store_id', 'month').annotate(count=Count('id')).order_by()
+        for row in monthly_customers:
+            position = positions.get(row['month'])
+            if position is not None:
+                histories[str(row['store_id'])]['customers'][position] = float(row['count'])
+
+    return histories
+
+# Bump to invalidate cached forecasts when the forecasting logic changes
+FORECAST_CACHE_VERSION = 2
+
+def forecast_cache_key(identifier: str, metric: str, historical_data: list, num_future_periods: int, is_company: bool = False, backend: str = None) -> str:
+    """
+    Cache key for a forecast. The history itself is hashed into the key, so new sales
+    data produces a new key and stale forecasts simply age out.
+    """
+    history = json.dumps([[d['date'], round(float(d['value']), 6)] for d in historical_data])
+    history_hash = hashlib.sha256(history.encode()).hexdigest()[:32]
+    scope = 'company' if is_company else 'store'
+    backend = backend or settings.FORECAST_BACKEND
+    return f"forecast:v{FORECAST_CACHE_VERSION}:{backend}:{scope}:{identifier}:{metric}:{num_future_periods}:{history_hash}"
+
+def forecast_metric(identifier: str, metric: str, num_historical_months: int = 12, num_future_periods: int = 6, is_company: bool = False, refresh: bool = False, backend: str = None) -> tuple[list, str]:
+    """
+    Forecast a metric for a store or company, reusing a cached forecast when the
+    history has not changed. backend defaults to settings.FORECAST_BACKEND.
     Returns both predictions and the method used.
     """
-    # Check if we have enough non-zero data points for Prophet
-    non_zero_data = [d for d in historical_data if float(d['value']) > 0]
-    
-    if len(non_zero_data) >= 6:
-        try:
-            # Use Prophet for prediction
-            df = pd.DataFrame([
-                {'ds': pd.to_datetime(d['date']), 'y': float(d['value'])}
-                for d in historical_data
-            ])
-            
-            model = Prophet(
-                seasonality_mode='additive',
-                yearly_seasonality=True,
-                weekly_seasonality=True,
-                daily_seasonality=False
+    backend = backend or settings.FORECAST_BACKEND
+    historical_data = get_historical_monthly_data(identifier, metric, num_historical_months, is_company=is_company)
+    key = forecast_cache_key(identifier, metric, historical_data, num_future_periods, is_company, backend)
+
+    if not refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached['predictions'], cached['method']
+
+    predictions, method = predict_future_months(historical_data, num_future_periods, metric=metric, backend=backend)
+    cache.set(key, {'predictions': predictions, 'method': method}, timeout=settings.FORECAST_CACHE_TIMEOUT)
+    return predictions, method
+
+_forecast_pool = None
+_forecast_pool_lock = threading.Lock()
+
+def _shared_forecast_pool() -> ProcessPoolExecutor:
+    """
+    Process pool of FORECAST_BATCH_WORKERS workers shared by every batch forecast in
+    this process, started on first use. Workers only run the pure fitting code in
+    predictions.forecasting; spawn keeps them from inheriting database connections.
+    """
+    global _forecast_pool
+    with _forecast_pool_lock:
+        if _forecast_pool is None:
+            _forecast_pool = ProcessPoolExecutor(
+                max_workers=settings.FORECAST_BATCH_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
             )
-            model.fit(df)
-            
-            future = model.make_future_dataframe(periods=num_future_periods, freq='MS')
-            forecast = model.predict(future)
-            
-            # Get only the future predictions
-            future_predictions = forecast.tail(num_future_periods)
-            
-            predictions = [
-                {
-                    'date': row['ds'].strftime('%Y-%m-%d'),
-                    'predicted_value': max(0, float(row['yhat']))  # Ensure non-negative predictions
-                }
-                for _, row in future_predictions.iterrows()
-            ]
-            return predictions, 'prophet'
-        except Exception as e:
-            # If Prophet fails, fall back to trend-based prediction
-            return trend_based_prediction(historical_data, num_future_periods), 'trend_based'
-    else:
-        # Use trend-based prediction for small datasets
-        return trend_based_prediction(historical_data, num_future_periods), 'trend_based'
-
-def trend_based_prediction(historical_data: list, num_future_periods: int) -> list:
-    """
-    Make predictions based on simple trend analysis when there isn't enough data for Prophet.
-    """
-    if not historical_data:
-        return []
-    
-    # Convert to numpy arrays for easier calculation
-    dates = [datetime.strptime(d['date'], '%Y-%m-%d') for d in historical_data]
-    values = [float(d['value']) for d in historical_data]
-    
-    # Calculate simple moving average and trend
-    if len(values) > 1:
-        # Calculate trend (average change per period)
-        changes = [values[i] - values[i-1] for i in range(1, len(values))]
-        avg_change = sum(changes) / len(changes)
-        
-        # Use last known value and trend for prediction
-        last_value = values[-1]
-        last_date = dates[-1]
-        
-        predictions = []
-        for i in range(num_future_periods):
-            next_date = last_date + timedelta(days=30 * (i + 1))
-            predicted_value = max(0, last_value + (avg_change * (i + 1)))  # Ensure non-negative
-            predictions.append({
-                'date': next_date.strftime('%Y-%m-%d'),
-                'predicted_value': predicted_value
-            })
+        return _forecast_pool
+
+def _reset_shared_forecast_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken shared pool so the next batch starts a fresh one"""
+    global _forecast_pool
+    with _forecast_pool_lock:
+        if _forecast_pool is pool:
+            _forecast_pool = None
+    pool.shutdown(wait=False)
+
+def batch_forecast(store_ids: list, metrics: tuple = HISTORY_METRICS, num_historical_months: int = 12, num_future_periods: int = 6, max_workers: int = None, refresh: bool = False, backend: str = None) -> dict:
+    """
+    Forecast several metrics for many stores. Histories are loaded in bulk, cached
+    forecasts are reused, and the remaining models are fitted in parallel in a process
+    pool: a dedicated one of max_workers processes if given, otherwise the shared
+    pool of FORECAST_BATCH_WORKERS. Every fitted forecast is written to the forecast cache, so interactive
+    requests for the same store and horizon are served from it.
+    Returns {store_id: {metric: {'projection_method': ..., 'projections': [...]}}}.
+    """
+    backend = backend or settings.FORECAST_BACKEND
+    histories = get_monthly_history_by_store(store_ids, num_historical_months, metrics)
+    results = defaultdict(dict)
+    pending = []
+
+    for store_id, history in histories.items():
+        for metric in metrics:
+            historical_data = _history_records(history, metric)
+            key = forecast_cache_key(store_id, metric, historical_data, num_future_periods, backend=backend)
+            cached = None if refresh else cache.get(key)
+            if cached is not None:
+                results[store_id][metric] = {'projection_method': cached['method'], 'projections': cached['predictions']}
+            else:
+                pending.append((store_id, metric, key, historical_data))
+
+    def store_result(store_id, metric, key, predictions, method):
+        cache.set(key, {'predictions': predictions, 'method': method}, timeout=settings.FORECAST_CACHE_TIMEOUT)
+        results[store_id][metric] = {'projection_method': method, 'projections': predictions}
+
+    workers = max_workers or settings.FORECAST_BATCH_WORKERS
+    if len(pending) <= 1 or workers <= 1:
+        for store_id, metric, key, historical_data in pending:
+            predictions, method = predict_future_months(historical_data, num_future_periods, metric=metric, backend=backend)
+            store_result(store_id, metric, key, predictions, method)
+        return dict(results)
+
+    # An explicit max_workers (the batch_forecast command) gets a pool of its own;
+    # requests share one long-lived pool, so they neither pay for starting workers
+    # nor multiply the number of processes when they run concurrently
+    if max_workers:
+        executor = ProcessPoolExecutor(max_workers=min(max_workers, len(pending)), mp_context=multiprocessing.get_context('spawn'))
     else:
-        # If only one data point, use it as constant prediction
-        last_value = values[0]
-        last_date = dates[0]
-        predictions = []
-        for i in range(num_future_periods):
-            next_date = last_date + timedelta(days=30 * (i + 1))
-            predictions.append({
-                'date': next_date.strftime('%Y-%m-%d'),
-                'predicted_value': last_value
-            })
-    
-    return predictions 
\ No newline at end of file
+        executor = _shared_forecast_pool()
+    try:
+        futures = {
+            executor.submit(predict_future_months, historical_data, num_future_periods, metric, backend): (store_id, metric, key)
+            for store_id, metric, key, historical_data in pending
+        }
+        for future in as_completed(futures):
+            store_id, metric, key = futures[future]
+            predictions, method = future.result()
+            store_result(store_id, metric, key, predictions, method)
+    except BrokenProcessPool:
+        if not max_workers:
+            _reset_shared_forecast_pool(executor)
+        raise
+    finally:
+        if max_workers:
+            executor.shutdown()
+
+    return dict(results)
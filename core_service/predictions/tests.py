@@ -1,3 +1,159 @@
-from django.test import TestCase
+import math
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from clothings.models import Collection, Color, Season
+from companies.models.company import Company
+from companies.models.store import Store
+from inventory.models.product import Product
+from inventory.models.product_category import ProductCategory
+from inventory.models.product_unit import ProductUnit
+from predictions.forecasting import HoltWintersForecaster, predict_future_months
+from predictions.services import (
+    HISTORY_METRICS,
+    batch_forecast,
+    forecast_cache_key,
+    forecast_metric,
+    get_historical_monthly_data,
+    get_monthly_history_by_store
+)
+from reports.models import DailySalesFact
+from transactions.models.customer import Customer
 
-# Create your tests here.
+
+class MonthlyHistoryTests(TestCase):
+    """Monthly histories are built from the daily sales rollup and customers"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name='History Co')
+        cls.store = Store.objects.create(company_id=cls.company, name='History Store', location='Nairobi')
+        unit = ProductUnit.objects.create(store_id=cls.store, name='Piece')
+        category = ProductCategory.objects.create(store_id=cls.store, name='Shirts')
+        season = Season.objects.create(store_id=cls.store, name='Summer', start_date=date(2025, 1, 1), end_date=date(2025, 6, 30))
+        collection = Collection.objects.create(store_id=cls.store, season_id=season, name='Linen', release_date=date(2025, 1, 1))
+        color = Color.objects.create(store_id=cls.store, name='Blue', color_code='#0000ff')
+        product = Product.objects.create(
+            store_id=cls.store,
+            color_id=color,
+            collection_id=collection,
+            name='Product',
+            product_unit=unit,
+            product_category=category,
+            purchase_price=Decimal('10'),
+            sale_price=Decimal('15')
+        )
+
+        this_month = timezone.localdate().replace(day=1)
+        cls.last_month = (this_month - timedelta(days=1)).replace(day=1)
+        cls.this_month = this_month
+        # Two facts this month, one last month
+        for day, quantity in ((this_month, 2), (this_month + timedelta(days=1), 4), (cls.last_month, 10)):
+            DailySalesFact.objects.create(
+                store=cls.store,
+                day=day,
+                product=product,
+                category=category,
+                quantity=Decimal(quantity),
+                revenue=Decimal(quantity * 15),
+                cost=Decimal(quantity * 10)
+            )
+        Customer.objects.create(store_id=cls.store, name='Customer', email='customer@example.com')
+
+    def history(self, metric, **kwargs):
+        records = get_historical_monthly_data(str(self.store.id), metric, num_months=3, **kwargs)
+        return {record['date']: record['value'] for record in records}
+
+    def test_revenue_and_profit(self):
+        revenue = self.history('revenue')
+        profit = self.history('profit')
+        self.assertEqual(len(revenue), 3)
+        self.assertEqual(revenue[self.this_month.strftime('%Y-%m-%d')], 90.0)
+        self.assertEqual(revenue[self.last_month.strftime('%Y-%m-%d')], 150.0)
+        self.assertEqual(profit[self.this_month.strftime('%Y-%m-%d')], 30.0)
+        self.assertEqual(profit[self.last_month.strftime('%Y-%m-%d')], 50.0)
+
+    def test_company_history(self):
+        records = get_historical_monthly_data(str(self.company.id), 'profit', num_months=3, is_company=True)
+        self.assertEqual(sum(record['value'] for record in records), 80.0)
+
+    def test_customers(self):
+        customers = self.history('customers')
+        self.assertEqual(customers[self.this_month.strftime('%Y-%m-%d')], 1.0)
+
+    def test_history_by_store(self):
+        histories = get_monthly_history_by_store([self.store.id], num_months=3, metrics=('revenue', 'profit'))
+        history = histories[str(self.store.id)]
+        self.assertEqual(sum(history['revenue']), 240.0)
+        self.assertEqual(sum(history['profit']), 80.0)
+
+    def test_batch_forecast(self):
+        forecasts = batch_forecast([str(self.store.id)], ('revenue', 'profit'), 3, 2, max_workers=1, refresh=True)
+        for metric in ('revenue', 'profit'):
+            self.assertEqual(len(forecasts[str(self.store.id)][metric]['projections']), 2)
+
+    def test_batch_forecast_in_process_pool(self):
+        store_id = str(self.store.id)
+        in_process = batch_forecast([store_id], HISTORY_METRICS, 3, 2, max_workers=1, refresh=True)
+
+        # Three pending fits and two workers take the ProcessPoolExecutor path
+        with mock.patch('predictions.services.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as executor:
+            pooled = batch_forecast([store_id], HISTORY_METRICS, 3, 2, max_workers=2, refresh=True)
+        self.assertEqual(executor.call_args.kwargs['max_workers'], 2)
+        self.assertEqual(pooled, in_process)
+
+    def test_forecast_metric_is_cached(self):
+        store_id = str(self.store.id)
+        cache.clear()
+        with mock.patch('predictions.services.predict_future_months', return_value=([], 'holt_winters')) as predict:
+            forecast_metric(store_id, 'revenue', 3, 2)
+            forecast_metric(store_id, 'revenue', 3, 2)
+            self.assertEqual(predict.call_count, 1)
+
+            old_key = forecast_cache_key(store_id, 'revenue', get_historical_monthly_data(store_id, 'revenue', 3), 2)
+            DailySalesFact.objects.filter(store=self.store, day=self.last_month).update(revenue=Decimal('300'))
+            new_key = forecast_cache_key(store_id, 'revenue', get_historical_monthly_data(store_id, 'revenue', 3), 2)
+            self.assertNotEqual(old_key, new_key)
+
+            forecast_metric(store_id, 'revenue', 3, 2)
+            self.assertEqual(predict.call_count, 2)
+
+
+class HoltWintersForecasterTests(SimpleTestCase):
+    """The NumPy Holt-Winters backend picks up seasonality and falls back on short histories"""
+
+    @staticmethod
+    def monthly(values, start_year=2022):
+        return [
+            {'date': f'{start_year + i // 12}-{i % 12 + 1:02d}-01', 'value': value}
+            for i, value in enumerate(values)
+        ]
+
+    def test_seasonal_series(self):
+        # Three years of a yearly cycle peaking in April and bottoming out in October, on a rising trend
+        pattern = [100 + 50 * math.sin(2 * math.pi * month / 12) for month in range(12)]
+        history = self.monthly([pattern[i % 12] + 2 * i for i in range(36)])
+
+        predictions, method = predict_future_months(history, 12, backend='holt_winters')
+
+        self.assertEqual(method, 'holt_winters')
+        self.assertEqual([p['date'] for p in predictions[:2]], ['2025-01-01', '2025-02-01'])
+        values = [p['predicted_value'] for p in predictions]
+        self.assertEqual(values.index(max(values)), 3)
+        self.assertEqual(values.index(min(values)), 9)
+        for i, value in enumerate(values):
+            expected = pattern[i] + 2 * (36 + i)
+            self.assertLess(abs(value - expected) / expected, 0.15)
+
+    def test_short_history_falls_back_to_trend(self):
+        history = self.monthly([100, 120])
+        with self.assertRaises(ValueError):
+            HoltWintersForecaster().predict(history, 3)
+
+        predictions, method = predict_future_months(history, 3, backend='holt_winters')
+        self.assertEqual(method, 'trend_based')
+        self.assertEqual([p['predicted_value'] for p in predictions], [140, 160, 180])
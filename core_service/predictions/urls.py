@@ -5,7 +5,8 @@ from .views import (
     CustomerPredictionAPIView,
     CompanyRevenuePredictionAPIView,
     CompanyProfitPredictionAPIView,
-    CompanyCustomerPredictionAPIView
+    CompanyCustomerPredictionAPIView,
+    CompanyBatchPredictionAPIView
 )
 
 urlpatterns = [
@@ -42,4 +43,9 @@ urlpatterns = [
         CompanyCustomerPredictionAPIView.as_view(),
         name='predict_company_customers'
     ),
+    path(
+        'companies/<uuid:company_id>/predictions/batch/',
+        CompanyBatchPredictionAPIView.as_view(),
+        name='predict_company_batch'
+    ),
 ] 
\ No newline at end of file
@@ -3,19 +3,25 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from companies.models import Store, Company
-from .services import (
-    calculate_monthly_revenue,
-    calculate_monthly_profit,
-    calculate_monthly_customers,
-    calculate_company_monthly_revenue,
-    calculate_company_monthly_profit,
-    calculate_company_monthly_customers,
-    get_historical_monthly_data,
-    predict_future_months
-)
+from django.conf import settings
+from .forecasting import FORECAST_BACKENDS
+from .services import HISTORY_METRICS, batch_forecast, forecast_metric
 
 # Create your views here.
 
+def _parse_backend(request):
+    """
+    Read the optional 'backend' parameter (default FORECAST_BACKEND). Returns the
+    backend and None, or None and a 400 response when it is not a known backend.
+    """
+    backend = request.data.get('backend', settings.FORECAST_BACKEND)
+    if backend not in FORECAST_BACKENDS:
+        return None, Response(
+            {'error': f"backend must be one of {', '.join(FORECAST_BACKENDS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return backend, None
+
 class RevenuePredictionAPIView(APIView):
     def post(self, request, store_id):
         # Validate store exists
@@ -35,21 +41,19 @@ class RevenuePredictionAPIView(APIView):
                 {'error': 'Number of months must be positive'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        backend, error = _parse_backend(request)
+        if error:
+            return error
 
-        # Get historical data
-        historical_data = get_historical_monthly_data(
+        # Generate predictions (served from the forecast cache when history is unchanged)
+        predictions, projection_method = forecast_metric(
             store_id,
-            calculate_monthly_revenue,
-            num_historical_months
+            'revenue',
+            num_historical_months,
+            num_projection_months,
+            backend=backend
         )
 
-        # Generate predictions
-        predictions = predict_future_months(historical_data, num_projection_months)
-
-        # Determine projection method based on data availability
-        non_zero_data = [d for d in historical_data if float(d['value']) > 0]
-        projection_method = 'prophet' if len(non_zero_data) >= 6 else 'trend_based'
-
         return Response({
             'store_id': store_id,
             'metric_predicted': 'revenue',
@@ -77,21 +81,19 @@ class ProfitPredictionAPIView(APIView):
                 {'error': 'Number of months must be positive'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        backend, error = _parse_backend(request)
+        if error:
+            return error
 
-        # Get historical data
-        historical_data = get_historical_monthly_data(
+        # Generate predictions (served from the forecast cache when history is unchanged)
+        predictions, projection_method = forecast_metric(
             store_id,
-            calculate_monthly_profit,
-            num_historical_months
+            'profit',
+            num_historical_months,
+            num_projection_months,
+            backend=backend
         )
 
-        # Generate predictions
-        predictions = predict_future_months(historical_data, num_projection_months)
-
-        # Determine projection method based on data availability
-        non_zero_data = [d for d in historical_data if float(d['value']) > 0]
-        projection_method = 'prophet' if len(non_zero_data) >= 6 else 'trend_based'
-
         return Response({
             'store_id': store_id,
             'metric_predicted': 'profit',
@@ -119,19 +121,17 @@ class CustomerPredictionAPIView(APIView):
                 {'error': 'Number of months must be positive'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        backend, error = _parse_backend(request)
+        if error:
+            return error
 
-        # Get historical data
-        historical_data = get_historical_monthly_data(
+        # Generate predictions (served from the forecast cache when history is unchanged)
+        predictions, projection_method = forecast_metric(
             store_id,
-            calculate_monthly_customers,
-            num_historical_months
-        )
-
-        # Generate predictions
-        predictions, projection_method = predict_future_months(
-            historical_data,
+            'customers',
+            num_historical_months,
             num_projection_months,
-            metric='customers'
+            backend=backend
         )
 
         return Response({
@@ -155,20 +155,18 @@ class CompanyRevenuePredictionAPIView(APIView):
                     {'error': 'Number of months must be positive'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            backend, error = _parse_backend(request)
+            if error:
+                return error
 
-            # Get historical data
-            historical_data = get_historical_monthly_data(
+            # Generate predictions (served from the forecast cache when history is unchanged)
+            predictions, projection_method = forecast_metric(
                 company_id,
-                calculate_company_monthly_revenue,
+                'revenue',
                 num_historical_months,
-                is_company=True
-            )
-
-            # Generate predictions
-            predictions, projection_method = predict_future_months(
-                historical_data,
                 num_projection_months,
-                metric='revenue'
+                is_company=True,
+                backend=backend
             )
 
             return Response({
@@ -197,20 +195,18 @@ class CompanyProfitPredictionAPIView(APIView):
                     {'error': 'Number of months must be positive'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            backend, error = _parse_backend(request)
+            if error:
+                return error
 
-            # Get historical data
-            historical_data = get_historical_monthly_data(
+            # Generate predictions (served from the forecast cache when history is unchanged)
+            predictions, projection_method = forecast_metric(
                 company_id,
-                calculate_company_monthly_profit,
+                'profit',
                 num_historical_months,
-                is_company=True
-            )
-
-            # Generate predictions
-            predictions, projection_method = predict_future_months(
-                historical_data,
                 num_projection_months,
-                metric='profit'
+                is_company=True,
+                backend=backend
             )
 
             return Response({
@@ -239,20 +235,18 @@ class CompanyCustomerPredictionAPIView(APIView):
                     {'error': 'Number of months must be positive'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            backend, error = _parse_backend(request)
+            if error:
+                return error
 
-            # Get historical data
-            historical_data = get_historical_monthly_data(
+            # Generate predictions (served from the forecast cache when history is unchanged)
+            predictions, projection_method = forecast_metric(
                 company_id,
-                calculate_company_monthly_customers,
+                'customers',
                 num_historical_months,
-                is_company=True
-            )
-
-            # Generate predictions
-            predictions, projection_method = predict_future_months(
-                historical_data,
                 num_projection_months,
-                metric='customers'
+                is_company=True,
+                backend=backend
             )
 
             return Response({
@@ -267,3 +261,55 @@ class CompanyCustomerPredictionAPIView(APIView):
                 {'error': str(e)},
                 status=status.HTTP_404_NOT_FOUND
             )
+
+class CompanyBatchPredictionAPIView(APIView):
+    def post(self, request, company_id):
+        if not Company.objects.filter(id=company_id).exists():
+            return Response(
+                {'error': 'Company not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Get parameters with defaults
+        num_projection_months = request.data.get('num_projection_months', 6)
+        num_historical_months = request.data.get('num_historical_months', 12)
+        metrics = request.data.get('metrics', list(HISTORY_METRICS))
+
+        # Validate parameters
+        if num_projection_months < 1 or num_historical_months < 1:
+            return Response(
+                {'error': 'Number of months must be positive'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        backend, error = _parse_backend(request)
+        if error:
+            return error
+        if not metrics or any(metric not in HISTORY_METRICS for metric in metrics):
+            return Response(
+                {'error': f"metrics must be a non-empty subset of {', '.join(HISTORY_METRICS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        store_ids = [
+            str(store_id)
+            for store_id in Store.objects.filter(company_id=company_id, is_active='active').values_list('id', flat=True)
+        ]
+
+        # Fit every store's models in parallel (cached forecasts are reused)
+        forecasts = batch_forecast(
+            store_ids,
+            tuple(metrics),
+            num_historical_months,
+            num_projection_months,
+            backend=backend
+        )
+
+        return Response({
+            'company_id': company_id,
+            'metrics_predicted': metrics,
+            'num_projected_months': num_projection_months,
+            'stores': [
+                {'store_id': store_id, 'predictions': forecasts.get(store_id, {})}
+                for store_id in store_ids
+            ]
+        })
@@ -0,0 +1,91 @@
+import hashlib
+import logging
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'reports:version:{store_id}'
+REPORT_KEY = 'reports:{report_type}:{store_id}:v{version}:{params}'
+
+
+def _version_key(store_id):
+    return VERSION_KEY.format(store_id=store_id)
+
+
+def get_data_version(store_id):
+    """
+    Current data version for a store. The version is seeded from the clock so that
+    an evicted version key can never bring back entries cached under an older one.
+    """
+    key = _version_key(store_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(store_id):
+    """Invalidate every cached report for a store"""
+    key = _version_key(store_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No version yet for this store, nothing cached under it
+        cache.add(key, int(time.time() * 1000), timeout=None)
+    except Exception as e:
+        logger.warning(f"Failed to bump report cache version for store {store_id}: {e}")
+
+
+def report_cache_key(report_type, store_id, query_params):
+    """
+    Key a report on its store, type, request parameters and the store's data version.
+    Today's date is part of the key because reports default their date range to it.
+    """
+    params = sorted((name, value) for name, value in query_params.items())
+    params.append(('today', timezone.now().strftime('%Y-%m-%d')))
+    digest = hashlib.md5(repr(params).encode()).hexdigest()
+    return REPORT_KEY.format(
+        report_type=report_type,
+        store_id=store_id,
+        version=get_data_version(store_id),
+        params=digest
+    )
+
+
+def cache_report(report_type):
+    """
+    Decorator for the Generate*ReportView.get methods. Successful responses are cached
+    until the store's data version changes or REPORT_CACHE_TIMEOUT expires.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, store_id, *args, **kwargs):
+            if not settings.REPORT_CACHE_ENABLED:
+                return view_method(self, request, store_id, *args, **kwargs)
+
+            try:
+                key = report_cache_key(report_type, store_id, request.query_params)
+                data = cache.get(key)
+            except Exception as e:
+                logger.warning(f"Report cache unavailable, generating {report_type} report directly: {e}")
+                return view_method(self, request, store_id, *args, **kwargs)
+
+            if data is not None:
+                return Response(data, status=status.HTTP_200_OK)
+
+            response = view_method(self, request, store_id, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                try:
+                    cache.set(key, response.data, timeout=settings.REPORT_CACHE_TIMEOUT)
+                except Exception as e:
+                    logger.warning(f"Failed to cache {report_type} report for store {store_id}: {e}")
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,128 @@
+import logging
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from reports.models import Report
+
+logger = logging.getLogger(__name__)
+
+# Report job types, named as in ReportListView
+REPORT_JOB_TYPES = {
+    'sales': Report.ReportType.SALES,
+    'inventory': Report.ReportType.INVENTORY,
+    'financial': Report.ReportType.FINANCIAL,
+    'customer': Report.ReportType.CUSTOMER,
+    'product': Report.ReportType.PRODUCT,
+    'profit': Report.ReportType.PROFIT,
+    'revenue': Report.ReportType.REVENUE,
+    'purchase': Report.ReportType.PURCHASE,
+}
+
+# Views that compute each report type (reports.views imports this module)
+REPORT_TYPE_VIEWS = {
+    Report.ReportType.SALES: 'GenerateSalesReportView',
+    Report.ReportType.INVENTORY: 'GenerateInventoryReportView',
+    Report.ReportType.FINANCIAL: 'GenerateFinancialReportView',
+    Report.ReportType.CUSTOMER: 'GenerateCustomerReportView',
+    Report.ReportType.PRODUCT: 'GenerateProductPerformanceReportView',
+    Report.ReportType.PROFIT: 'GenerateProfitReportView',
+    Report.ReportType.REVENUE: 'GenerateRevenueReportView',
+    Report.ReportType.PURCHASE: 'GeneratePurchaseReportView',
+}
+
+
+class ReportJobError(Exception):
+    pass
+
+
+class _JobRequest:
+    """Minimal stand-in for a DRF request; the report views only read query_params"""
+    def __init__(self, query_params):
+        self.query_params = query_params
+
+
+def _parse_date(value):
+    return timezone.make_aware(datetime.strptime(value, '%Y-%m-%d')) if value else None
+
+
+def enqueue_report_job(store, report_type, parameters):
+    """
+    Create a PENDING report job. ``report_type`` is one of the REPORT_JOB_TYPES keys and
+    ``parameters`` holds the report's query parameters (start_date, end_date, ...).
+    """
+    if report_type not in REPORT_JOB_TYPES:
+        raise ReportJobError(f"Unknown report type '{report_type}'")
+
+    try:
+        date_range_start = _parse_date(parameters.get('start_date'))
+        date_range_end = _parse_date(parameters.get('end_date'))
+    except ValueError:
+        raise ReportJobError("Invalid date format. Use YYYY-MM-DD")
+
+    return Report.objects.create(
+        store=store,
+        report_type=REPORT_JOB_TYPES[report_type],
+        date_range_start=date_range_start,
+        date_range_end=date_range_end,
+        parameters=parameters
+    )
+
+
+def requeue_stale_jobs():
+    """
+    Put RUNNING jobs started more than REPORT_JOB_TIMEOUT seconds ago back to PENDING.
+    A worker that dies mid-report (deploy, OOM kill) otherwise leaves its job RUNNING forever.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.REPORT_JOB_TIMEOUT)
+    requeued = Report.objects.filter(
+        status=Report.Status.RUNNING,
+        started_at__lt=cutoff
+    ).update(status=Report.Status.PENDING, started_at=None, updated_at=timezone.now())
+    if requeued:
+        logger.warning(f"Requeued {requeued} report job(s) running for more than {settings.REPORT_JOB_TIMEOUT}s")
+    return requeued
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest PENDING job to RUNNING and return it, or None.
+    SKIP LOCKED lets several workers poll the table without handing out the same job.
+    """
+    requeue_stale_jobs()
+    with transaction.atomic():
+        job = Report.objects.select_for_update(skip_locked=True).filter(
+            status=Report.Status.PENDING
+        ).order_by('created_at').first()
+        if job is None:
+            return None
+        job.status = Report.Status.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
+
+
+def run_report_job(job):
+    """Compute a claimed job and persist its result or error"""
+    from reports import views
+
+    view_class = getattr(views, REPORT_TYPE_VIEWS[job.report_type])
+    try:
+        response = view_class().get(_JobRequest(job.parameters), job.store_id)
+        if response.status_code != status.HTTP_200_OK:
+            raise ReportJobError(response.data.get('error', f"Report failed with status {response.status_code}"))
+
+        job.result = response.data
+        job.title = response.data.get('title', '')
+        job.description = response.data.get('description', '')
+        job.status = Report.Status.COMPLETED
+        job.error = ''
+    except Exception as e:
+        logger.error(f"Report job {job.id} failed: {e}")
+        job.status = Report.Status.FAILED
+        job.error = str(e)
+
+    job.completed_at = timezone.now()
+    job.save()
+    return job
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from companies.models import Store
+from reports.rollups import rebuild_daily_sales
+
+class Command(BaseCommand):
+    help = 'Builds the daily sales rollup table from existing sales'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--store', action='append', dest='store_ids', help='UUID of a store to rebuild (repeatable, defaults to all stores)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of rollup rows inserted per batch')
+
+    def handle(self, *args, **options):
+        store_ids = options['store_ids']
+
+        if store_ids:
+            missing = set(store_ids) - set(str(pk) for pk in Store.objects.filter(id__in=store_ids).values_list('id', flat=True))
+            if missing:
+                self.stdout.write(self.style.ERROR(f'Stores not found: {", ".join(sorted(missing))}'))
+                return
+
+        written = rebuild_daily_sales(store_ids=store_ids, batch_size=options['batch_size'])
+
+        scope = f'{len(store_ids)} store(s)' if store_ids else 'all stores'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rebuilt daily sales rollup for {scope}: {written} rows written'
+            )
+        )
@@ -0,0 +1,37 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from reports.jobs import claim_next_job, run_report_job
+
+class Command(BaseCommand):
+    help = 'Processes queued background report jobs. Run several instances to work jobs in parallel.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process all pending jobs and exit instead of polling')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait between polls when the queue is empty')
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval']
+        self.stdout.write(self.style.SUCCESS('Starting report job worker...'))
+
+        try:
+            while True:
+                close_old_connections()
+                job = claim_next_job()
+
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                started = time.monotonic()
+                job = run_report_job(job)
+                elapsed = time.monotonic() - started
+
+                if job.status == job.Status.COMPLETED:
+                    self.stdout.write(self.style.SUCCESS(f'Completed {job.report_type} report {job.id} in {elapsed:.2f}s'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'Failed {job.report_type} report {job.id}: {job.error}'))
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Stopping report job worker...'))
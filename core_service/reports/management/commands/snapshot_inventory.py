@@ -0,0 +1,38 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand
+from companies.models import Store
+from reports.snapshots import snapshot_inventory
+
+class Command(BaseCommand):
+    help = 'Copies the current inventory of each store into the daily inventory snapshot table. Run it once a day, shortly before midnight (e.g. from cron).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--store', action='append', dest='store_ids', help='UUID of a store to snapshot (repeatable, defaults to all stores)')
+        parser.add_argument('--day', help='Day to record the snapshot under, as YYYY-MM-DD (defaults to today; pass yesterday when running just after midnight)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of snapshot rows inserted per batch')
+
+    def handle(self, *args, **options):
+        store_ids = options['store_ids']
+
+        if store_ids:
+            missing = set(store_ids) - set(str(pk) for pk in Store.objects.filter(id__in=store_ids).values_list('id', flat=True))
+            if missing:
+                self.stdout.write(self.style.ERROR(f'Stores not found: {", ".join(sorted(missing))}'))
+                return
+
+        day = None
+        if options['day']:
+            try:
+                day = datetime.strptime(options['day'], '%Y-%m-%d').date()
+            except ValueError:
+                self.stdout.write(self.style.ERROR('Invalid day. Use YYYY-MM-DD'))
+                return
+
+        written = snapshot_inventory(store_ids=store_ids, day=day, batch_size=options['batch_size'])
+
+        scope = f'{len(store_ids)} store(s)' if store_ids else 'all stores'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Snapshotted inventory for {scope}: {written} rows written'
+            )
+        )
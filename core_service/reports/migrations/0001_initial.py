@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-17 09:12
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('companies', '0004_remove_subscriptionplan_features_and_more'),
+        ('inventory', '0004_stocktransfer'),
+        ('transactions', '0005_remove_customer_credit_limit_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesFact',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('quantity', models.DecimalField(decimal_places=4, default=Decimal('0'), max_digits=19)),
+                ('revenue', models.DecimalField(decimal_places=4, default=Decimal('0'), max_digits=19)),
+                ('cost', models.DecimalField(decimal_places=4, default=Decimal('0'), max_digits=19)),
+                ('tax', models.DecimalField(decimal_places=4, default=Decimal('0'), max_digits=19)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales_facts', to='inventory.productcategory')),
+                ('payment_mode', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='transactions.paymentmode')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales_facts', to='inventory.product')),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales_facts', to='companies.store')),
+            ],
+            options={
+                'db_table': 'daily_sales_facts',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['store', 'day'], name='daily_sales_store_day_idx')],
+                'unique_together': {('store', 'day', 'product', 'category', 'payment_mode')},
+            },
+        ),
+    ]
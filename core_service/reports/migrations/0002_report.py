@@ -0,0 +1,42 @@
+# Generated by Django 5.1.7 on 2026-10-17 10:41
+
+import django.core.serializers.json
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_remove_subscriptionplan_features_and_more'),
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Report',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('report_type', models.CharField(choices=[('SALES', 'Sales Report'), ('INVENTORY', 'Inventory Report'), ('FINANCIAL', 'Financial Report'), ('CUSTOMER', 'Customer Report'), ('PRODUCT', 'Product Performance Report'), ('PROFIT', 'Profit Report'), ('REVENUE', 'Revenue Report'), ('PURCHASE', 'Purchase Report')], max_length=20)),
+                ('title', models.CharField(blank=True, default='', max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('date_range_start', models.DateTimeField(blank=True, null=True)),
+                ('date_range_end', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('parameters', models.JSONField(blank=True, default=dict)),
+                ('result', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='companies.store')),
+            ],
+            options={
+                'db_table': 'reports',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='reports_status_created_idx')],
+            },
+        ),
+    ]
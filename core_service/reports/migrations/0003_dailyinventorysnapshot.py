@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-17 18:20
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_remove_subscriptionplan_features_and_more'),
+        ('inventory', '0007_stockmovement_stockcheckpoint'),
+        ('reports', '0002_report'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyInventorySnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('quantity', models.DecimalField(decimal_places=4, default=Decimal('0'), max_digits=19)),
+                ('purchase_value', models.DecimalField(decimal_places=4, default=Decimal('0'), max_digits=19)),
+                ('sale_value', models.DecimalField(decimal_places=4, default=Decimal('0'), max_digits=19)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_inventory_snapshots', to='inventory.product')),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_inventory_snapshots', to='companies.store')),
+            ],
+            options={
+                'db_table': 'daily_inventory_snapshots',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['store', 'day'], name='daily_inventory_store_day_idx')],
+                'unique_together': {('store', 'day', 'product')},
+            },
+        ),
+    ]
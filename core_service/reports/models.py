@@ -1,33 +1,112 @@
-# from django.db import models
-# import uuid
-# from django.utils import timezone
-# from decimal import Decimal
-
-# class Report(models.Model):
-#     class ReportType(models.TextChoices):
-#         SALES = 'SALES', 'Sales Report'
-#         INVENTORY = 'INVENTORY', 'Inventory Report'
-#         FINANCIAL = 'FINANCIAL', 'Financial Report'
-#         CUSTOMER = 'CUSTOMER', 'Customer Report'
-#         PRODUCT = 'PRODUCT', 'Product Performance Report'
-#         PROFIT = 'PROFIT', 'Profit Report'
-#         REVENUE = 'REVENUE', 'Revenue Report'
-    
-#     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-#     store = models.ForeignKey('companies.Store', on_delete=models.CASCADE)
-#     report_type = models.CharField(max_length=20, choices=ReportType.choices)
-#     title = models.CharField(max_length=255)
-#     description = models.TextField(blank=True)
-#     date_range_start = models.DateTimeField()
-#     date_range_end = models.DateTimeField()
-#     created_at = models.DateTimeField(auto_now_add=True)
-#     updated_at = models.DateTimeField(auto_now=True)
-    
-#     class Meta:
-#         ordering = ['-created_at']
-    
-#     def __str__(self):
-#         return f"{self.title} - {self.store.name}"
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+import uuid
+from decimal import Decimal
+
+
+class DailySalesFact(models.Model):
+    """
+    Daily sales rollup per (store, day, product, category, payment mode).
+    Maintained incrementally by reports.rollups whenever a sale is created,
+    updated or deleted, and rebuilt with the backfill_daily_sales command.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    store = models.ForeignKey('companies.Store', on_delete=models.CASCADE, related_name='daily_sales_facts')
+    day = models.DateField()
+    product = models.ForeignKey('inventory.Product', on_delete=models.CASCADE, related_name='daily_sales_facts')
+    category = models.ForeignKey('inventory.ProductCategory', on_delete=models.CASCADE, related_name='daily_sales_facts')
+    payment_mode = models.ForeignKey('transactions.PaymentMode', on_delete=models.SET_NULL, null=True, blank=True)
+    quantity = models.DecimalField(max_digits=19, decimal_places=4, default=Decimal('0'))
+    revenue = models.DecimalField(max_digits=19, decimal_places=4, default=Decimal('0'))
+    cost = models.DecimalField(max_digits=19, decimal_places=4, default=Decimal('0'))
+    tax = models.DecimalField(max_digits=19, decimal_places=4, default=Decimal('0'))
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'daily_sales_facts'
+        ordering = ['day']
+        unique_together = ['store', 'day', 'product', 'category', 'payment_mode']
+        indexes = [
+            models.Index(fields=['store', 'day'], name='daily_sales_store_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} - {self.product_id} ({self.quantity})"
+
+
+class DailyInventorySnapshot(models.Model):
+    """
+    A store's stock of a product at the end of a day, valued at the purchase and
+    sale prices of that day. Copied from the live inventory by the
+    snapshot_inventory command so inventory reports can look back in time.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    store = models.ForeignKey('companies.Store', on_delete=models.CASCADE, related_name='daily_inventory_snapshots')
+    day = models.DateField()
+    product = models.ForeignKey('inventory.Product', on_delete=models.CASCADE, related_name='daily_inventory_snapshots')
+    quantity = models.DecimalField(max_digits=19, decimal_places=4, default=Decimal('0'))
+    purchase_value = models.DecimalField(max_digits=19, decimal_places=4, default=Decimal('0'))
+    sale_value = models.DecimalField(max_digits=19, decimal_places=4, default=Decimal('0'))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'daily_inventory_snapshots'
+        ordering = ['day']
+        unique_together = ['store', 'day', 'product']
+        indexes = [
+            models.Index(fields=['store', 'day'], name='daily_inventory_store_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} - {self.product_id} ({self.quantity})"
+
+class Report(models.Model):
+    """
+    A report generated in the background. Created as PENDING by the report job
+    endpoint, picked up by the process_report_jobs worker and stored with its result.
+    """
+    class ReportType(models.TextChoices):
+        SALES = 'SALES', 'Sales Report'
+        INVENTORY = 'INVENTORY', 'Inventory Report'
+        FINANCIAL = 'FINANCIAL', 'Financial Report'
+        CUSTOMER = 'CUSTOMER', 'Customer Report'
+        PRODUCT = 'PRODUCT', 'Product Performance Report'
+        PROFIT = 'PROFIT', 'Profit Report'
+        REVENUE = 'REVENUE', 'Revenue Report'
+        PURCHASE = 'PURCHASE', 'Purchase Report'
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        RUNNING = 'RUNNING', 'Running'
+        COMPLETED = 'COMPLETED', 'Completed'
+        FAILED = 'FAILED', 'Failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    store = models.ForeignKey('companies.Store', on_delete=models.CASCADE)
+    report_type = models.CharField(max_length=20, choices=ReportType.choices)
+    title = models.CharField(max_length=255, blank=True, default='')
+    description = models.TextField(blank=True)
+    date_range_start = models.DateTimeField(null=True, blank=True)
+    date_range_end = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    parameters = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True, default='')
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'reports'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='reports_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title or self.get_report_type_display()} - {self.store.name}"
 
 
 # class SalesReport(models.Model):
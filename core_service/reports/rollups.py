@@ -0,0 +1,147 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from reports.models import DailySalesFact
+from transactions.models.sale_item import SaleItem
+
+FACT_FIELDS = ('quantity', 'revenue', 'cost', 'tax')
+
+_decimal_field = DecimalField(max_digits=38, decimal_places=10)
+
+
+def _sale_day(sale):
+    return timezone.localtime(sale.created_at).date()
+
+
+def _sale_fact_deltas(sale):
+    """
+    Group the items of a sale into rollup rows keyed by (product, category).
+    Revenue uses the price the item was sold at, cost the product purchase price,
+    and tax follows the sale's tax percentage.
+    """
+    deltas = defaultdict(lambda: dict.fromkeys(FACT_FIELDS, Decimal('0')))
+    tax_rate = Decimal(sale.tax or 0) / Decimal('100')
+    items = SaleItem.objects.filter(sale=sale).select_related('product')
+
+    for item in items:
+        product = item.product
+        price = item.item_sale_price if item.item_sale_price is not None else product.sale_price
+        revenue = item.quantity * price
+        row = deltas[(product.id, product.product_category_id)]
+        row['quantity'] += item.quantity
+        row['revenue'] += revenue
+        row['cost'] += item.quantity * product.purchase_price
+        row['tax'] += revenue * tax_rate
+
+    return deltas
+
+
+def _apply_delta(key, values, sign):
+    increments = {field: F(field) + sign * values[field] for field in FACT_FIELDS}
+    updated = DailySalesFact.objects.filter(**key).update(updated_at=timezone.now(), **increments)
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            DailySalesFact.objects.create(**key, **{field: sign * values[field] for field in FACT_FIELDS})
+    except IntegrityError:
+        # Another request created the row concurrently; fold our delta into it
+        DailySalesFact.objects.filter(**key).update(updated_at=timezone.now(), **increments)
+
+
+def apply_sale(sale, sign=1):
+    """
+    Add (sign=1) or remove (sign=-1) a sale's contribution to the daily rollup.
+    Must be called while the sale's items are still in the database.
+    """
+    day = _sale_day(sale)
+    with transaction.atomic():
+        for (product_id, category_id), values in _sale_fact_deltas(sale).items():
+            key = {
+                'store_id': sale.store_id_id,
+                'day': day,
+                'product_id': product_id,
+                'category_id': category_id,
+                'payment_mode_id': sale.payment_mode_id,
+            }
+            _apply_delta(key, values, sign)
+
+
+def record_sale(sale):
+    apply_sale(sale, sign=1)
+
+
+def reverse_sale(sale):
+    apply_sale(sale, sign=-1)
+
+
+def rebuild_daily_sales(store_ids=None, batch_size=1000):
+    """
+    Rebuild the rollup from sale items, optionally for a subset of stores.
+    Returns the number of rollup rows written.
+    """
+    items = SaleItem.objects.all()
+    facts = DailySalesFact.objects.all()
+    if store_ids:
+        items = items.filter(sale__store_id__in=store_ids)
+        facts = facts.filter(store_id__in=store_ids)
+
+    revenue = ExpressionWrapper(
+        F('quantity') * Coalesce(F('item_sale_price'), F('product__sale_price')),
+        output_field=_decimal_field
+    )
+    grouped = items.order_by().values(
+        'sale__store_id', 'product_id', 'product__product_category_id', 'sale__payment_mode_id',
+        day=TruncDate('sale__created_at'),
+    ).annotate(
+        total_quantity=Sum('quantity'),
+        total_revenue=Sum(revenue),
+        total_cost=Sum(F('quantity') * F('product__purchase_price'), output_field=_decimal_field),
+        total_tax=Sum(revenue * F('sale__tax') / Decimal('100'), output_field=_decimal_field),
+    )
+
+    written = 0
+    with transaction.atomic():
+        facts.delete()
+        batch = []
+        for row in grouped.iterator():
+            batch.append(DailySalesFact(
+                store_id=row['sale__store_id'],
+                day=row['day'],
+                product_id=row['product_id'],
+                category_id=row['product__product_category_id'],
+                payment_mode_id=row['sale__payment_mode_id'],
+                quantity=row['total_quantity'] or Decimal('0'),
+                revenue=row['total_revenue'] or Decimal('0'),
+                cost=row['total_cost'] or Decimal('0'),
+                tax=row['total_tax'] or Decimal('0'),
+            ))
+            if len(batch) >= batch_size:
+                DailySalesFact.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            DailySalesFact.objects.bulk_create(batch)
+            written += len(batch)
+
+    return written
+
+
+def daily_sales_facts(store_ids, start_date, end_date):
+    """
+    Rollup rows for the given stores whose day falls within [start_date, end_date].
+    Accepts dates or datetimes; only the date part is used.
+    """
+    if hasattr(start_date, 'date'):
+        start_date = start_date.date()
+    if hasattr(end_date, 'date'):
+        end_date = end_date.date()
+    return DailySalesFact.objects.filter(
+        store_id__in=store_ids,
+        day__gte=start_date,
+        day__lte=end_date
+    )
@@ -1,3 +1,39 @@
+from rest_framework import serializers
+from reports.models import Report
+from reports.jobs import REPORT_JOB_TYPES
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Report
+        fields = [
+            'id', 'store', 'report_type', 'status', 'title', 'description',
+            'date_range_start', 'date_range_end', 'parameters', 'error',
+            'started_at', 'completed_at', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class ReportJobResultSerializer(ReportJobSerializer):
+    class Meta(ReportJobSerializer.Meta):
+        fields = ReportJobSerializer.Meta.fields + ['result']
+        read_only_fields = fields
+
+
+class ReportJobCreateSerializer(serializers.Serializer):
+    report_type = serializers.ChoiceField(choices=sorted(REPORT_JOB_TYPES))
+    start_date = serializers.DateField(required=False, format='%Y-%m-%d', input_formats=['%Y-%m-%d'])
+    end_date = serializers.DateField(required=False, format='%Y-%m-%d', input_formats=['%Y-%m-%d'])
+    limit = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        start_date = attrs.get('start_date')
+        end_date = attrs.get('end_date')
+        if start_date and end_date and start_date > end_date:
+            raise serializers.ValidationError("start_date must be on or before end_date.")
+        return attrs
+
+
 # from rest_framework import serializers
 # from reports.models import (
 #     Report, 
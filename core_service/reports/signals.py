@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from financials.models.expense import Expense
+from financials.models.payment_in import PaymentIn
+from financials.models.payment_out import PaymentOut
+from inventory.models.inventory import Inventory
+from transactions.models.purchase import Purchase
+from transactions.models.purchase_item import PurchaseItem
+from transactions.models.sale import Sale
+from transactions.models.sale_item import SaleItem
+from reports.cache import bump_data_version
+
+# Models whose store foreign key is named store_id
+STORE_SCOPED_MODELS = (Sale, Purchase, Expense, PaymentIn, PaymentOut)
+
+
+def _invalidate_store_reports(store_id):
+    if store_id is not None:
+        # Bump after commit so a report generated mid-transaction cannot be cached
+        # under the new version
+        transaction.on_commit(lambda: bump_data_version(store_id))
+
+
+def invalidate_reports_on_change(sender, instance, **kwargs):
+    """Invalidate cached reports for the store whose data changed"""
+    if sender in STORE_SCOPED_MODELS:
+        _invalidate_store_reports(instance.store_id_id)
+    elif sender is Inventory:
+        _invalidate_store_reports(instance.store_id)
+    elif sender is SaleItem:
+        store_id = Sale.objects.filter(pk=instance.sale_id).values_list('store_id', flat=True).first()
+        _invalidate_store_reports(store_id)
+    elif sender is PurchaseItem:
+        store_id = Purchase.objects.filter(pk=instance.purchase_id).values_list('store_id', flat=True).first()
+        _invalidate_store_reports(store_id)
+
+
+for model in (*STORE_SCOPED_MODELS, Inventory, SaleItem, PurchaseItem):
+    post_save.connect(invalidate_reports_on_change, sender=model, dispatch_uid=f'reports_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_reports_on_change, sender=model, dispatch_uid=f'reports_cache_delete_{model.__name__}')
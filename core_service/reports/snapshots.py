@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.utils import timezone
+from inventory.models.inventory import Inventory
+from reports.cache import bump_data_version
+from reports.models import DailyInventorySnapshot
+
+_decimal_field = DecimalField(max_digits=38, decimal_places=10)
+
+
+def snapshot_inventory(store_ids=None, day=None, batch_size=1000):
+    """
+    Copy every inventory row, valued at the current purchase and sale prices, into
+    the snapshot table for ``day`` (default: today), optionally for a subset of
+    stores. Taking a day's snapshot again replaces it, so the job can run more than
+    once a day and the last run wins. Returns the number of snapshot rows written.
+    """
+    day = day or timezone.localdate()
+    items = Inventory.objects.all()
+    snapshots = DailyInventorySnapshot.objects.filter(day=day)
+    if store_ids:
+        items = items.filter(store_id__in=store_ids)
+        snapshots = snapshots.filter(store_id__in=store_ids)
+
+    rows = items.order_by().values('store_id', 'product_id', 'quantity').annotate(
+        purchase_value=ExpressionWrapper(F('quantity') * F('product__purchase_price'), output_field=_decimal_field),
+        sale_value=ExpressionWrapper(F('quantity') * F('product__sale_price'), output_field=_decimal_field),
+    )
+
+    written = 0
+    with transaction.atomic():
+        # Stores whose stock is gone lose their rows for the day and need a cache bump too
+        snapshotted_stores = set(snapshots.values_list('store_id', flat=True).distinct())
+        snapshots.delete()
+        batch = []
+        for row in rows.iterator():
+            snapshotted_stores.add(row['store_id'])
+            batch.append(DailyInventorySnapshot(
+                store_id=row['store_id'],
+                day=day,
+                product_id=row['product_id'],
+                quantity=row['quantity'],
+                purchase_value=row['purchase_value'],
+                sale_value=row['sale_value'],
+            ))
+            if len(batch) >= batch_size:
+                DailyInventorySnapshot.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            DailyInventorySnapshot.objects.bulk_create(batch)
+            written += len(batch)
+
+    # Inventory trends include the day just snapshotted
+    for store_id in snapshotted_stores:
+        bump_data_version(store_id)
+    return written
+
+
+def inventory_snapshots(store_ids, day):
+    """Snapshot rows for the given stores on ``day``"""
+    return DailyInventorySnapshot.objects.filter(store_id__in=store_ids, day=day)
+
+
+def inventory_trend(store_ids, start_date, end_date):
+    """
+    Per-day totals (products, quantity, purchase_value, sale_value) of the snapshots
+    for the given stores within [start_date, end_date], oldest first. Days without
+    a snapshot are absent. Accepts dates or datetimes; only the date part is used.
+    """
+    if hasattr(start_date, 'date'):
+        start_date = start_date.date()
+    if hasattr(end_date, 'date'):
+        end_date = end_date.date()
+    return DailyInventorySnapshot.objects.filter(
+        store_id__in=store_ids,
+        day__gte=start_date,
+        day__lte=end_date
+    ).order_by('day').values('day').annotate(
+        products=Count('id'),
+        quantity=Sum('quantity'),
+        purchase_value=Sum('purchase_value'),
+        sale_value=Sum('sale_value')
+    )
@@ -1,3 +1,209 @@
-from django.test import TestCase
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+from clothings.models import Collection, Color, Season
+from companies.models.company import Company
+from companies.models.store import Store
+from inventory.models.inventory import Inventory
+from inventory.models.product import Product
+from inventory.models.product_category import ProductCategory
+from inventory.models.product_unit import ProductUnit
+from reports.jobs import claim_next_job, enqueue_report_job, run_report_job
+from reports.models import DailyInventorySnapshot, Report
+from reports.rollups import rebuild_daily_sales
+from reports.snapshots import snapshot_inventory
+from reports.views import GenerateInventoryReportView
+from transactions.models.customer import Customer
+from transactions.models.sale import Sale
+from transactions.models.sale_item import SaleItem
 
-# Create your tests here.
+
+@override_settings(REPORT_CACHE_ENABLED=False)
+class InventoryReportTests(TestCase):
+    """The inventory report must cost a constant number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name='Inventory Report Co')
+        cls.store = Store.objects.create(company_id=company, name='Inventory Report Store', location='Nairobi')
+        unit = ProductUnit.objects.create(store_id=cls.store, name='Piece')
+        category = ProductCategory.objects.create(store_id=cls.store, name='Shirts')
+        season = Season.objects.create(store_id=cls.store, name='Summer', start_date=date(2025, 1, 1), end_date=date(2025, 6, 30))
+        collection = Collection.objects.create(store_id=cls.store, season_id=season, name='Linen', release_date=date(2025, 1, 1))
+        customer = Customer.objects.create(store_id=cls.store, name='Customer', email='customer@example.com')
+        sale = Sale.objects.create(store_id=cls.store, customer=customer, total_amount=Decimal('0'))
+
+        # Quantities 0, 5, 50 and 150 repeated: out of stock, low, normal and overstocked
+        for i in range(20):
+            color = Color.objects.create(store_id=cls.store, name=f'Color {i}', color_code=f'#{i:06d}')
+            product = Product.objects.create(
+                store_id=cls.store,
+                color_id=color,
+                collection_id=collection,
+                name=f'Product {i}',
+                product_unit=unit,
+                product_category=category,
+                purchase_price=Decimal('10'),
+                sale_price=Decimal('15')
+            )
+            Inventory.objects.create(product=product, store=cls.store, quantity=Decimal([0, 5, 50, 150][i % 4]))
+            if i % 4 == 2:
+                SaleItem.objects.create(sale=sale, product=product, quantity=Decimal('10'))
+
+    def test_inventory_report(self):
+        request = APIRequestFactory().get('/reports/inventory/')
+        with self.assertNumQueries(4):
+            response = GenerateInventoryReportView.as_view()(request, store_id=self.store.id)
+
+        data = response.data
+        self.assertEqual(data['total_products'], 20)
+        self.assertEqual(len(data['low_stock_products']), 10)
+        self.assertEqual(len(data['out_of_stock_products']), 5)
+        self.assertEqual(len(data['overstocked_products']), 5)
+        # 5 * (5 + 50 + 150) units at 15 each; 5 * 10 units sold at a cost of 10 each
+        self.assertEqual(data['inventory_value'], 15375.0)
+        self.assertAlmostEqual(data['inventory_turnover_rate'], 500 / 15375)
+        self.assertEqual(len(data['top_turnover_products']), 5)
+        self.assertAlmostEqual(data['top_turnover_products'][0]['turnover_rate'], 100 / 750)
+
+    def test_inventory_report_from_snapshot(self):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        Sale.objects.filter(store_id=self.store).update(created_at=timezone.now() - timedelta(days=1))
+        rebuild_daily_sales(store_ids=[self.store.id])
+        self.assertEqual(snapshot_inventory(store_ids=[self.store.id], day=yesterday), 20)
+        # Stock sold after the snapshot does not change the past report
+        Inventory.objects.filter(store=self.store).update(quantity=Decimal('0'))
+
+        request = APIRequestFactory().get('/reports/inventory/', {
+            'date': yesterday.strftime('%Y-%m-%d'),
+            'start_date': (yesterday - timedelta(days=6)).strftime('%Y-%m-%d')
+        })
+        with self.assertNumQueries(6):
+            response = GenerateInventoryReportView.as_view()(request, store_id=self.store.id)
+
+        data = response.data
+        self.assertEqual(data['total_products'], 20)
+        self.assertEqual(len(data['out_of_stock_products']), 5)
+        self.assertEqual(data['inventory_value'], 15375.0)
+        self.assertEqual(data['inventory_purchase_value'], 10250.0)
+        self.assertAlmostEqual(data['inventory_turnover_rate'], 500 / 15375)
+        self.assertEqual(len(data['top_turnover_products']), 5)
+        self.assertEqual(data['inventory_trend'], [{
+            'date': yesterday.strftime('%Y-%m-%d'),
+            'total_products': 20,
+            'total_quantity': 1025.0,
+            'purchase_value': 10250.0,
+            'sale_value': 15375.0
+        }])
+
+    def test_snapshot_of_emptied_store_bumps_cache(self):
+        day = timezone.localdate()
+        snapshot_inventory(store_ids=[self.store.id], day=day)
+        Inventory.objects.filter(store=self.store).delete()
+
+        with mock.patch('reports.snapshots.bump_data_version') as bump:
+            self.assertEqual(snapshot_inventory(day=day), 0)
+        bump.assert_called_once_with(self.store.id)
+        self.assertFalse(DailyInventorySnapshot.objects.filter(store=self.store, day=day).exists())
+
+    def test_inventory_report_without_snapshot(self):
+        request = APIRequestFactory().get('/reports/inventory/', {'date': '2020-01-01'})
+        response = GenerateInventoryReportView.as_view()(request, store_id=self.store.id)
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(REPORT_CACHE_ENABLED=False, REPORT_JOB_TIMEOUT=60)
+class ReportJobTests(TestCase):
+    """Queued reports go PENDING -> RUNNING -> COMPLETED and are served by the job endpoints"""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name='Report Job Co')
+        cls.store = Store.objects.create(company_id=company, name='Report Job Store', location='Nairobi')
+        unit = ProductUnit.objects.create(store_id=cls.store, name='Piece')
+        category = ProductCategory.objects.create(store_id=cls.store, name='Shirts')
+        season = Season.objects.create(store_id=cls.store, name='Summer', start_date=date(2025, 1, 1), end_date=date(2025, 6, 30))
+        collection = Collection.objects.create(store_id=cls.store, season_id=season, name='Linen', release_date=date(2025, 1, 1))
+        color = Color.objects.create(store_id=cls.store, name='Blue', color_code='#0000ff')
+        product = Product.objects.create(
+            store_id=cls.store,
+            color_id=color,
+            collection_id=collection,
+            name='Shirt',
+            product_unit=unit,
+            product_category=category,
+            purchase_price=Decimal('10'),
+            sale_price=Decimal('15')
+        )
+        Inventory.objects.create(product=product, store=cls.store, quantity=Decimal('40'))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.jobs_url = f'/reports/stores/{self.store.id}/reports/jobs/'
+
+    def test_enqueue_claim_run_and_fetch(self):
+        response = self.client.post(self.jobs_url, {'report_type': 'inventory'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], Report.Status.PENDING)
+        status_url = response.data['status_url']
+
+        job = claim_next_job()
+        self.assertEqual(str(job.id), str(response.data['id']))
+        self.assertEqual(job.status, Report.Status.RUNNING)
+        self.assertIsNone(claim_next_job())
+
+        job = run_report_job(job)
+        self.assertEqual(job.status, Report.Status.COMPLETED)
+
+        detail = self.client.get(status_url)
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(detail.data['status'], Report.Status.COMPLETED)
+        self.assertEqual(detail.data['result']['total_products'], 1)
+        self.assertEqual(detail.data['result']['inventory_value'], 600.0)
+
+        listing = self.client.get(self.jobs_url)
+        self.assertEqual([item['id'] for item in listing.data], [detail.data['id']])
+
+    def test_enqueue_rejects_unknown_type(self):
+        response = self.client.post(self.jobs_url, {'report_type': 'weather'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_not_found(self):
+        response = self.client.get(f'{self.jobs_url}{uuid.uuid4()}/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_worker_processes_queue(self):
+        first = enqueue_report_job(self.store, 'inventory', {})
+        second = enqueue_report_job(self.store, 'sales', {'start_date': '2025-01-01', 'end_date': '2025-01-31'})
+
+        out = StringIO()
+        call_command('process_report_jobs', '--once', stdout=out)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, Report.Status.COMPLETED)
+        self.assertEqual(second.status, Report.Status.COMPLETED)
+        self.assertIsNotNone(second.completed_at)
+        self.assertEqual(out.getvalue().count('Completed'), 2)
+
+    def test_stale_running_job_is_reclaimed(self):
+        stale = enqueue_report_job(self.store, 'inventory', {})
+        Report.objects.filter(pk=stale.pk).update(
+            status=Report.Status.RUNNING,
+            started_at=timezone.now() - timedelta(seconds=120)
+        )
+        fresh = enqueue_report_job(self.store, 'inventory', {})
+        Report.objects.filter(pk=fresh.pk).update(status=Report.Status.RUNNING, started_at=timezone.now())
+
+        job = claim_next_job()
+        self.assertEqual(job.pk, stale.pk)
+        self.assertEqual(job.status, Report.Status.RUNNING)
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, Report.Status.RUNNING)
+        self.assertIsNone(claim_next_job())
@@ -8,7 +8,9 @@ from reports.views import (
     GenerateProductPerformanceReportView,
     GenerateProfitReportView,
     GenerateRevenueReportView,
-    GeneratePurchaseReportView
+    GeneratePurchaseReportView,
+    ReportJobListView,
+    ReportJobDetailView
 )
 
 urlpatterns = [
@@ -23,4 +25,7 @@ urlpatterns = [
     path('stores/<uuid:store_id>/reports/profit/', GenerateProfitReportView.as_view(), name='generate-profit-report'),
     path('stores/<uuid:store_id>/reports/revenue/', GenerateRevenueReportView.as_view(), name='generate-revenue-report'),
     path('stores/<uuid:store_id>/reports/purchases/', GeneratePurchaseReportView.as_view(), name='generate-purchase-report'),
+    # Background report generation
+    path('stores/<uuid:store_id>/reports/jobs/', ReportJobListView.as_view(), name='report-job-list'),
+    path('stores/<uuid:store_id>/reports/jobs/<uuid:job_id>/', ReportJobDetailView.as_view(), name='report-job-detail'),
 ] 
\ No newline at end of file
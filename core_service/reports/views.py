@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from datetime import datetime, timedelta
-from django.db.models import Sum, Avg, Count, F, Q, Max
+from django.db.models import Sum, Avg, Count, ExpressionWrapper, F, Q, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, TruncMonth
 from django.db import models
 from django.utils import timezone
 from decimal import Decimal
@@ -22,6 +23,12 @@ from financials.models.expense import Expense
 from financials.models.payment_in import PaymentIn
 from financials.models.payment_out import PaymentOut
 from transactions.models.supplier import Supplier
+from reports.rollups import daily_sales_facts
+from reports.snapshots import inventory_snapshots, inventory_trend
+from reports.cache import cache_report
+from reports.jobs import enqueue_report_job, ReportJobError
+from reports.models import Report
+from reports.serializers import ReportJobSerializer, ReportJobResultSerializer, ReportJobCreateSerializer
 # from reports.models import (
 #     Report, 
 #     SalesReport, 
@@ -44,6 +51,97 @@ from transactions.models.supplier import Supplier
 # )
 
 
+def _sale_items_subtotal(sale_ref='pk'):
+    """
+    Subquery expression summing quantity * current product sale price over the
+    items of the sale referenced by ``sale_ref``. Sales without items yield 0.
+    """
+    decimal_field = models.DecimalField(max_digits=38, decimal_places=8)
+    subtotal = SaleItem.objects.filter(
+        sale=OuterRef(sale_ref)
+    ).order_by().values('sale').annotate(
+        subtotal=Sum(F('quantity') * F('product__sale_price'), output_field=decimal_field)
+    ).values('subtotal')
+    return Coalesce(Subquery(subtotal, output_field=decimal_field), Value(Decimal('0')), output_field=decimal_field)
+
+
+def _inventory_with_turnover(store, since):
+    """
+    Inventory rows of a store annotated with stock_value (quantity * sale price),
+    purchase_value (quantity * purchase price), sold_quantity (units of the product sold by the store since ``since``, via a
+    correlated subquery) and cogs (sold_quantity * purchase price).
+    """
+    decimal_field = models.DecimalField(max_digits=38, decimal_places=8)
+    sold = SaleItem.objects.filter(
+        product=OuterRef('product'),
+        sale__store_id=store,
+        sale__created_at__gte=since
+    ).order_by().values('product').annotate(
+        total=Sum('quantity')
+    ).values('total')
+    return Inventory.objects.filter(store=store).order_by().annotate(
+        stock_value=ExpressionWrapper(F('quantity') * F('product__sale_price'), output_field=decimal_field),
+        purchase_value=ExpressionWrapper(F('quantity') * F('product__purchase_price'), output_field=decimal_field),
+        sold_quantity=Coalesce(Subquery(sold, output_field=decimal_field), Value(Decimal('0')), output_field=decimal_field),
+    ).annotate(
+        cogs=ExpressionWrapper(F('sold_quantity') * F('product__purchase_price'), output_field=decimal_field)
+    )
+
+
+# Stock level bands of the inventory report
+LOW_STOCK_THRESHOLD = 10
+HIGH_STOCK_THRESHOLD = 100
+
+
+def _stock_level_lists(items):
+    """
+    Split rows with product_id, product__name and quantity (and optionally
+    updated_at) into the low stock, out of stock and overstocked lists of the
+    inventory report. Out of stock items are also low stock.
+    """
+    low_stock_items = []
+    out_of_stock_items = []
+    overstocked_items = []
+    for item in items:
+        if item['quantity'] > HIGH_STOCK_THRESHOLD:
+            overstocked_items.append({
+                'product_id': str(item['product_id']),
+                'product_name': item['product__name'],
+                'current_quantity': float(item['quantity']),
+                'threshold': HIGH_STOCK_THRESHOLD
+            })
+            continue
+        low_stock_items.append({
+            'product_id': str(item['product_id']),
+            'product_name': item['product__name'],
+            'current_quantity': float(item['quantity']),
+            'threshold': LOW_STOCK_THRESHOLD
+        })
+        if item['quantity'] <= 0:
+            updated_at = item.get('updated_at')
+            out_of_stock_items.append({
+                'product_id': str(item['product_id']),
+                'product_name': item['product__name'],
+                'last_stocked': updated_at.strftime('%Y-%m-%d') if updated_at else None
+            })
+    return low_stock_items, out_of_stock_items, overstocked_items
+
+
+DEFAULT_TOP_N_LIMIT = 10
+MAX_TOP_N_LIMIT = 100
+
+
+def _parse_limit(request):
+    """
+    Size of the top-N lists in a report, from the optional ``limit`` query parameter.
+    Raises ValueError for anything but a positive integer; values are capped at MAX_TOP_N_LIMIT.
+    """
+    limit = int(request.query_params.get('limit', DEFAULT_TOP_N_LIMIT))
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, MAX_TOP_N_LIMIT)
+
+
 class ReportListView(APIView):
     permission_classes = [AllowAny]
     
@@ -71,9 +169,9 @@ class ReportListView(APIView):
             {
                 "type": "inventory",
                 "name": "Inventory Report",
-                "description": "Shows current inventory status, low stock items, and inventory value",
+                "description": "Shows current or past inventory status, low stock items, and inventory value trends",
                 "endpoint": f"/reports/stores/{store_id}/reports/inventory/",
-                "supports_date_range": False
+                "supports_date_range": True
             },
             {
                 "type": "financial",
@@ -130,9 +228,11 @@ class GenerateSalesReportView(APIView):
         parameters=[
             OpenApiParameter(name='store_id', type=str, location=OpenApiParameter.PATH),
             OpenApiParameter(name='start_date', type=str, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY)
+            OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='limit', type=int, location=OpenApiParameter.QUERY, description=f"Size of the top-N lists (default {DEFAULT_TOP_N_LIMIT}, max {MAX_TOP_N_LIMIT})")
         ]
     )
+    @cache_report('sales')
     def get(self, request: Request, store_id):
         try:
             store = Store.objects.get(pk=store_id)
@@ -149,6 +249,11 @@ class GenerateSalesReportView(APIView):
         except ValueError:
             return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
         
+        try:
+            limit = _parse_limit(request)
+        except ValueError:
+            return Response({"error": "limit must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
         # Get sales data
         sales = Sale.objects.filter(
             store_id=store_id,
@@ -156,48 +261,49 @@ class GenerateSalesReportView(APIView):
             created_at__lte=end_date
         )
         
-        # Calculate comprehensive sales metrics
-        total_sales_amount_received = sales.aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
+        # Expected amount per sale (item subtotal at current sale price, plus tax),
+        # computed by the database instead of one SaleItem query per sale
+        sales_with_expected = sales.annotate(
+            items_subtotal=_sale_items_subtotal()
+        ).annotate(
+            expected_amount=F('items_subtotal') + F('items_subtotal') * F('tax')
+        )
         
-        # Calculate actual expected amounts and payment status
-        cash_sales = Decimal('0')  # Fully paid sales
-        credit_sales = Decimal('0')  # Outstanding amount from unpaid/partially paid sales
-        total_expected_amount = Decimal('0')  # Total amount that should have been received
-        partially_paid_amount = Decimal('0')  # Amount received for partially paid sales
-        unpaid_count = 0
-        partially_paid_count = 0
-        fully_paid_count = 0
+        # Calculate comprehensive sales metrics and payment status buckets in one aggregate
+        decimal_field = models.DecimalField(max_digits=38, decimal_places=10)
+        unpaid = Q(total_amount__lte=0)
+        partially_paid = Q(total_amount__gt=0, total_amount__lt=F('expected_amount'))
+        fully_paid = Q(total_amount__gt=0, total_amount__gte=F('expected_amount'))
+        totals = sales_with_expected.aggregate(
+            total_received=Sum('total_amount'),
+            total_expected=Sum('expected_amount'),
+            highest_sale=Max('total_amount'),
+            transaction_count=Count('id'),
+            unpaid_expected=Sum('expected_amount', filter=unpaid, output_field=decimal_field),
+            partially_paid_received=Sum('total_amount', filter=partially_paid),
+            partially_paid_outstanding=Sum(
+                F('expected_amount') - F('total_amount'), filter=partially_paid, output_field=decimal_field
+            ),
+            fully_paid_received=Sum('total_amount', filter=fully_paid),
+            unpaid_count=Count('id', filter=unpaid),
+            partially_paid_count=Count('id', filter=partially_paid),
+            fully_paid_count=Count('id', filter=fully_paid),
+        )
         
-        for sale in sales:
-            # Calculate the actual expected amount for this sale (including tax)
-            sale_items = SaleItem.objects.filter(sale=sale)
-            actual_amount = Decimal('0')
-            
-            for item in sale_items:
-                actual_amount += item.quantity * item.product.sale_price
-            
-            # Apply tax to get the total expected amount
-            expected_amount_with_tax = actual_amount + (actual_amount * sale.tax)
-            total_expected_amount += expected_amount_with_tax
-            
-            # Determine payment status based on amount received vs expected
-            if sale.total_amount <= 0:
-                # Unpaid sale
-                credit_sales += expected_amount_with_tax
-                unpaid_count += 1
-            elif sale.total_amount < expected_amount_with_tax:
-                # Partially paid sale
-                cash_sales += sale.total_amount  # What was actually received
-                credit_sales += (expected_amount_with_tax - sale.total_amount)  # Outstanding amount
-                partially_paid_amount += sale.total_amount
-                partially_paid_count += 1
-            else:
-                # Fully paid sale
-                cash_sales += sale.total_amount
-                fully_paid_count += 1
+        total_sales_amount_received = totals['total_received'] or Decimal('0')
+        total_expected_amount = totals['total_expected'] or Decimal('0')  # Total amount that should have been received
+        partially_paid_amount = totals['partially_paid_received'] or Decimal('0')  # Amount received for partially paid sales
+        # Fully paid sales plus what was actually received on partially paid ones
+        cash_sales = (totals['fully_paid_received'] or Decimal('0')) + partially_paid_amount
+        # Outstanding amount from unpaid/partially paid sales
+        credit_sales = (totals['unpaid_expected'] or Decimal('0')) + (totals['partially_paid_outstanding'] or Decimal('0'))
+        unpaid_count = totals['unpaid_count']
+        partially_paid_count = totals['partially_paid_count']
+        fully_paid_count = totals['fully_paid_count']
+        transaction_count = totals['transaction_count']
         
         # Get highest sale
-        highest_sale = sales.aggregate(max_sale=Max('total_amount'))['max_sale'] or Decimal('0')
+        highest_sale = totals['highest_sale'] or Decimal('0')
         
         # Get sale items
         sale_items = SaleItem.objects.filter(sale__in=sales)
@@ -206,33 +312,40 @@ class GenerateSalesReportView(APIView):
         # Calculate average sale value
         avg_sale_received = Decimal('0')
         avg_sale_expected = Decimal('0')
-        if sales.count() > 0:
-            avg_sale_received = total_sales_amount_received / sales.count()
-            avg_sale_expected = total_expected_amount / sales.count()
+        if transaction_count > 0:
+            avg_sale_received = total_sales_amount_received / transaction_count
+            avg_sale_expected = total_expected_amount / transaction_count
             
         # Get top selling products
         top_products = sale_items.values('product').annotate(
             total_quantity=Sum('quantity'),
             total_sales=Sum(F('quantity') * F('product__sale_price'))
-        ).order_by('-total_quantity')[:10]
+        ).order_by('-total_quantity')[:limit]
         
+        top_products = list(top_products)
+        products = Product.objects.in_bulk([item['product'] for item in top_products])
         top_products_data = []
         for item in top_products:
-            try:
-                product = Product.objects.get(pk=item['product'])
-                top_products_data.append({
-                    'product_id': str(product.id),
-                    'product_name': product.name,
-                    'total_quantity': float(item['total_quantity']),
-                    'total_sales': float(item.get('total_sales', 0))
-                })
-            except Product.DoesNotExist:
+            product = products.get(item['product'])
+            if product is None:
                 continue
+            top_products_data.append({
+                'product_id': str(product.id),
+                'product_name': product.name,
+                'total_quantity': float(item['total_quantity']),
+                'total_sales': float(item.get('total_sales', 0))
+            })
         
-        # Calculate daily sales breakdown
+        # Calculate daily sales and payment mode breakdowns from a single pass over
+        # per-sale rows. The float running totals are accumulated in sale order so the
+        # figures match what the report has always returned.
         daily_sales = {}
-        for sale in sales:
-            day = sale.created_at.strftime('%Y-%m-%d')
+        payment_mode_breakdown = {}
+        sale_rows = sales_with_expected.values_list(
+            'created_at', 'total_amount', 'expected_amount', 'payment_mode__name'
+        )
+        for created_at, total_amount, expected_amount_with_tax, payment_mode_name in sale_rows:
+            day = created_at.strftime('%Y-%m-%d')
             if day not in daily_sales:
                 daily_sales[day] = {
                     'date': day,
@@ -241,32 +354,22 @@ class GenerateSalesReportView(APIView):
                     'transaction_count': 0
                 }
             
-            # Calculate expected amount for this sale
-            sale_items = SaleItem.objects.filter(sale=sale)
-            actual_amount = Decimal('0')
-            for item in sale_items:
-                actual_amount += item.quantity * item.product.sale_price
-            expected_amount_with_tax = actual_amount + (actual_amount * sale.tax)
-            
-            daily_sales[day]['amount_received'] += float(sale.total_amount)
+            daily_sales[day]['amount_received'] += float(total_amount)
             daily_sales[day]['amount_expected'] += float(expected_amount_with_tax)
             daily_sales[day]['transaction_count'] += 1
-        
-        daily_sales_list = list(daily_sales.values())
-        
-        # Calculate payment mode breakdown
-        payment_mode_breakdown = {}
-        for sale in sales:
-            payment_mode_name = sale.payment_mode.name if sale.payment_mode else "Unspecified"
+            
+            payment_mode_name = payment_mode_name if payment_mode_name is not None else "Unspecified"
             if payment_mode_name not in payment_mode_breakdown:
                 payment_mode_breakdown[payment_mode_name] = {
                     'amount_received': 0,
                     'transaction_count': 0
                 }
             
-            payment_mode_breakdown[payment_mode_name]['amount_received'] += float(sale.total_amount)
+            payment_mode_breakdown[payment_mode_name]['amount_received'] += float(total_amount)
             payment_mode_breakdown[payment_mode_name]['transaction_count'] += 1
         
+        daily_sales_list = list(daily_sales.values())
+        
         payment_mode_list = [{"payment_mode": k, **v} for k, v in payment_mode_breakdown.items()]
         
         # Calculate collection efficiency
@@ -296,7 +399,7 @@ class GenerateSalesReportView(APIView):
             "partially_paid_amount": float(partially_paid_amount),  # Amount received for partial payments
             
             # Transaction Count Breakdown
-            "total_transactions": sales.count(),
+            "total_transactions": transaction_count,
             "fully_paid_transactions": fully_paid_count,
             "partially_paid_transactions": partially_paid_count,
             "unpaid_transactions": unpaid_count,
@@ -316,97 +419,118 @@ class GenerateInventoryReportView(APIView):
     permission_classes = [AllowAny]
     
     @extend_schema(
-        description="Generate an inventory report for a store",
+        description="Generate an inventory report for a store, on its current stock or on the stock held at the end of a past day",
         parameters=[
-            OpenApiParameter(name='store_id', type=str, location=OpenApiParameter.PATH)
+            OpenApiParameter(name='store_id', type=str, location=OpenApiParameter.PATH),
+            OpenApiParameter(name='limit', type=int, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='date', type=str, location=OpenApiParameter.QUERY, description='Past day (YYYY-MM-DD) to report on, from the daily inventory snapshots'),
+            OpenApiParameter(name='start_date', type=str, location=OpenApiParameter.QUERY, description='Start of the inventory value trend (YYYY-MM-DD)'),
+            OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY, description='End of the inventory value trend (YYYY-MM-DD)')
         ]
     )
+    @cache_report('inventory')
     def get(self, request: Request, store_id):
         try:
             store = Store.objects.get(pk=store_id)
         except Store.DoesNotExist:
             return Response({"error": "Store not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        # Get inventory data
-        inventory_items = Inventory.objects.filter(store=store)
-        total_products = inventory_items.count()
+        try:
+            limit = _parse_limit(request)
+        except ValueError:
+            return Response({"error": "limit must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Calculate inventory value
-        inventory_value = Decimal('0')
-        for item in inventory_items:
-            try:
-                # Based on the actual Product model, it uses sale_price field
-                item_value = item.quantity * item.product.sale_price
-                inventory_value += item_value
-            except:
-                pass
+        today = timezone.localdate()
+        report_day = request.query_params.get('date')
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+        include_trend = bool(start_date or end_date)
         
-        # Identify low stock items (less than 10 units as default threshold)
-        low_stock_threshold = 10  # Default threshold
-        low_stock_items = []
-        for item in inventory_items:
-            print('item',item.quantity, low_stock_threshold)
-            if item.quantity <= low_stock_threshold:
-                low_stock_items.append({
-                    'product_id': str(item.product.id),
-                    'product_name': item.product.name,
-                    'current_quantity': float(item.quantity),
-                    'threshold': low_stock_threshold
-                })
-        
-        # Identify out of stock items
-        out_of_stock_items = []
-        for item in inventory_items:
-            if item.quantity <= 0:
-                out_of_stock_items.append({
-                    'product_id': str(item.product.id),
-                    'product_name': item.product.name,
-                    'last_stocked': item.updated_at.strftime('%Y-%m-%d') if item.updated_at else None
-                })
-        
-        # Identify overstocked items (more than 100 units as default)
-        high_stock_threshold = 100  # Default threshold
-        overstocked_items = []
-        for item in inventory_items:
-            if item.quantity > high_stock_threshold:
-                overstocked_items.append({
-                    'product_id': str(item.product.id),
-                    'product_name': item.product.name,
-                    'current_quantity': float(item.quantity),
-                    'threshold': high_stock_threshold
-                })
-        
-        # Calculate inventory turnover rate (if sales data is available)
-        inventory_turnover = Decimal('0')
         try:
-            # Get sales from the past 30 days
-            thirty_days_ago = timezone.now() - timedelta(days=30)
-            
-            # Calculate COGS (cost of goods sold) from sold items
-            sold_items = SaleItem.objects.filter(
-                sale__store_id=store,
-                sale__created_at__gte=thirty_days_ago
-            )
-            
-            cogs = Decimal('0')
-            for item in sold_items:
-                try:
-                    # Based on the actual Product model, it uses purchase_price field for cost
-                    cost = item.product.purchase_price
-                    cogs += cost * item.quantity
-                except:
-                    pass
-            
-            if inventory_value > 0:
-                inventory_turnover = cogs / inventory_value
-            
-        except Exception as e:
-            print(f"Error calculating inventory turnover: {e}")
-            inventory_turnover = Decimal('0')
+            report_day = datetime.strptime(report_day, '%Y-%m-%d').date() if report_day else today
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else report_day
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else end_date - timedelta(days=30)
+        except ValueError:
+            return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
         
+        if report_day > today:
+            return Response({"error": "date cannot be in the future"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if report_day < today:
+            report_data = self.snapshot_report(store, report_day, limit)
+            if report_data is None:
+                return Response({"error": f"No inventory snapshot for {report_day}"}, status=status.HTTP_404_NOT_FOUND)
+        else:
+            report_data = self.live_report(store, limit)
+        
+        if include_trend:
+            # Day-by-day stock value from the snapshots, one grouped query
+            report_data["date_range_start"] = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
+            report_data["date_range_end"] = timezone.make_aware(datetime.combine(end_date, datetime.max.time()))
+            report_data["inventory_trend"] = [
+                {
+                    'date': row['day'].strftime('%Y-%m-%d'),
+                    'total_products': row['products'],
+                    'total_quantity': float(row['quantity'] or 0),
+                    'purchase_value': float(row['purchase_value'] or 0),
+                    'sale_value': float(row['sale_value'] or 0)
+                }
+                for row in inventory_trend([store.pk], start_date, end_date)
+            ]
         
-        # Prepare report data
-        report_data = {
+        return Response(report_data, status=status.HTTP_200_OK)
+    
+    def live_report(self, store, limit):
+        """Report on the store's current inventory rows"""
+        # Every figure comes from the same annotated queryset, so the number of
+        # queries does not depend on how many products the store carries
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        inventory_items = _inventory_with_turnover(store, thirty_days_ago)
+        
+        # Aggregate the expressions themselves: summing the wrapped aliases lets Django
+        # prune the sold_quantity subquery from the aggregate's inner query
+        decimal_field = models.DecimalField(max_digits=38, decimal_places=8)
+        totals = inventory_items.aggregate(
+            total_products=Count('id'),
+            inventory_value=Sum(F('quantity') * F('product__sale_price'), output_field=decimal_field),
+            inventory_purchase_value=Sum(F('quantity') * F('product__purchase_price'), output_field=decimal_field),
+            cogs=Sum(F('sold_quantity') * F('product__purchase_price'), output_field=decimal_field)
+        )
+        total_products = totals['total_products']
+        inventory_value = totals['inventory_value'] or Decimal('0')
+        cogs = totals['cogs'] or Decimal('0')
+        
+        # Inventory turnover: cost of goods sold over the past 30 days / stock value
+        inventory_turnover = Decimal('0')
+        if inventory_value > 0:
+            inventory_turnover = cogs / inventory_value
+        
+        flagged_items = Inventory.objects.filter(store=store).filter(
+            Q(quantity__lte=LOW_STOCK_THRESHOLD) | Q(quantity__gt=HIGH_STOCK_THRESHOLD)
+        ).values('product_id', 'product__name', 'quantity', 'updated_at')
+        low_stock_items, out_of_stock_items, overstocked_items = _stock_level_lists(flagged_items)
+        
+        # Products turning over fastest relative to the stock held
+        top_turnover = inventory_items.filter(stock_value__gt=0, cogs__gt=0).annotate(
+            # Float division: integral decimals would divide as integers on SQLite
+            turnover_rate=ExpressionWrapper(
+                Cast('cogs', models.FloatField()) / F('stock_value'),
+                output_field=models.FloatField()
+            )
+        ).order_by('-turnover_rate').values(
+            'product_id', 'product__name', 'sold_quantity', 'turnover_rate'
+        )[:limit]
+        top_turnover_data = [
+            {
+                'product_id': str(item['product_id']),
+                'product_name': item['product__name'],
+                'sold_quantity': float(item['sold_quantity']),
+                'turnover_rate': float(item['turnover_rate'])
+            }
+            for item in top_turnover
+        ]
+        
+        return {
             "title": f"Inventory Report {timezone.now().strftime('%Y-%m-%d')}",
             "description": f"Current inventory status as of {timezone.now().strftime('%Y-%m-%d')}",
             "store": store.name,
@@ -417,10 +541,75 @@ class GenerateInventoryReportView(APIView):
             "out_of_stock_products": out_of_stock_items,
             "overstocked_products": overstocked_items,
             "inventory_value": float(inventory_value),
-            "inventory_turnover_rate": float(inventory_turnover)
+            "inventory_purchase_value": float(totals['inventory_purchase_value'] or 0),
+            "inventory_turnover_rate": float(inventory_turnover),
+            "top_turnover_products": top_turnover_data
         }
+    
+    def snapshot_report(self, store, day, limit):
+        """
+        Report on the stock held at the end of ``day`` from that day's inventory
+        snapshot and the daily sales rollup, or None if no snapshot was taken.
+        """
+        snapshot = inventory_snapshots([store.pk], day)
+        totals = snapshot.aggregate(
+            total_products=Count('id'),
+            inventory_value=Sum('sale_value'),
+            inventory_purchase_value=Sum('purchase_value')
+        )
+        total_products = totals['total_products']
+        if not total_products:
+            return None
+        inventory_value = totals['inventory_value'] or Decimal('0')
+        
+        # Units sold and their cost over the 30 days up to the report day
+        sales = {
+            row['product_id']: row
+            for row in daily_sales_facts([store.pk], day - timedelta(days=29), day).order_by().values(
+                'product_id'
+            ).annotate(sold_quantity=Sum('quantity'), cogs=Sum('cost'))
+        }
+        cogs = sum((row['cogs'] or Decimal('0') for row in sales.values()), Decimal('0'))
         
-        return Response(report_data, status=status.HTTP_200_OK)
+        inventory_turnover = Decimal('0')
+        if inventory_value > 0:
+            inventory_turnover = cogs / inventory_value
+        
+        flagged_items = snapshot.filter(
+            Q(quantity__lte=LOW_STOCK_THRESHOLD) | Q(quantity__gt=HIGH_STOCK_THRESHOLD)
+        ).values('product_id', 'product__name', 'quantity')
+        low_stock_items, out_of_stock_items, overstocked_items = _stock_level_lists(flagged_items)
+        
+        top_turnover_data = []
+        for item in snapshot.filter(product_id__in=list(sales), sale_value__gt=0).values('product_id', 'product__name', 'sale_value'):
+            sold = sales[item['product_id']]
+            if not sold['cogs'] or sold['cogs'] <= 0:
+                continue
+            top_turnover_data.append({
+                'product_id': str(item['product_id']),
+                'product_name': item['product__name'],
+                'sold_quantity': float(sold['sold_quantity']),
+                'turnover_rate': float(sold['cogs'] / item['sale_value'])
+            })
+        top_turnover_data.sort(key=lambda item: item['turnover_rate'], reverse=True)
+        
+        day_start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        day_end = timezone.make_aware(datetime.combine(day, datetime.max.time()))
+        return {
+            "title": f"Inventory Report {day.strftime('%Y-%m-%d')}",
+            "description": f"Inventory status at the end of {day.strftime('%Y-%m-%d')}",
+            "store": store.name,
+            "date_range_start": day_start,
+            "date_range_end": day_end,
+            "total_products": total_products,
+            "low_stock_products": low_stock_items,
+            "out_of_stock_products": out_of_stock_items,
+            "overstocked_products": overstocked_items,
+            "inventory_value": float(inventory_value),
+            "inventory_purchase_value": float(totals['inventory_purchase_value'] or 0),
+            "inventory_turnover_rate": float(inventory_turnover),
+            "top_turnover_products": top_turnover_data[:limit]
+        }
 
 
 class GenerateFinancialReportView(APIView):
@@ -434,6 +623,7 @@ class GenerateFinancialReportView(APIView):
             OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY)
         ]
     )
+    @cache_report('financial')
     def get(self, request: Request, store_id):
         try:
             store = Store.objects.get(pk=store_id)
@@ -544,9 +734,11 @@ class GenerateCustomerReportView(APIView):
         parameters=[
             OpenApiParameter(name='store_id', type=str, location=OpenApiParameter.PATH),
             OpenApiParameter(name='start_date', type=str, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY)
+            OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='limit', type=int, location=OpenApiParameter.QUERY, description=f"Size of the top-N lists (default {DEFAULT_TOP_N_LIMIT}, max {MAX_TOP_N_LIMIT})")
         ]
     )
+    @cache_report('customer')
     def get(self, request: Request, store_id):
         try:
             store = Store.objects.get(pk=store_id)
@@ -563,6 +755,11 @@ class GenerateCustomerReportView(APIView):
         except ValueError:
             return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
         
+        try:
+            limit = _parse_limit(request)
+        except ValueError:
+            return Response({"error": "limit must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
         # Get sales for the period
         sales = Sale.objects.filter(
             store_id=store_id,
@@ -608,12 +805,14 @@ class GenerateCustomerReportView(APIView):
         top_customers = sales.values('customer').annotate(
             total_spent=Sum('total_amount'), 
             purchase_count=Count('id')
-        ).order_by('-total_spent')[:10]
+        ).order_by('-total_spent')[:limit]
         
+        top_customers = list(top_customers)
+        customers_by_id = Customer.objects.in_bulk([item['customer'] for item in top_customers])
         for item in top_customers:
             top_customers_data.append({
                 'customer_id': str(item['customer']),
-                'customer_name': Customer.objects.get(id=item['customer']).name,
+                'customer_name': customers_by_id[item['customer']].name,
                 'total_spent': float(item['total_spent']),
                 'purchase_count': item['purchase_count'],
             })
@@ -651,9 +850,11 @@ class GenerateProductPerformanceReportView(APIView):
         parameters=[
             OpenApiParameter(name='store_id', type=str, location=OpenApiParameter.PATH),
             OpenApiParameter(name='start_date', type=str, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY)
+            OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='limit', type=int, location=OpenApiParameter.QUERY, description=f"Size of the top-N lists (default {DEFAULT_TOP_N_LIMIT}, max {MAX_TOP_N_LIMIT})")
         ]
     )
+    @cache_report('product')
     def get(self, request: Request, store_id):
         try:
             store = Store.objects.get(pk=store_id)
@@ -670,6 +871,11 @@ class GenerateProductPerformanceReportView(APIView):
         except ValueError:
             return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
         
+        try:
+            limit = _parse_limit(request)
+        except ValueError:
+            return Response({"error": "limit must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
         # Get sales for the period
         sales = Sale.objects.filter(
             store_id=store_id,
@@ -677,91 +883,87 @@ class GenerateProductPerformanceReportView(APIView):
             created_at__lte=end_date
         )
         
-        # Get sale items
-        sale_items = SaleItem.objects.filter(sale__in=sales)
+        # Daily sales rollup rows for the period
+        facts = daily_sales_facts([store_id], start_date, end_date)
         
         # Analyze product performance - top sellers
-        top_products = sale_items.values('product').annotate(
+        top_products = facts.values('product').annotate(
             total_quantity=Sum('quantity'),
             total_revenue=Sum(F('quantity') * F('product__sale_price'))
-        ).order_by('-total_revenue')[:10]
+        ).order_by('-total_revenue')[:limit]
         
+        top_products = list(top_products)
+        products = Product.objects.in_bulk([item['product'] for item in top_products])
         top_products_data = []
         for item in top_products:
-            try:
-                product = Product.objects.get(pk=item['product'])
-                top_products_data.append({
-                    'product_id': str(product.id),
-                    'product_name': product.name,
-                    'total_quantity': float(item['total_quantity']),
-                    'total_revenue': float(item.get('total_revenue', 0)),
-                    'profit_margin': float(item.get('total_revenue', 0)) - (float(item['total_quantity']) * float(product.purchase_price if hasattr(product, 'cost_price') else 0))
-                })
-            except Product.DoesNotExist:
+            product = products.get(item['product'])
+            if product is None:
                 continue
+            top_products_data.append({
+                'product_id': str(product.id),
+                'product_name': product.name,
+                'total_quantity': float(item['total_quantity']),
+                'total_revenue': float(item.get('total_revenue', 0)),
+                'profit_margin': float(item.get('total_revenue', 0)) - (float(item['total_quantity']) * float(product.purchase_price if hasattr(product, 'cost_price') else 0))
+            })
         
         # Worst performing products (lowest revenue)
-        worst_products = sale_items.values('product').annotate(
+        worst_products = facts.values('product').annotate(
             total_quantity=Sum('quantity'),
             total_revenue=Sum(F('quantity') * F('product__sale_price'))
-        ).order_by('total_revenue')[:10]
+        ).order_by('total_revenue')[:limit]
         
+        worst_products = list(worst_products)
+        products = Product.objects.in_bulk([item['product'] for item in worst_products])
         worst_products_data = []
         for item in worst_products:
-            try:
-                product = Product.objects.get(pk=item['product'])
-                worst_products_data.append({
-                    'product_id': str(product.id),
-                    'product_name': product.name,
-                    'total_quantity': float(item['total_quantity']),
-                    'total_revenue': float(item.get('total_revenue', 0))
-                })
-            except Product.DoesNotExist:
+            product = products.get(item['product'])
+            if product is None:
                 continue
+            worst_products_data.append({
+                'product_id': str(product.id),
+                'product_name': product.name,
+                'total_quantity': float(item['total_quantity']),
+                'total_revenue': float(item.get('total_revenue', 0))
+            })
         
         # Analyze by category
-        category_breakdown = {}
-        for item in sale_items:
-            try:
-                category = item.product.product_category.name if hasattr(item.product, 'product_category') else "Uncategorized"
-                if category not in category_breakdown:
-                    category_breakdown[category] = {
-                        'total_quantity': 0,
-                        'total_revenue': 0
-                    }
-                
-                category_breakdown[category]['total_quantity'] += float(item.quantity)
-                category_breakdown[category]['total_revenue'] += float(item.quantity * item.product.sale_price)
-            except:
-                pass
+        category_totals = facts.values('category__name').annotate(
+            total_quantity=Sum('quantity'),
+            total_revenue=Sum(F('quantity') * F('product__sale_price'))
+        ).order_by('category__name')
         
         # Convert to list for JSON storage
-        category_data = [{"category": k, **v} for k, v in category_breakdown.items()]
+        category_data = [
+            {
+                "category": row['category__name'],
+                "total_quantity": float(row['total_quantity']),
+                "total_revenue": float(row['total_revenue'])
+            }
+            for row in category_totals
+        ]
         
         # Analyze seasonal trends (by month)
         seasonal_trends = {}
-        for sale in sales:
-            month = sale.created_at.strftime('%Y-%m')
-            if month not in seasonal_trends:
-                seasonal_trends[month] = {
-                    'month': month,
-                    'total_sales': 0,
-                    'product_breakdown': {}
-                }
-            
-            seasonal_trends[month]['total_sales'] += float(sale.total_amount)
-            
-            # Add product breakdown for this month
-            sale_items_for_sale = SaleItem.objects.filter(sale=sale)
-            for item in sale_items_for_sale:
-                try:
-                    product_name = item.product.name
-                    if product_name not in seasonal_trends[month]['product_breakdown']:
-                        seasonal_trends[month]['product_breakdown'][product_name] = 0
-                    
-                    seasonal_trends[month]['product_breakdown'][product_name] += float(item.quantity)
-                except:
-                    pass
+        monthly_sales = sales.annotate(month=TruncMonth('created_at')).values('month').annotate(
+            total=Sum('total_amount')
+        ).order_by('-month')
+        for row in monthly_sales:
+            month = row['month'].strftime('%Y-%m')
+            seasonal_trends[month] = {
+                'month': month,
+                'total_sales': float(row['total']),
+                'product_breakdown': {}
+            }
+        
+        # Add product breakdown for each month
+        monthly_products = facts.annotate(month=TruncMonth('day')).values('month', 'product__name').annotate(
+            total_quantity=Sum('quantity')
+        ).order_by('-month', 'product__name')
+        for row in monthly_products:
+            month = row['month'].strftime('%Y-%m')
+            if month in seasonal_trends:
+                seasonal_trends[month]['product_breakdown'][row['product__name']] = float(row['total_quantity'])
         
         # Convert to list for JSON storage
         seasonal_data = list(seasonal_trends.values())
@@ -793,6 +995,7 @@ class GenerateProfitReportView(APIView):
             OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY)
         ]
     )
+    @cache_report('profit')
     def get(self, request: Request, store_id):
         try:
             store = Store.objects.get(pk=store_id)
@@ -855,16 +1058,12 @@ class GenerateProfitReportView(APIView):
         )
         operating_expenses = expenses.aggregate(total=Sum('amount'))['total'] or Decimal('0')
         
-        # Calculate Cost of Goods Sold (COGS) from sales items
-        sale_items = SaleItem.objects.filter(sale__in=sales)
-        cost_of_goods_sold = Decimal('0')
-        
-        for item in sale_items:
-            try:
-                # Use product's purchase price as the cost
-                cost_of_goods_sold += item.quantity * item.product.purchase_price
-            except:
-                pass
+        # Calculate Cost of Goods Sold (COGS) from the daily sales rollup
+        facts = daily_sales_facts([store_id], start_date, end_date)
+        # Use product's purchase price as the cost
+        cost_of_goods_sold = facts.aggregate(
+            total=Sum(F('quantity') * F('product__purchase_price'))
+        )['total'] or Decimal('0')
         
         # PROFIT CALCULATIONS
         # Total Revenue = All money coming in
@@ -893,30 +1092,21 @@ class GenerateProfitReportView(APIView):
             net_profit_margin = (net_profit / total_revenue) * 100
         
         # Calculate profit by product category
-        profit_by_category = {}
-        
-        for item in sale_items:
-            try:
-                category_name = item.product.product_category.name
-                if category_name not in profit_by_category:
-                    profit_by_category[category_name] = {
-                        'revenue': 0,
-                        'cost': 0,
-                        'profit': 0
-                    }
-                
-                # Calculate revenue and cost for this item
-                item_revenue = float(item.quantity * item.product.sale_price)
-                item_cost = float(item.quantity * item.product.purchase_price)
-                
-                profit_by_category[category_name]['revenue'] += item_revenue
-                profit_by_category[category_name]['cost'] += item_cost
-                profit_by_category[category_name]['profit'] += (item_revenue - item_cost)
-            except:
-                pass
+        category_totals = facts.values('category__name').annotate(
+            revenue=Sum(F('quantity') * F('product__sale_price')),
+            cost=Sum(F('quantity') * F('product__purchase_price'))
+        ).order_by('category__name')
         
         # Convert to list for JSON storage
-        profit_by_category_list = [{"category": k, **v} for k, v in profit_by_category.items()]
+        profit_by_category_list = [
+            {
+                "category": row['category__name'],
+                "revenue": float(row['revenue']),
+                "cost": float(row['cost']),
+                "profit": float(row['revenue'] - row['cost'])
+            }
+            for row in category_totals
+        ]
         
         # Calculate comprehensive daily profit trend
         profit_trend = {}
@@ -1023,6 +1213,7 @@ class GenerateRevenueReportView(APIView):
             OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY)
         ]
     )
+    @cache_report('revenue')
     def get(self, request: Request, store_id):
         try:
             store = Store.objects.get(pk=store_id)
@@ -1072,23 +1263,13 @@ class GenerateRevenueReportView(APIView):
             
             revenue_by_payment[payment_mode_name] += float(sale.total_amount)
         
-        # Get revenue by product category
-        revenue_by_category = {}
-        
-        sale_items = SaleItem.objects.filter(sale__in=sales)
-        for item in sale_items:
-            try:
-                category_name = item.product.product_category.name
-                if category_name not in revenue_by_category:
-                    revenue_by_category[category_name] = 0
-                
-                item_revenue = float(item.quantity * item.product.sale_price)
-                revenue_by_category[category_name] += item_revenue
-            except:
-                pass
+        # Get revenue by product category from the daily sales rollup
+        category_totals = daily_sales_facts([store_id], start_date, end_date).values('category__name').annotate(
+            amount=Sum(F('quantity') * F('product__sale_price'))
+        ).order_by('category__name')
         
         # Convert to list for JSON storage
-        revenue_by_category_list = [{"category": k, "amount": v} for k, v in revenue_by_category.items()]
+        revenue_by_category_list = [{"category": row['category__name'], "amount": float(row['amount'])} for row in category_totals]
         revenue_by_payment_list = [{"payment_mode": k, "amount": v} for k, v in revenue_by_payment.items()]
         
         # Calculate daily revenue
@@ -1157,9 +1338,11 @@ class GeneratePurchaseReportView(APIView):
         parameters=[
             OpenApiParameter(name='store_id', type=str, location=OpenApiParameter.PATH),
             OpenApiParameter(name='start_date', type=str, location=OpenApiParameter.QUERY),
-            OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY)
+            OpenApiParameter(name='end_date', type=str, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='limit', type=int, location=OpenApiParameter.QUERY, description=f"Size of the top-N lists (default {DEFAULT_TOP_N_LIMIT}, max {MAX_TOP_N_LIMIT})")
         ]
     )
+    @cache_report('purchase')
     def get(self, request: Request, store_id):
         try:
             store = Store.objects.get(pk=store_id)
@@ -1176,6 +1359,11 @@ class GeneratePurchaseReportView(APIView):
         except ValueError:
             return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
         
+        try:
+            limit = _parse_limit(request)
+        except ValueError:
+            return Response({"error": "limit must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
         # Get purchase data
         purchases = Purchase.objects.filter(
             store_id=store_id,
@@ -1241,39 +1429,41 @@ class GeneratePurchaseReportView(APIView):
         top_suppliers = purchases.values('supplier').annotate(
             total_amount=Sum('total_amount'),
             purchase_count=Count('id')
-        ).order_by('-total_amount')[:10]
+        ).order_by('-total_amount')[:limit]
         
+        top_suppliers = list(top_suppliers)
+        suppliers = Supplier.objects.in_bulk([item['supplier'] for item in top_suppliers])
         top_suppliers_data = []
         for item in top_suppliers:
-            try:
-                supplier = Supplier.objects.get(pk=item['supplier'])
-                top_suppliers_data.append({
-                    'supplier_id': str(supplier.id),
-                    'supplier_name': supplier.name,
-                    'total_amount': float(item['total_amount']),
-                    'purchase_count': item['purchase_count']
-                })
-            except:
+            supplier = suppliers.get(item['supplier'])
+            if supplier is None:
                 continue
+            top_suppliers_data.append({
+                'supplier_id': str(supplier.id),
+                'supplier_name': supplier.name,
+                'total_amount': float(item['total_amount']),
+                'purchase_count': item['purchase_count']
+            })
         
         # Get top purchased products
         top_products = purchase_items.values('product').annotate(
             total_quantity=Sum('quantity'),
             total_cost=Sum(F('quantity') * F('product__purchase_price'))
-        ).order_by('-total_quantity')[:10]
+        ).order_by('-total_quantity')[:limit]
         
+        top_products = list(top_products)
+        products = Product.objects.in_bulk([item['product'] for item in top_products])
         top_products_data = []
         for item in top_products:
-            try:
-                product = Product.objects.get(pk=item['product'])
-                top_products_data.append({
-                    'product_id': str(product.id),
-                    'product_name': product.name,
-                    'total_quantity': float(item['total_quantity']),
-                    'total_cost': float(item.get('total_cost', 0))
-                })
-            except Product.DoesNotExist:
+            product = products.get(item['product'])
+            if product is None:
                 continue
+            top_products_data.append({
+                'product_id': str(product.id),
+                'product_name': product.name,
+                'total_quantity': float(item['total_quantity']),
+                'total_cost': float(item.get('total_cost', 0))
+            })
         
         # Calculate daily purchase breakdown
         daily_purchases = {}
@@ -1376,4 +1566,83 @@ class GeneratePurchaseReportView(APIView):
         }
         
         return Response(report_data, status=status.HTTP_200_OK)
-    
\ No newline at end of file
+
+
+class ReportJobListView(APIView):
+    permission_classes = [AllowAny]
+    
+    @extend_schema(
+        description="List recent background report jobs for a store",
+        parameters=[
+            OpenApiParameter(name='store_id', type=str, location=OpenApiParameter.PATH)
+        ],
+        responses={200: ReportJobSerializer(many=True)}
+    )
+    def get(self, request: Request, store_id):
+        jobs = Report.objects.filter(store_id=store_id)[:50]
+        serializer = ReportJobSerializer(jobs, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    
+    @extend_schema(
+        description="Queue a report for background generation. Poll the returned status_url for the result.",
+        parameters=[
+            OpenApiParameter(name='store_id', type=str, location=OpenApiParameter.PATH)
+        ],
+        request=ReportJobCreateSerializer,
+        responses={
+            202: ReportJobSerializer,
+            400: OpenApiResponse(description="Invalid data"),
+            404: OpenApiResponse(description="Store not found")
+        }
+    )
+    def post(self, request: Request, store_id):
+        try:
+            store = Store.objects.get(pk=store_id)
+        except Store.DoesNotExist:
+            return Response({"error": "Store not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        create_serializer = ReportJobCreateSerializer(data=request.data)
+        if not create_serializer.is_valid():
+            return Response(create_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Keep the same query parameters the synchronous report endpoints accept
+        parameters = {
+            name: value.strftime('%Y-%m-%d')
+            for name, value in create_serializer.validated_data.items()
+            if name in ('start_date', 'end_date')
+        }
+        if 'limit' in create_serializer.validated_data:
+            parameters['limit'] = str(create_serializer.validated_data['limit'])
+        
+        try:
+            job = enqueue_report_job(store, create_serializer.validated_data['report_type'], parameters)
+        except ReportJobError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = ReportJobSerializer(job).data
+        data['status_url'] = f"/reports/stores/{store_id}/reports/jobs/{job.id}/"
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+
+class ReportJobDetailView(APIView):
+    permission_classes = [AllowAny]
+    
+    @extend_schema(
+        description="Get the status of a background report job, including its result once completed",
+        parameters=[
+            OpenApiParameter(name='store_id', type=str, location=OpenApiParameter.PATH),
+            OpenApiParameter(name='job_id', type=str, location=OpenApiParameter.PATH)
+        ],
+        responses={
+            200: ReportJobResultSerializer,
+            404: OpenApiResponse(description="Report job not found")
+        }
+    )
+    def get(self, request: Request, store_id, job_id):
+        try:
+            job = Report.objects.get(pk=job_id, store_id=store_id)
+        except Report.DoesNotExist:
+            return Response({"error": "Report job not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = ReportJobResultSerializer(job)
+        return Response(serializer.data, status=status.HTTP_200_OK)
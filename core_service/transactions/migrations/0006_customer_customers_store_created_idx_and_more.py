@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-17 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0005_remove_customer_credit_limit_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['store_id', 'created_at', 'id'], name='customers_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['store_id', 'created_at', 'id'], name='purchases_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['store_id', 'created_at', 'id'], name='sales_store_created_idx'),
+        ),
+    ]
@@ -15,6 +15,9 @@ class Customer(models.Model):
 
     class Meta:
         db_table = 'customers'
+        indexes = [
+            models.Index(fields=['store_id', 'created_at', 'id'], name='customers_store_created_idx'),
+        ]
         unique_together = ['store_id', 'email']
     def __str__(self):
         return f"{self.name} ({self.email})" 
\ No newline at end of file
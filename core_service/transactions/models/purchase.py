@@ -30,6 +30,9 @@ class Purchase(models.Model):
   
   class Meta:
     db_table = 'purchases'
+    indexes = [
+      models.Index(fields=['store_id', 'created_at', 'id'], name='purchases_store_created_idx'),
+    ]
     ordering = ['-created_at']
 
   def update_inventory(self, purchase_items):
@@ -37,21 +40,25 @@ class Purchase(models.Model):
     Update inventory quantities based on purchase items.
     Increases inventory quantities for each product purchased.
     """
-    for item in purchase_items:
-      try:
-        inventory = Inventory.objects.get(
-          product=item.product,
-          store=self.store_id
-        )
-        inventory.quantity += item.quantity
-        inventory.save()
-      except Inventory.DoesNotExist:
-        # If inventory doesn't exist, create a new record
-        Inventory.objects.create(
-          product=item.product,
-          store=self.store_id,
-          quantity=item.quantity
-        )
+    from inventory.ledger import stock_movement_reason
+    from inventory.models.stock_movement import StockMovement
+
+    with stock_movement_reason(StockMovement.Reason.PURCHASE, self.id):
+      for item in purchase_items:
+        try:
+          inventory = Inventory.objects.get(
+            product=item.product,
+            store=self.store_id
+          )
+          inventory.quantity += item.quantity
+          inventory.save()
+        except Inventory.DoesNotExist:
+          # If inventory doesn't exist, create a new record
+          Inventory.objects.create(
+            product=item.product,
+            store=self.store_id,
+            quantity=item.quantity
+          )
 
   def delete(self, *args, **kwargs):
     """
@@ -65,8 +72,10 @@ class Purchase(models.Model):
     from financials.models.payable import Payable
     from financials.models.payment_out import PaymentOut
     from transactions.models.purchase_item import PurchaseItem
+    from inventory.ledger import stock_movement_reason
+    from inventory.models.stock_movement import StockMovement
 
-    with transaction.atomic():
+    with transaction.atomic(), stock_movement_reason(StockMovement.Reason.PURCHASE, self.id):
       # Get all associated records before deletion
       purchase_items = PurchaseItem.objects.filter(purchase=self)
       payables = Payable.objects.filter(purchase=self)
@@ -34,6 +34,9 @@ class Sale(models.Model):
 
   class Meta:
     db_table = 'sales'
+    indexes = [
+      models.Index(fields=['store_id', 'created_at', 'id'], name='sales_store_created_idx'),
+    ]
     ordering = ['-created_at']
 
   def update_inventory(self, sale_items):
@@ -41,33 +44,44 @@ class Sale(models.Model):
     Update inventory quantities based on sale items.
     Decreases inventory quantities for each product sold.
     """
+    from inventory.ledger import stock_movement_reason
+    from inventory.models.stock_movement import StockMovement
+    from inventory.services import InsufficientStockError, MissingInventoryError, decrement_stock
+
+    quantities = {}
+    names = {}
     for item in sale_items:
-      try:
-        inventory = Inventory.objects.get(
-          product=item.product,
-          store=self.store_id
-        )
-        inventory.quantity -= item.quantity
-        if inventory.quantity < 0:
-          raise ValueError(f"Insufficient inventory for product {item.product.name}")
-        inventory.save()
-      except Inventory.DoesNotExist:
-        raise ValueError(f"No inventory record found for product {item.product.name} in store {self.store_id.name}")
+      quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+      names[item.product_id] = item.product.name
+    try:
+      with stock_movement_reason(StockMovement.Reason.SALE, self.id):
+        decrement_stock(self.store_id_id, quantities)
+    except InsufficientStockError as e:
+      raise ValueError(f"Insufficient inventory for product {', '.join(names[product_id] for product_id in e.product_ids)}")
+    except MissingInventoryError:
+      raise ValueError(f"No inventory record found for product {', '.join(names.values())} in store {self.store_id.name}")
 
   def delete(self, *args, **kwargs):
     """
     Override delete method to handle associated records properly.
     This will:
-    1. Return inventory quantities
-    2. Delete associated payment records
-    3. Delete receivables
-    4. Delete sale items
+    1. Remove the sale from the daily sales rollup
+    2. Return inventory quantities
+    3. Delete associated payment records
+    4. Delete receivables
+    5. Delete sale items
     """
     from financials.models.receivable import Receivable
     from financials.models.payment_in import PaymentIn
     from transactions.models.sale_item import SaleItem
+    from reports.rollups import reverse_sale
+    from inventory.ledger import stock_movement_reason
+    from inventory.models.stock_movement import StockMovement
+
+    with transaction.atomic(), stock_movement_reason(StockMovement.Reason.SALE, self.id):
+      # Remove the sale from the daily rollup while its items still exist
+      reverse_sale(self)
 
-    with transaction.atomic():
       # Get all associated records before deletion
       sale_items = SaleItem.objects.filter(sale=self)
       receivables = Receivable.objects.filter(sale=self)
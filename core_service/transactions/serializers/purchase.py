@@ -14,6 +14,8 @@ from transactions.models.payment_mode import PaymentMode
 from transactions.models.purchase_item import PurchaseItem
 from financials.models.payable import Payable
 from inventory.models.inventory import Inventory
+from inventory.ledger import stock_movement_reason
+from inventory.models.stock_movement import StockMovement
 from decimal import Decimal
 
 class PurchaseSerializer(serializers.ModelSerializer):
@@ -175,30 +177,31 @@ class PurchaseSerializer(serializers.ModelSerializer):
                 purchase.payment_mode = payment_mode
             
             # Create PurchaseItem instances and update inventory
-            for item_data in items_data:
-                product = Product.objects.get(id=item_data['product_id'])
-                quantity = int(item_data['quantity'])
-                item_purchase_price = Decimal(str(item_data.get('item_purchase_price'))) if item_data.get('item_purchase_price') is not None else None
+            with stock_movement_reason(StockMovement.Reason.PURCHASE, purchase.id):
+                for item_data in items_data:
+                    product = Product.objects.get(id=item_data['product_id'])
+                    quantity = int(item_data['quantity'])
+                    item_purchase_price = Decimal(str(item_data.get('item_purchase_price'))) if item_data.get('item_purchase_price') is not None else None
                 
-                # Create purchase item
-                PurchaseItem.objects.create(
-                    purchase=purchase,
-                    product=product,
-                    quantity=quantity,
-                    item_purchase_price=item_purchase_price
-                )
-                
-                # Update or create inventory
-                try:
-                    inventory = Inventory.objects.get(product=product, store=store)
-                    inventory.quantity += quantity
-                    inventory.save()
-                except Inventory.DoesNotExist:
-                    Inventory.objects.create(
+                    # Create purchase item
+                    PurchaseItem.objects.create(
+                        purchase=purchase,
                         product=product,
-                        store=store,
-                        quantity=quantity
+                        quantity=quantity,
+                        item_purchase_price=item_purchase_price
                     )
+                
+                    # Update or create inventory
+                    try:
+                        inventory = Inventory.objects.get(product=product, store=store)
+                        inventory.quantity += quantity
+                        inventory.save()
+                    except Inventory.DoesNotExist:
+                        Inventory.objects.create(
+                            product=product,
+                            store=store,
+                            quantity=quantity
+                        )
             
             # Create payable if not fully paid
             if status in [Purchase.PurchaseStatus.UNPAID, Purchase.PurchaseStatus.PARTIALLY_PAID]:
@@ -257,41 +260,42 @@ class PurchaseSerializer(serializers.ModelSerializer):
 
         # Handle items update if provided
         if items_data:
-            # First, reverse inventory quantities from old items
-            old_items = PurchaseItem.objects.filter(purchase=instance)
-            for old_item in old_items:
-                inventory = Inventory.objects.get(product=old_item.product, store_id=instance.store_id)
-                inventory.quantity -= old_item.quantity
-                inventory.save()
+            with stock_movement_reason(StockMovement.Reason.PURCHASE, instance.id):
+                # First, reverse inventory quantities from old items
+                old_items = PurchaseItem.objects.filter(purchase=instance)
+                for old_item in old_items:
+                    inventory = Inventory.objects.get(product=old_item.product, store_id=instance.store_id)
+                    inventory.quantity -= old_item.quantity
+                    inventory.save()
             
-            # Delete old items
-            old_items.delete()
+                # Delete old items
+                old_items.delete()
             
-            # Create new items and update inventory
-            for item_data in items_data:
-                product = Product.objects.get(id=item_data['product_id'])
-                quantity = item_data['quantity']
-                item_purchase_price = Decimal(str(item_data.get('item_purchase_price'))) if item_data.get('item_purchase_price') is not None else None
+                # Create new items and update inventory
+                for item_data in items_data:
+                    product = Product.objects.get(id=item_data['product_id'])
+                    quantity = item_data['quantity']
+                    item_purchase_price = Decimal(str(item_data.get('item_purchase_price'))) if item_data.get('item_purchase_price') is not None else None
                 
-                # Create new purchase item
-                PurchaseItem.objects.create(
-                    purchase=instance,
-                    product=product,
-                    quantity=quantity,
-                    item_purchase_price=item_purchase_price
-                )
-                
-                # Update or create inventory
-                try:
-                    inventory = Inventory.objects.get(product=product, store_id=instance.store_id)
-                    inventory.quantity += quantity
-                    inventory.save()
-                except Inventory.DoesNotExist:
-                    Inventory.objects.create(
+                    # Create new purchase item
+                    PurchaseItem.objects.create(
+                        purchase=instance,
                         product=product,
-                        store_id=instance.store_id,
-                        quantity=quantity
+                        quantity=quantity,
+                        item_purchase_price=item_purchase_price
                     )
+                
+                    # Update or create inventory
+                    try:
+                        inventory = Inventory.objects.get(product=product, store_id=instance.store_id)
+                        inventory.quantity += quantity
+                        inventory.save()
+                    except Inventory.DoesNotExist:
+                        Inventory.objects.create(
+                            product=product,
+                            store_id=instance.store_id,
+                            quantity=quantity
+                        )
 
         # Handle payable update
         try:
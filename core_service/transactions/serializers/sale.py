@@ -13,7 +13,14 @@ from companies.models.currency import Currency
 from transactions.models.payment_mode import PaymentMode
 from transactions.models.sale_item import SaleItem
 from financials.models.receivable import Receivable
+from reports.rollups import record_sale, reverse_sale
+from collections import defaultdict
 from decimal import Decimal
+import uuid
+from django.db import transaction
+from inventory.services import InsufficientStockError, MissingInventoryError, decrement_stock, increment_stock
+from inventory.ledger import stock_movement_reason
+from inventory.models.stock_movement import StockMovement
 
 class SaleSerializer(serializers.ModelSerializer):
     store_id = serializers.UUIDField(write_only=True)
@@ -74,6 +81,7 @@ class SaleSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Items cannot be an empty list.")
         
         
+        items = []
         for item in attrs.get('items', []):
             product_id = item.get('product_id')
             try:
@@ -90,8 +98,17 @@ class SaleSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Quantity must be a positive integer.")
             if not isinstance(product_id, str):
                 raise serializers.ValidationError("Product ID must be a string.")
-            
-            product = Product.objects.filter(id=product_id).first()
+            try:
+                product_id = uuid.UUID(product_id)
+            except ValueError:
+                raise serializers.ValidationError(f"Product with id {product_id} does not exist.")
+            items.append((product_id, quantity, item_sale_price))
+
+        # Fetch every product of the sale in one query
+        products = Product.objects.in_bulk({product_id for product_id, _, _ in items})
+
+        for product_id, quantity, item_sale_price in items:
+            product = products.get(product_id)
             if not product:
                 raise serializers.ValidationError(f"Product with id {product_id} does not exist.")
 
@@ -99,12 +116,12 @@ class SaleSerializer(serializers.ModelSerializer):
             if item_sale_price is not None and item_sale_price < product.sale_price:
                 raise serializers.ValidationError(f"Item sale price ({item_sale_price}) cannot be less than product sale price ({product.sale_price})")
 
-            if product and quantity:
-                # Use item_sale_price if provided, otherwise use product's sale_price
-                print('item_sale_price', item_sale_price)
-                print('product.sale_price', product.sale_price)
-                price_to_use = item_sale_price if item_sale_price is not None else product.sale_price
-                actual_amount += price_to_use * quantity
+            # Use item_sale_price if provided, otherwise use product's sale_price
+            price_to_use = item_sale_price if item_sale_price is not None else product.sale_price
+            actual_amount += price_to_use * quantity
+
+        # Reused by create() so the products are not fetched again
+        self._products = products
         
         # Apply tax to the actual amount
         actual_amount_with_tax = actual_amount + (actual_amount * (tax_rate / Decimal('100.0')))
@@ -134,87 +151,92 @@ class SaleSerializer(serializers.ModelSerializer):
         payment_mode_id = validated_data.pop('payment_mode_id', None)
         total_amount = validated_data.get('total_amount')
         tax_rate = validated_data.get('tax', 0)
-        
-        actual_amount = 0
-        print('items_data', items_data)
-        for item in items_data:
-            product_id = item.get('product_id')
-            quantity = int(item.get('quantity', 0))
-            print('product_id', product_id)
-            print('quantity', quantity)
-            product = Product.objects.filter(id=product_id).first()
 
-            if product and quantity:
-                actual_amount += product.sale_price * quantity
+        products = getattr(self, '_products', None)
+        if products is None:
+            products = Product.objects.in_bulk({uuid.UUID(str(item['product_id'])) for item in items_data})
+
+        items = []
+        actual_amount = 0
+        for item_data in items_data:
+            product = products.get(uuid.UUID(str(item_data['product_id'])))
+            if product is None:
+                raise serializers.ValidationError(f"Product with id {item_data['product_id']} does not exist.")
+            quantity = int(item_data['quantity'])
+            item_sale_price = Decimal(str(item_data.get('item_sale_price'))) if item_data.get('item_sale_price') is not None else None
+            items.append((product, quantity, item_sale_price))
+            actual_amount += product.sale_price * quantity
         
         # Apply tax to the actual amount
         actual_amount_with_tax = actual_amount + (actual_amount * (tax_rate / Decimal('100.0')))
 
         try:
-            # Fetch related objects
-            store = Store.objects.get(id=store_id)
-            customer = Customer.objects.get(id=customer_id)
-            
-            # Determine sale status based on amount received
-            if total_amount <= 0:
-                status = Sale.SaleStatus.UNPAID
-            elif total_amount < actual_amount_with_tax:
-                status = Sale.SaleStatus.PARTIALLY_PAID
-            else:
-                status = Sale.SaleStatus.PAID
-            
-            # Create the Sale instance
-            sale = Sale.objects.create(
-                store_id=store,
-                customer=customer,
-                status=status,
-                **validated_data
-            )
-            
-            # Set optional related fields
-            currency = None
-            if currency_id:
-                currency = Currency.objects.get(id=currency_id)
-                sale.currency = currency
-            if payment_mode_id:
-                payment_mode = PaymentMode.objects.get(id=payment_mode_id)
-                sale.payment_mode = payment_mode
-            
-            # Create SaleItem instances and update inventory
-            for item_data in items_data:
-                product = Product.objects.get(id=item_data['product_id'])
-                quantity = int(item_data['quantity'])
-                item_sale_price = Decimal(str(item_data.get('item_sale_price'))) if item_data.get('item_sale_price') is not None else None
+            with transaction.atomic():
+                # Fetch related objects
+                store = Store.objects.get(id=store_id)
+                customer = Customer.objects.get(id=customer_id)
                 
-                # Create sale item
-                SaleItem.objects.create(
-                    sale=sale,
-                    product=product,
-                    quantity=quantity,
-                    item_sale_price=item_sale_price
-                )
+                # Determine sale status based on amount received
+                if total_amount <= 0:
+                    status = Sale.SaleStatus.UNPAID
+                elif total_amount < actual_amount_with_tax:
+                    status = Sale.SaleStatus.PARTIALLY_PAID
+                else:
+                    status = Sale.SaleStatus.PAID
                 
-                # Update inventory
-                inventory = Inventory.objects.get(product=product, store=store)
-                inventory.quantity -= quantity
-                inventory.save()
-            
-            # Create receivable if not fully paid
-            if status in [Sale.SaleStatus.UNPAID, Sale.SaleStatus.PARTIALLY_PAID]:
-                receivable_amount = actual_amount_with_tax - total_amount
-                Receivable.objects.create(
+                # Set optional related fields
+                currency = None
+                if currency_id:
+                    currency = Currency.objects.get(id=currency_id)
+                    validated_data['currency'] = currency
+                if payment_mode_id:
+                    validated_data['payment_mode'] = PaymentMode.objects.get(id=payment_mode_id)
+
+                # Create the Sale instance
+                sale = Sale.objects.create(
                     store_id=store,
-                    sale=sale,
-                    amount=receivable_amount,
-                    currency=currency or sale.currency
+                    customer=customer,
+                    status=status,
+                    **validated_data
                 )
-            
-            sale.save()
-            return sale
+                
+                # Create all sale items in one statement
+                SaleItem.objects.bulk_create([
+                    SaleItem(
+                        sale=sale,
+                        product=product,
+                        quantity=quantity,
+                        item_sale_price=item_sale_price
+                    )
+                    for product, quantity, item_sale_price in items
+                ])
+                
+                # Reserve the stock for every line with a single conditional update
+                quantities = defaultdict(int)
+                for product, quantity, _ in items:
+                    quantities[product.id] += quantity
+                try:
+                    with stock_movement_reason(StockMovement.Reason.SALE, sale.id):
+                        decrement_stock(store, quantities)
+                except InsufficientStockError as e:
+                    names = ', '.join(products[product_id].name for product_id in e.product_ids)
+                    raise serializers.ValidationError(f"Insufficient inventory for product {names}")
+                
+                # Create receivable if not fully paid
+                if status in [Sale.SaleStatus.UNPAID, Sale.SaleStatus.PARTIALLY_PAID]:
+                    receivable_amount = actual_amount_with_tax - total_amount
+                    Receivable.objects.create(
+                        store_id=store,
+                        sale=sale,
+                        amount=receivable_amount,
+                        currency=currency or sale.currency
+                    )
+                
+                record_sale(sale)
+                return sale
             
         except (Store.DoesNotExist, Customer.DoesNotExist,
-                Currency.DoesNotExist, PaymentMode.DoesNotExist, Product.DoesNotExist,
-                Inventory.DoesNotExist) as e:
+                Currency.DoesNotExist, PaymentMode.DoesNotExist, MissingInventoryError) as e:
             raise serializers.ValidationError(str(e))
 
     def update(self, instance, validated_data):
@@ -224,87 +246,97 @@ class SaleSerializer(serializers.ModelSerializer):
         total_amount = validated_data.get('total_amount', instance.total_amount)
         tax_rate = validated_data.get('tax', instance.tax)
 
-        # Calculate actual amount from items
-        for item in items_data:
-            product_id = item.get('product_id')
-            quantity = int(item.get('quantity', 0))
-            product = Product.objects.filter(id=product_id).first()
+        # Rejected updates roll back as a whole, including the rollup reversal
+        with transaction.atomic():
+            # Take the sale's current figures out of the daily rollup; they are
+            # added back once the update has been applied
+            reverse_sale(instance)
 
-            if product and quantity:
-                actual_amount += product.sale_price * quantity
+            # Calculate actual amount from items
+            for item in items_data:
+                product_id = item.get('product_id')
+                quantity = int(item.get('quantity', 0))
+                product = Product.objects.filter(id=product_id).first()
+
+                if product and quantity:
+                    actual_amount += product.sale_price * quantity
         
-        # Apply tax to the actual amount
-        actual_amount_with_tax = actual_amount + (actual_amount * (tax_rate / Decimal('100.0')))
+            # Apply tax to the actual amount
+            actual_amount_with_tax = actual_amount + (actual_amount * (tax_rate / Decimal('100.0')))
 
-        # Determine sale status based on amount
-        if total_amount <= 0:
-            status = Sale.SaleStatus.UNPAID
-        elif total_amount < actual_amount_with_tax:
-            status = Sale.SaleStatus.PARTIALLY_PAID
-        else:
-            status = Sale.SaleStatus.PAID
+            # Determine sale status based on amount
+            if total_amount <= 0:
+                status = Sale.SaleStatus.UNPAID
+            elif total_amount < actual_amount_with_tax:
+                status = Sale.SaleStatus.PARTIALLY_PAID
+            else:
+                status = Sale.SaleStatus.PAID
 
-        # Update the instance fields
-        instance.status = status
-        for attr, value in validated_data.items():
-            if attr != 'store_id':  # Skip store_id updates
-                setattr(instance, attr, value)
+            # Update the instance fields
+            instance.status = status
+            for attr, value in validated_data.items():
+                if attr != 'store_id':  # Skip store_id updates
+                    setattr(instance, attr, value)
         
-        instance.save()
+            instance.save()
 
-        # Handle items update if provided
-        if items_data:
-            # First, restore inventory quantities from old items
-            old_items = SaleItem.objects.filter(sale=instance)
-            for old_item in old_items:
-                inventory = Inventory.objects.get(product=old_item.product, store=instance.store)
-                inventory.quantity += old_item.quantity
-                inventory.save()
-            
-            # Delete old items
-            old_items.delete()
-            
-            # Create new items and update inventory
-            for item_data in items_data:
-                product = Product.objects.get(id=item_data['product_id'])
-                quantity = int(item_data['quantity'])
-                
-                # Validate inventory
-                inventory = Inventory.objects.get(product=product, store=instance.store)
-                if inventory.quantity < quantity:
-                    raise serializers.ValidationError(f"Insufficient inventory for product {product.name}")
-                
-                # Create new sale item
-                SaleItem.objects.create(
-                    sale=instance,
-                    product=product,
-                    quantity=quantity
-                )
-                
-                # Update inventory
-                inventory.quantity -= quantity
-                inventory.save()
+            # Handle items update if provided
+            if items_data:
+                old_items = SaleItem.objects.filter(sale=instance)
+                restored = defaultdict(int)
+                for old_item in old_items:
+                    restored[old_item.product_id] += old_item.quantity
 
-        # Handle receivable update
-        try:
-            receivable = Receivable.objects.get(sale=instance)
-            if status == Sale.SaleStatus.PAID:
-                # Delete receivable if fully paid
-                receivable.delete()
-            else:
-                # Update receivable amount
-                receivable_amount = actual_amount_with_tax - total_amount
-                receivable.amount = receivable_amount
-                receivable.save()
-        except Receivable.DoesNotExist:
-            # Create new receivable if not fully paid
-            if status in [Sale.SaleStatus.UNPAID, Sale.SaleStatus.PARTIALLY_PAID]:
-                receivable_amount = actual_amount_with_tax - total_amount
-                Receivable.objects.create(
-                    store_id=instance.store,
-                    sale=instance,
-                    amount=receivable_amount,
-                    currency=instance.currency
-                )
+                products = Product.objects.in_bulk({uuid.UUID(str(item_data['product_id'])) for item_data in items_data})
+                new_items = []
+                quantities = defaultdict(int)
+                for item_data in items_data:
+                    product = products.get(uuid.UUID(str(item_data['product_id'])))
+                    if product is None:
+                        raise serializers.ValidationError(f"Product with id {item_data['product_id']} does not exist.")
+                    quantity = int(item_data['quantity'])
+                    new_items.append(SaleItem(sale=instance, product=product, quantity=quantity))
+                    quantities[product.id] += quantity
+
+                try:
+                    with transaction.atomic(), stock_movement_reason(StockMovement.Reason.SALE, instance.id):
+                        # First, restore inventory quantities from old items
+                        if restored:
+                            increment_stock(instance.store_id, restored)
+
+                        # Delete old items
+                        old_items.delete()
+
+                        # Reserve stock for the new items and create them
+                        decrement_stock(instance.store_id, quantities)
+                        SaleItem.objects.bulk_create(new_items)
+                except InsufficientStockError as e:
+                    names = ', '.join(products[product_id].name for product_id in e.product_ids)
+                    raise serializers.ValidationError(f"Insufficient inventory for product {names}")
+                except MissingInventoryError as e:
+                    raise serializers.ValidationError(str(e))
+
+            # Handle receivable update
+            try:
+                receivable = Receivable.objects.get(sale=instance)
+                if status == Sale.SaleStatus.PAID:
+                    # Delete receivable if fully paid
+                    receivable.delete()
+                else:
+                    # Update receivable amount
+                    receivable_amount = actual_amount_with_tax - total_amount
+                    receivable.amount = receivable_amount
+                    receivable.save()
+            except Receivable.DoesNotExist:
+                # Create new receivable if not fully paid
+                if status in [Sale.SaleStatus.UNPAID, Sale.SaleStatus.PARTIALLY_PAID]:
+                    receivable_amount = actual_amount_with_tax - total_amount
+                    Receivable.objects.create(
+                        store_id=instance.store,
+                        sale=instance,
+                        amount=receivable_amount,
+                        currency=instance.currency
+                    )
 
+            record_sale(instance)
         return instance 
@@ -1,3 +1,40 @@
+from decimal import Decimal
+from types import SimpleNamespace
 from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from companies.models.company import Company
+from companies.models.currency import Currency
+from companies.models.store import Store
+from transactions.models.customer import Customer
+from transactions.models.payment_mode import PaymentMode
+from transactions.models.sale import Sale
+from transactions.views.sale import SaleListView
 
-# Create your tests here.
+
+class SaleListQueryCountTests(TestCase):
+    """The sale list must cost a constant number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name='Sale Query Count Co')
+        cls.store = Store.objects.create(company_id=company, name='Sale Query Store', location='Nairobi')
+        currency = Currency.objects.create(name='Kenyan Shilling', code='KES')
+        payment_mode = PaymentMode.objects.create(store_id=cls.store, name='Cash')
+
+        for i in range(30):
+            customer = Customer.objects.create(store_id=cls.store, name=f'Customer {i}', email=f'customer{i}@example.com')
+            Sale.objects.create(
+                store_id=cls.store,
+                customer=customer,
+                total_amount=Decimal('100'),
+                currency=currency,
+                payment_mode=payment_mode
+            )
+
+    def test_sale_list_query_count(self):
+        request = APIRequestFactory().get('/sales/?page_size=30')
+        force_authenticate(request, user=SimpleNamespace(is_authenticated=True))
+        with self.assertNumQueries(1):
+            response = SaleListView.as_view()(request, store_id=self.store.id)
+        self.assertEqual(len(response.data['results']), 30)
+        self.assertEqual(response.data['results'][0]['payment_mode']['name'], 'Cash')
@@ -9,17 +9,18 @@ from transactions.models.customer import Customer
 from transactions.serializers.customer import CustomerSerializer
 from companies.models.store import Store
 from companies.models.company import Company
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 
 class CustomerListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all customers for a specific store",
-        responses={200: CustomerSerializer(many=True)}
+        responses={200: keyset_page_serializer(CustomerSerializer)}
     )
     def get(self, request: Request, store_id):
         customers = Customer.objects.filter(store_id=store_id)
-        serializer = CustomerSerializer(customers, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginated_list_response(request, customers, CustomerSerializer, view=self)
     
     @extend_schema(
         description="Create a new customer for a specific store",
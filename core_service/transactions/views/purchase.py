@@ -6,6 +6,8 @@ from rest_framework.response import Response
 from rest_framework.request import Request
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from inventory.models.inventory import Inventory
+from inventory.models.stock_movement import StockMovement
+from inventory.ledger import stock_movement_reason
 from transactions.models.purchase import Purchase
 from transactions.models.purchase_item import PurchaseItem
 from transactions.serializers.purchase import PurchaseSerializer
@@ -13,16 +15,18 @@ from transactions.serializers.purchase_item import PurchaseItemSerializer
 from rest_framework import serializers
 import os
 import requests
+from inventory.serializers.product import PRODUCT_RELATED_FIELDS
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 
 class PurchaseListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all purchases for a specific store",
-        responses={200: PurchaseSerializer(many=True)}
+        responses={200: keyset_page_serializer(PurchaseSerializer)}
     )
     def get(self, request: Request, store_id):
-        purchases = Purchase.objects.filter(store_id=store_id)
-        serializer = PurchaseSerializer(purchases, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        purchases = Purchase.objects.filter(store_id=store_id).select_related('supplier', 'currency', 'payment_mode')
+        return paginated_list_response(request, purchases, PurchaseSerializer, view=self)
     
     @extend_schema(
         description="Create a new purchase with associated purchase items and update inventory for a specific store",
@@ -118,7 +122,9 @@ class PurchaseItemListView(APIView):
         responses={200: PurchaseItemSerializer(many=True)}
     )
     def get(self, request: Request, purchase_id, store_id=None):
-        items = PurchaseItem.objects.filter(purchase_id=purchase_id)
+        items = PurchaseItem.objects.filter(purchase_id=purchase_id).select_related(
+            *(f'product__{field}' for field in PRODUCT_RELATED_FIELDS)
+        )
         serializer = PurchaseItemSerializer(items, many=True)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
     
@@ -215,7 +221,8 @@ class PurchaseItemDetailView(APIView):
                     store=purchase.store_id
                 )
                 inventory.quantity -= item.quantity
-                inventory.save()
+                with stock_movement_reason(StockMovement.Reason.PURCHASE, purchase.id):
+                    inventory.save()
             except Inventory.DoesNotExist:
                 return Response(
                     {'error': f'No inventory record found for product {item.product.name} in store {purchase.store_id.name}'},
@@ -9,18 +9,24 @@ from transactions.models.sale import Sale
 from transactions.models.sale_item import SaleItem
 from transactions.serializers.sale import SaleSerializer
 from transactions.serializers.sale_item import SaleItemSerializer
+from inventory.serializers.product import PRODUCT_RELATED_FIELDS
 from inventory.models.inventory import Inventory
+from inventory.models.stock_movement import StockMovement
+from inventory.ledger import stock_movement_reason
+from reports.rollups import record_sale, reverse_sale
+from django.db import transaction
 import os
 import requests
+from core_service.pagination import KEYSET_PAGINATION_PARAMETERS, keyset_page_serializer, paginated_list_response
 class SaleListView(APIView):
     @extend_schema(
+        parameters=KEYSET_PAGINATION_PARAMETERS,
         description="Get a list of all sales",
-        responses={200: SaleSerializer(many=True)}
+        responses={200: keyset_page_serializer(SaleSerializer)}
     )
     def get(self, request: Request, store_id):
-        sales = Sale.objects.filter(store_id=store_id)
-        serializer = SaleSerializer(sales, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        sales = Sale.objects.filter(store_id=store_id).select_related('customer', 'currency', 'payment_mode')
+        return paginated_list_response(request, sales, SaleSerializer, view=self)
     
     @extend_schema(
         description="Create a new sale with associated sale items and update inventory",
@@ -98,7 +104,9 @@ class SaleItemListView(APIView):
         responses={200: SaleItemSerializer(many=True)}
     )
     def get(self, request: Request, sale_id):
-        items = SaleItem.objects.filter(sale_id=sale_id)
+        items = SaleItem.objects.filter(sale_id=sale_id).select_related(
+            *(f'product__{field}' for field in PRODUCT_RELATED_FIELDS)
+        )
         serializer = SaleItemSerializer(items, many=True)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
     
@@ -117,12 +125,15 @@ class SaleItemListView(APIView):
             request.data['sale'] = sale_id
             serializer = SaleItemSerializer(data=request.data)
             if serializer.is_valid():
-                sale_item = serializer.save()
                 try:
-                    sale.update_inventory([sale_item])
+                    # Re-roll the sale around the change so the daily rollup stays in step
+                    with transaction.atomic():
+                        reverse_sale(sale)
+                        sale_item = serializer.save()
+                        sale.update_inventory([sale_item])
+                        record_sale(sale)
                     return Response(data=serializer.data, status=status.HTTP_201_CREATED)
                 except ValueError as e:
-                    sale_item.delete()
                     return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
             return Response(data=serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Sale.DoesNotExist:
@@ -169,26 +180,28 @@ class SaleItemDetailView(APIView):
             serializer = SaleItemSerializer(item, data=request.data)
             if serializer.is_valid():
                 try:
-                    inventory = Inventory.objects.get(
-                        product=item.product,
-                        store=sale.store
-                    )
-                    inventory.quantity += old_quantity
-                    inventory.save()
+                    # Re-roll the sale around the change; a failed stock check
+                    # rolls back the inventory, the item and the rollup together
+                    with transaction.atomic():
+                        reverse_sale(sale)
+                        inventory = Inventory.objects.select_for_update().get(
+                            product=item.product,
+                            store=sale.store_id
+                        )
+                        inventory.quantity += old_quantity
+                        with stock_movement_reason(StockMovement.Reason.SALE, sale.id):
+                            inventory.save()
+
+                        updated_item = serializer.save()
+                        sale.update_inventory([updated_item])
+                        record_sale(sale)
+                    return Response(data=serializer.data, status=status.HTTP_200_OK)
                 except Inventory.DoesNotExist:
                     return Response(
-                        {'error': f'No inventory record found for product {item.product.name} in store {sale.store.name}'},
+                        {'error': f'No inventory record found for product {item.product.name} in store {sale.store_id.name}'},
                         status=status.HTTP_400_BAD_REQUEST
                     )
-                
-                updated_item = serializer.save()
-                
-                try:
-                    sale.update_inventory([updated_item])
-                    return Response(data=serializer.data, status=status.HTTP_200_OK)
                 except ValueError as e:
-                    inventory.quantity -= updated_item.quantity
-                    inventory.save()
                     return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Sale.DoesNotExist:
@@ -208,19 +221,24 @@ class SaleItemDetailView(APIView):
             item = self.get_item(sale_id, item_id)
             
             try:
-                inventory = Inventory.objects.get(
-                    product=item.product,
-                    store=sale.store
-                )
-                inventory.quantity += item.quantity
-                inventory.save()
+                with transaction.atomic():
+                    # Reverse while the item still exists, record what is left after
+                    reverse_sale(sale)
+                    inventory = Inventory.objects.select_for_update().get(
+                        product=item.product,
+                        store=sale.store_id
+                    )
+                    inventory.quantity += item.quantity
+                    with stock_movement_reason(StockMovement.Reason.SALE, sale.id):
+                        inventory.save()
+
+                    item.delete()
+                    record_sale(sale)
             except Inventory.DoesNotExist:
                 return Response(
-                    {'error': f'No inventory record found for product {item.product.name} in store {sale.store.name}'},
+                    {'error': f'No inventory record found for product {item.product.name} in store {sale.store_id.name}'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            item.delete()
 
             requests.post(os.getenv('USER_SERVICE_URL') + '/activity-logs/', json={
             "user": request.user.id,
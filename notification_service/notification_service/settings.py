@@ -69,19 +69,37 @@ DATABASES = {
 # Email settings
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_USE_LOCALTIME = True 
-EMAIL_HOST = 'smtp.gmail.com'
-EMAIL_PORT = 465
-EMAIL_USE_SSL = True  
+EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
+EMAIL_PORT = config('EMAIL_PORT', default=465, cast=int)
+EMAIL_USE_SSL = config('EMAIL_USE_SSL', default=True, cast=bool)
 EMAIL_USE_TLS = False  
 EMAIL_HOST_USER = 'mahfouz.teyib@a2sv.org'
 EMAIL_HOST_PASSWORD = 'geed wkhc aevs ajwr'
 EMAIL_TIMEOUT = 60
+# SMTP connections used in parallel to send one alert to its recipients
+EMAIL_DISPATCH_CONNECTIONS = config('EMAIL_DISPATCH_CONNECTIONS', default=2, cast=int)
 
 # Service URLs
 USER_SERVICE_URL = config('USER_SERVICE_URL', default='http://localhost:8000')
+# How long low stock recipients fetched from the user service are reused
+RECIPIENT_CACHE_TIMEOUT = config('RECIPIENT_CACHE_TIMEOUT', default=60, cast=int)
 
 # RabbitMQ
 CLOUDAMQP_URL = config('CLOUDAMQP_URL', default='')
+# Unacknowledged messages per consumer process and threads handling them
+NOTIFICATION_CONSUMER_PREFETCH = config('NOTIFICATION_CONSUMER_PREFETCH', default=16, cast=int)
+NOTIFICATION_CONSUMER_THREADS = config('NOTIFICATION_CONSUMER_THREADS', default=8, cast=int)
+# Seconds before each retry of a failed message; after the last one it is dead-lettered
+NOTIFICATION_RETRY_DELAYS = [
+    int(delay) for delay in config('NOTIFICATION_RETRY_DELAYS', default='10,60,300').split(',')
+]
+# Low stock alerts per store are combined into one digest email sent this many
+# seconds after the first alert (0 sends every alert on its own)
+NOTIFICATION_DIGEST_WINDOW = config('NOTIFICATION_DIGEST_WINDOW', default=60, cast=int)
+NOTIFICATION_DIGEST_POLL_INTERVAL = config('NOTIFICATION_DIGEST_POLL_INTERVAL', default=5, cast=int)
+
+# How long each process trusts its compiled notification templates
+NOTIFICATION_TEMPLATE_CACHE_TIMEOUT = config('NOTIFICATION_TEMPLATE_CACHE_TIMEOUT', default=300, cast=int)
 
 # Logging
 LOGGING = {
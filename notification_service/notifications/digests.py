@@ -0,0 +1,170 @@
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from .models import PendingLowStockAlert
+
+logger = logging.getLogger(__name__)
+
+# A large sale or transfer can push many products below threshold at once. Instead
+# of one email per product, alerts are buffered per (company, store) and sent as a
+# single digest once the oldest of them has waited NOTIFICATION_DIGEST_WINDOW
+# seconds. The buffer is a table, so alerts survive restarts and several consumer
+# processes share one digest per store.
+
+
+class DigestDeliveryError(Exception):
+    """A digest had recipients but none of its emails could be sent"""
+
+
+def buffer_alert(message):
+    """Queue a validated low stock message for its store's next digest"""
+    return PendingLowStockAlert.objects.create(
+        company_id=str(message['company_id']),
+        store_id=str(message['store_id']),
+        inventory_id=message.get('inventory_id'),
+        product_name=message['product_name'],
+        store_name=message['store_name'],
+        current_quantity=message['current_quantity'],
+        threshold=message['threshold'],
+        payload=message
+    )
+
+
+def _latest_per_product(alerts):
+    """Alerts ordered oldest first, keeping only the newest one per inventory row"""
+    latest = {}
+    for alert in alerts:
+        latest[alert.inventory_id or alert.product_name] = alert
+    return sorted(latest.values(), key=lambda alert: alert.product_name)
+
+
+def send_digest(notification_service, alerts):
+    """
+    Email one store's buffered alerts to its recipients; returns the number of emails
+    sent. Raises if the recipients cannot be looked up or no email could be sent.
+    """
+    first = alerts[0]
+    alerts = _latest_per_product(alerts)
+    users = notification_service.get_users_for_notification(first.company_id, first.store_id)
+    recipients = [
+        (user['email'], {
+            'inventory_ids': [alert.inventory_id for alert in alerts],
+            'store_id': first.store_id,
+            'company_id': first.company_id,
+            'user_id': user.get('id'),
+            'user_role': user.get('role'),
+            'digest': True
+        })
+        for user in users if user.get('email')
+    ]
+    if not recipients:
+        logger.warning(f"No users found for company {first.company_id}, store {first.store_id}")
+        return 0
+
+    if len(alerts) == 1:
+        # A lone alert keeps the regular single-product email
+        alert = alerts[0]
+        sent = notification_service.send_low_stock_emails(
+            recipients,
+            product_name=alert.product_name,
+            store_name=alert.store_name,
+            current_quantity=alert.current_quantity,
+            threshold=alert.threshold
+        )
+    else:
+        sent = notification_service.send_templated_emails('low_stock_digest', recipients, {
+            'store_name': first.store_name,
+            'alert_count': len(alerts),
+            'alerts': [
+                {
+                    'product_name': alert.product_name,
+                    'current_quantity': alert.current_quantity,
+                    'threshold': alert.threshold
+                }
+                for alert in alerts
+            ]
+        })
+    if sent == 0:
+        raise DigestDeliveryError(f"No digest emails sent to {len(recipients)} recipient(s) of store {first.store_id}")
+    return sent
+
+
+def _claim_group(company_id, store_id):
+    """
+    Delete and return a store's pending alerts, oldest first. Rows locked by another
+    process are skipped, so each alert is claimed by exactly one flusher.
+    """
+    with transaction.atomic():
+        alerts = list(
+            PendingLowStockAlert.objects.select_for_update(skip_locked=True).filter(
+                company_id=company_id,
+                store_id=store_id
+            ).order_by('created_at')
+        )
+        if alerts:
+            PendingLowStockAlert.objects.filter(pk__in=[alert.pk for alert in alerts]).delete()
+    return alerts
+
+
+def flush_due_digests(notification_service, window=None):
+    """
+    Send a digest for every store whose oldest pending alert has waited at least
+    `window` seconds. Alerts are claimed in a short transaction and emailed after it
+    commits, so no row locks are held during the user lookup and SMTP sends. A store
+    whose digest fails gets its alerts back in the buffer (due again one window
+    later) and does not hold up the other stores. Returns the number of digests sent.
+    """
+    window = settings.NOTIFICATION_DIGEST_WINDOW if window is None else window
+    cutoff = timezone.now() - timedelta(seconds=window)
+    groups = PendingLowStockAlert.objects.filter(created_at__lte=cutoff).values_list(
+        'company_id', 'store_id'
+    ).distinct()
+
+    digests = 0
+    for company_id, store_id in list(groups):
+        try:
+            alerts = _claim_group(company_id, store_id)
+        except Exception as e:
+            logger.error(f"Error claiming low stock alerts for store {store_id}: {e}")
+            continue
+        if not alerts:
+            continue
+
+        try:
+            send_digest(notification_service, alerts)
+        except Exception as e:
+            logger.error(f"Error sending low stock digest for store {store_id}, re-buffering {len(alerts)} alert(s): {e}")
+            try:
+                PendingLowStockAlert.objects.bulk_create(alerts)
+            except Exception as e:
+                logger.error(f"Lost {len(alerts)} low stock alert(s) for store {store_id}: {e}")
+            continue
+        digests += 1
+    return digests
+
+
+class DigestFlusher(threading.Thread):
+    """Background thread that sends due digests every NOTIFICATION_DIGEST_POLL_INTERVAL seconds"""
+
+    def __init__(self, notification_service):
+        super().__init__(name='digest-flusher', daemon=True)
+        self.notification_service = notification_service
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(settings.NOTIFICATION_DIGEST_POLL_INTERVAL):
+            close_old_connections()
+            try:
+                digests = flush_due_digests(self.notification_service)
+                if digests:
+                    logger.info(f"Sent {digests} low stock digest(s)")
+            except Exception as e:
+                logger.error(f"Error sending low stock digests: {e}")
+        close_old_connections()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
@@ -0,0 +1,61 @@
+import time
+from functools import partial
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+from notifications.services import deliver_emails
+from notifications.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = 'Measures alert email throughput against a local SMTP sink (no real mail is sent, no logs are written).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=200)
+        parser.add_argument('--connections', type=int, default=settings.EMAIL_DISPATCH_CONNECTIONS)
+        parser.add_argument('--delay', type=float, default=0.005, help='Simulated per-message server latency in seconds')
+        parser.add_argument('--legacy', action='store_true', help='Also time one new connection per email, as send_mail does')
+
+    def handle(self, *args, **options):
+        sink = SMTPSink(delay=options['delay']).start()
+        connection_factory = partial(
+            get_connection,
+            'django.core.mail.backends.smtp.EmailBackend',
+            host='127.0.0.1',
+            port=sink.port,
+            username='',
+            password='',
+            use_tls=False,
+            use_ssl=False,
+            timeout=10
+        )
+        try:
+            messages = [self.build_message(i) for i in range(options['recipients'])]
+
+            if options['legacy']:
+                started = time.perf_counter()
+                for message in messages:
+                    deliver_emails([message], 1, connection_factory)
+                self.report('One connection per email', len(messages), time.perf_counter() - started)
+
+            started = time.perf_counter()
+            errors = deliver_emails(messages, options['connections'], connection_factory)
+            failed = len(errors) - errors.count(None)
+            self.report(f"Batch over {options['connections']} connection(s)", len(messages) - failed, time.perf_counter() - started)
+            if failed:
+                self.stdout.write(self.style.ERROR(f'{failed} message(s) failed: {next(e for e in errors if e)}'))
+        finally:
+            sink.stop()
+
+    def build_message(self, i):
+        message = EmailMultiAlternatives(
+            subject='Low Stock Alert: Benchmark product',
+            body='Current quantity: 1',
+            from_email='alerts@example.com',
+            to=[f'user{i}@example.com']
+        )
+        message.attach_alternative('<p>Current quantity: 1</p>', 'text/html')
+        return message
+
+    def report(self, label, sent, elapsed):
+        self.stdout.write(self.style.SUCCESS(f'{label}: {sent} email(s) in {elapsed:.2f}s ({sent / elapsed:.0f}/s)'))
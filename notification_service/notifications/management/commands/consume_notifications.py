@@ -1,15 +1,38 @@
+import multiprocessing
 from django.core.management.base import BaseCommand
+from django.db import connections
 from notifications.services import RabbitMQConsumer
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def run_consumer(prefetch, threads):
+    consumer = RabbitMQConsumer(prefetch=prefetch, threads=threads)
+    try:
+        consumer.start_consuming()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        consumer.close()
+
+
 class Command(BaseCommand):
     help = 'Start consuming notification messages from CloudAMQP'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help='Consumer processes, each with its own connection')
+        parser.add_argument('--threads', type=int, default=None, help='Worker threads per process (NOTIFICATION_CONSUMER_THREADS)')
+        parser.add_argument('--prefetch', type=int, default=None, help='Unacknowledged messages per process (NOTIFICATION_CONSUMER_PREFETCH)')
+
     def handle(self, *args, **options):
-        consumer = RabbitMQConsumer()
-        
+        workers = max(1, options['workers'])
+        if workers > 1:
+            self.run_workers(workers, options['prefetch'], options['threads'])
+            return
+
+        consumer = RabbitMQConsumer(prefetch=options['prefetch'], threads=options['threads'])
+
         try:
             self.stdout.write(
                 self.style.SUCCESS('🚀 Starting notification consumer...')
@@ -28,4 +51,28 @@ class Command(BaseCommand):
             consumer.close()
             self.stdout.write(
                 self.style.SUCCESS('✅ Consumer stopped')
-            )
\ No newline at end of file
+            )
+
+    def run_workers(self, workers, prefetch, threads):
+        # Children must not share the parent's database sockets
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=run_consumer, args=(prefetch, threads), name=f'notification-consumer-{i}')
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(self.style.SUCCESS(f'🚀 Started {workers} notification consumer processes'))
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            # Ctrl+C reaches the whole process group; give the consumers time to drain
+            self.stdout.write(self.style.WARNING('⏹️  Stopping consumers...'))
+            for process in processes:
+                process.join(timeout=30)
+                if process.is_alive():
+                    process.terminate()
+        self.stdout.write(self.style.SUCCESS('✅ Consumers stopped'))
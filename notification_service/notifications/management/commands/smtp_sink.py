@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from notifications.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = 'Run a local SMTP server that accepts and discards mail (point EMAIL_HOST/EMAIL_PORT at it, with SSL off)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=1025)
+        parser.add_argument('--delay', type=float, default=0.0, help='Seconds to wait per message, to simulate a remote server')
+
+    def handle(self, *args, **options):
+        sink = SMTPSink(options['host'], options['port'], options['delay'])
+        self.stdout.write(self.style.SUCCESS(f"SMTP sink listening on {options['host']}:{sink.port}"))
+        try:
+            sink.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sink.server_close()
+            self.stdout.write(f'Received {sink.messages} message(s) over {sink.connections} connection(s)')
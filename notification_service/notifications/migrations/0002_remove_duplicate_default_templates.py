@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-17 11:20
+
+from django.db import migrations
+
+
+def remove_duplicate_default_templates(apps, schema_editor):
+    # Every email used to insert its own copy of the default template; keep the newest
+    NotificationTemplate = apps.get_model('notifications', 'NotificationTemplate')
+    defaults = NotificationTemplate.objects.filter(name='Default Low Stock Alert', type='low_stock')
+    newest = defaults.order_by('-created_at').values_list('id', flat=True).first()
+    if newest is not None:
+        defaults.exclude(id=newest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_default_templates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:40
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_remove_duplicate_default_templates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingLowStockAlert',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('company_id', models.CharField(max_length=64)),
+                ('store_id', models.CharField(max_length=64)),
+                ('inventory_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('product_name', models.CharField(max_length=255)),
+                ('store_name', models.CharField(max_length=255)),
+                ('current_quantity', models.IntegerField()),
+                ('threshold', models.IntegerField()),
+                ('payload', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'pending_low_stock_alerts',
+                'indexes': [models.Index(fields=['company_id', 'store_id', 'created_at'], name='pending_alerts_group_idx')],
+            },
+        ),
+        migrations.AlterField(
+            model_name='notificationtemplate',
+            name='type',
+            field=models.CharField(choices=[('low_stock', 'Low Stock Alert'), ('low_stock_digest', 'Low Stock Digest'), ('out_of_stock', 'Out of Stock Alert')], max_length=20),
+        ),
+    ]
@@ -4,6 +4,7 @@ import uuid
 class NotificationTemplate(models.Model):
     TYPE_CHOICES = [
         ('low_stock', 'Low Stock Alert'),
+        ('low_stock_digest', 'Low Stock Digest'),
         ('out_of_stock', 'Out of Stock Alert'),
     ]
     
@@ -45,4 +46,26 @@ class NotificationLog(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.recipient_email} - {self.subject} ({self.status})"
\ No newline at end of file
+        return f"{self.recipient_email} - {self.subject} ({self.status})"
+
+class PendingLowStockAlert(models.Model):
+    """Low stock alert waiting to be sent in its (company, store) digest"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    company_id = models.CharField(max_length=64)
+    store_id = models.CharField(max_length=64)
+    inventory_id = models.CharField(max_length=64, null=True, blank=True)
+    product_name = models.CharField(max_length=255)
+    store_name = models.CharField(max_length=255)
+    current_quantity = models.IntegerField()
+    threshold = models.IntegerField()
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'pending_low_stock_alerts'
+        indexes = [
+            models.Index(fields=['company_id', 'store_id', 'created_at'], name='pending_alerts_group_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_name} @ {self.store_name} ({self.current_quantity}/{self.threshold})"
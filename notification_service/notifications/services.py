@@ -4,462 +4,244 @@ import pika
 import ssl
 import json
 import logging
+import smtplib
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from urllib.parse import urlparse
-from django.core.mail import send_mail
-from django.template import Template, Context
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template import Context
 from django.conf import settings
+from django.db import close_old_connections
 from django.utils import timezone
-from .models import NotificationTemplate, NotificationLog
+from .digests import DigestFlusher, buffer_alert
+from .models import NotificationLog
+from .template_registry import get_template
 
 logger = logging.getLogger(__name__)
 
+# (company_id, store_id) -> (fetched_at, recipients), shared by every consumer thread
+_recipients = {}
+_recipients_lock = threading.Lock()
+
+class TransientNotificationError(Exception):
+    """A notification could not be sent now but may succeed later; the message is retried"""
+
+
+class RecipientLookupError(TransientNotificationError):
+    """The user service could not be asked who to notify"""
+
+
 class NotificationService:
     
     def __init__(self):
         self.user_service_url = os.getenv('USER_SERVICE_URL', 'http://localhost:8001')
     
     def get_users_for_notification(self, company_id, store_id):
-        """Get users who should receive low stock notifications"""
+        """
+        Get users who should receive low stock notifications: the company's admins and
+        super admins, plus stock managers assigned to the store. The user service does
+        the filtering; results are cached per (company, store) for
+        RECIPIENT_CACHE_TIMEOUT seconds. Raises RecipientLookupError if the user service
+        cannot be reached or fails, so an outage is not mistaken for "nobody to notify".
+        """
+        key = (str(company_id), str(store_id))
+        cached = _recipients.get(key)
+        if cached is not None and time.monotonic() - cached[0] < settings.RECIPIENT_CACHE_TIMEOUT:
+            return cached[1]
+
         try:
-            # Call user management service to get ALL users
             response = requests.get(
-                f"{self.user_service_url}/users/",
+                f"{self.user_service_url}/users/recipients/",
+                params={
+                    'company_id': company_id,
+                    'roles': 'admin,super_admin',
+                    'store': store_id,
+                    'store_roles': 'stock_manager'
+                },
                 timeout=10
             )
-            print(self.user_service_url, company_id, store_id)
-            
+
             if response.status_code == 200:
-                all_users = response.json()
-                # Filter users client-side based on company_id and role
-                relevant_users = []
-                for user in all_users:
-                    user_company_id = str(user.get('company_id', ''))
-                    user_role = user.get('role', '').lower()
-                    user_store = user.get('assigned_store')
-                    
-                    # Check if user belongs to the same company
-                    if user_company_id == str(company_id):
-                        # Include admins and super_admins from any store in the company
-                        if user_role in ['admin', 'super_admin']:
-                            relevant_users.append(user)
-                        # Include stock_manager only if assigned to this specific store
-                        elif user_role == 'stock_manager' and str(user_store) == str(store_id):
-                            relevant_users.append(user)
-                
+                relevant_users = response.json()
+                # Failures are not cached, so the next message retries the lookup
+                with _recipients_lock:
+                    _recipients[key] = (time.monotonic(), relevant_users)
                 logger.info(f"Found {len(relevant_users)} relevant users for company {company_id}, store {store_id}")
                 return relevant_users
             else:
                 logger.error(f"Failed to fetch users: {response.status_code} - {response.text}")
-                return []
+                raise RecipientLookupError(f"User service returned {response.status_code}")
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error fetching users: {e}")
-            return []
-        except Exception as e:
+            raise RecipientLookupError(f"Network error fetching users: {e}") from e
+        except ValueError as e:
             logger.error(f"Error fetching users: {e}")
-            return []
+            raise RecipientLookupError(f"Invalid recipients response: {e}") from e
     
     def send_low_stock_email(self, recipient_email, product_name, store_name, 
                            current_quantity, threshold, metadata=None):
         """Send low stock email notification"""
+        return self.send_low_stock_emails(
+            [(recipient_email, metadata)], product_name, store_name, current_quantity, threshold
+        ) == 1
+
+    def send_low_stock_emails(self, recipients, product_name, store_name,
+                              current_quantity, threshold):
+        """Send one low stock alert to many recipients, given as (email, metadata) pairs"""
+        return self.send_templated_emails('low_stock', recipients, {
+            'product_name': product_name,
+            'store_name': store_name,
+            'current_quantity': current_quantity,
+            'threshold': threshold
+        })
+
+    def send_templated_emails(self, template_type, recipients, base_context):
+        """
+        Send one email to many recipients, given as (email, metadata) pairs.
+        The email is rendered once unless the template uses recipient_email, sent over
+        at most EMAIL_DISPATCH_CONNECTIONS reused SMTP connections, and logged with one
+        bulk insert and one bulk update. Returns the number of emails sent.
+        """
+        if not recipients:
+            return 0
         try:
-            # Get or create email template
-            
-            
-            template = self.create_default_low_stock_template()
-            
-            # Prepare template context
-            context = Context({
-                'product_name': product_name,
-                'store_name': store_name,
-                'current_quantity': current_quantity,
-                'threshold': threshold,
-                'recipient_email': recipient_email
-            })
-            
-            # Render templates
-            subject_template = Template(template.subject)
-            html_template = Template(template.html_body)
-            text_template = Template(template.text_body)
-            
-            subject = subject_template.render(context)
-            html_body = html_template.render(context)
-            text_body = text_template.render(context)
-            
-            # Create notification log
-            notification_log = NotificationLog.objects.create(
-                recipient_email=recipient_email,
-                subject=subject,
-                message_body=html_body,
-                metadata=metadata or {}
-            )
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=text_body,
-                from_email=settings.EMAIL_HOST_USER,
-                recipient_list=[recipient_email],
-                html_message=html_body,
-                fail_silently=False
-            )
-            
-            # Update log as sent
-            notification_log.status = 'sent'
-            notification_log.sent_at = timezone.now()
-            notification_log.save()
-            
-            logger.info(f"Low stock email sent to {recipient_email}")
-            return True
-            
+            # Compiled once per process; no template rows are written here
+            template = get_template(template_type)
+            shared = None if template.per_recipient else template.render(Context(base_context))
+
+            messages = []
+            notification_logs = []
+            for recipient_email, metadata in recipients:
+                subject, html_body, text_body = shared or template.render(
+                    Context({**base_context, 'recipient_email': recipient_email})
+                )
+                message = EmailMultiAlternatives(
+                    subject=subject,
+                    body=text_body,
+                    from_email=settings.EMAIL_HOST_USER,
+                    to=[recipient_email]
+                )
+                message.attach_alternative(html_body, 'text/html')
+                messages.append(message)
+                notification_logs.append(NotificationLog(
+                    recipient_email=recipient_email,
+                    subject=subject,
+                    message_body=html_body,
+                    metadata=metadata or {}
+                ))
+            NotificationLog.objects.bulk_create(notification_logs)
         except Exception as e:
-            logger.error(f"Failed to send email to {recipient_email}: {e}")
-            
-            # Update log with error
-            if 'notification_log' in locals():
+            logger.error(f"Failed to prepare {template_type} emails: {e}")
+            return 0
+
+        errors = deliver_emails(messages, settings.EMAIL_DISPATCH_CONNECTIONS)
+
+        now = timezone.now()
+        for notification_log, error in zip(notification_logs, errors):
+            if error is None:
+                notification_log.status = 'sent'
+                notification_log.sent_at = now
+            else:
+                logger.error(f"Failed to send email to {notification_log.recipient_email}: {error}")
                 notification_log.status = 'failed'
-                notification_log.error_message = str(e)
-                notification_log.save()
-            
-            return False
-    
-    def create_default_low_stock_template(self):
-        """Create default low stock email template"""
-        template = NotificationTemplate.objects.create(
-            name="Default Low Stock Alert",
-            type="low_stock",
-            subject="🚨 Low Stock Alert: {{ product_name }} - {{ store_name }}",
-            html_body="""
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Low Stock Alert</title>
-                <style>
-                    body {
-                        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                        line-height: 1.6;
-                        color: #333;
-                        max-width: 600px;
-                        margin: 0 auto;
-                        padding: 20px;
-                        background-color: #f4f4f4;
-                    }
-                    .email-container {
-                        background-color: #ffffff;
-                        border-radius: 10px;
-                        padding: 40px;
-                        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                        border-top: 4px solid #f44336;
-                    }
-                    .header {
-                        text-align: center;
-                        margin-bottom: 30px;
-                    }
-                    .logo {
-                        font-size: 28px;
-                        font-weight: bold;
-                        color: #f44336;
-                        margin-bottom: 10px;
-                    }
-                    .title {
-                        font-size: 24px;
-                        color: #2c3e50;
-                        margin-bottom: 20px;
-                    }
-                    .alert-badge {
-                        background: linear-gradient(135deg, #ff5722 0%, #f44336 100%);
-                        color: white;
-                        padding: 8px 16px;
-                        border-radius: 20px;
-                        font-size: 14px;
-                        font-weight: bold;
-                        display: inline-block;
-                        margin-bottom: 20px;
-                        text-transform: uppercase;
-                        letter-spacing: 1px;
-                    }
-                    .greeting {
-                        font-size: 16px;
-                        color: #555;
-                        margin-bottom: 25px;
-                    }
-                    .product-info {
-                        background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
-                        border-radius: 10px;
-                        padding: 30px;
-                        margin: 30px 0;
-                        box-shadow: 0 4px 15px rgba(255, 107, 107, 0.2);
-                        color: white;
-                    }
-                    .product-name {
-                        font-size: 24px;
-                        font-weight: bold;
-                        margin-bottom: 20px;
-                        text-align: center;
-                        text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.3);
-                    }
-                    .info-grid {
-                        display: grid;
-                        grid-template-columns: 1fr 1fr;
-                        gap: 20px;
-                        margin-top: 20px;
-                    }
-                    .info-item {
-                        background-color: rgba(255, 255, 255, 0.1);
-                        padding: 15px;
-                        border-radius: 8px;
-                        text-align: center;
-                        backdrop-filter: blur(10px);
-                    }
-                    .info-label {
-                        font-size: 12px;
-                        opacity: 0.9;
-                        margin-bottom: 5px;
-                        text-transform: uppercase;
-                        letter-spacing: 1px;
-                    }
-                    .info-value {
-                        font-size: 20px;
-                        font-weight: bold;
-                    }
-                    .quantity-critical {
-                        font-size: 28px !important;
-                        color: #ffeb3b;
-                        text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.5);
-                    }
-                    .action-section {
-                        background-color: #fff3e0;
-                        border-left: 4px solid #ff9800;
-                        padding: 20px;
-                        margin: 25px 0;
-                        border-radius: 5px;
-                    }
-                    .action-title {
-                        color: #e65100;
-                        margin-top: 0;
-                        font-size: 18px;
-                        display: flex;
-                        align-items: center;
-                        gap: 10px;
-                    }
-                    .action-list {
-                        margin: 15px 0;
-                        padding-left: 20px;
-                    }
-                    .action-list li {
-                        margin: 10px 0;
-                        color: #bf360c;
-                        font-weight: 500;
-                    }
-                    .urgency-meter {
-                        background-color: #ffebee;
-                        border-radius: 10px;
-                        padding: 20px;
-                        margin: 20px 0;
-                        text-align: center;
-                        border: 2px solid #ffcdd2;
-                    }
-                    .urgency-title {
-                        color: #c62828;
-                        font-size: 16px;
-                        font-weight: bold;
-                        margin-bottom: 10px;
-                    }
-                    .urgency-bar {
-                        width: 100%;
-                        height: 10px;
-                        background-color: #ffcdd2;
-                        border-radius: 5px;
-                        overflow: hidden;
-                        margin: 10px 0;
-                    }
-                    .urgency-fill {
-                        height: 100%;
-                        background: linear-gradient(90deg, #ff5722, #f44336);
-                        width: 85%;
-                        border-radius: 5px;
-                    }
-                    .footer {
-                        text-align: center;
-                        margin-top: 40px;
-                        padding-top: 20px;
-                        border-top: 1px solid #eee;
-                        color: #777;
-                        font-size: 14px;
-                    }
-                    .support {
-                        background-color: #e8f5e8;
-                        border-radius: 5px;
-                        padding: 15px;
-                        margin: 20px 0;
-                        text-align: center;
-                    }
-                    .support a {
-                        color: #4CAF50;
-                        text-decoration: none;
-                    }
-                    .contact-info {
-                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                        color: white;
-                        padding: 20px;
-                        border-radius: 8px;
-                        margin: 20px 0;
-                        text-align: center;
-                    }
-                    .contact-title {
-                        font-size: 16px;
-                        margin-bottom: 10px;
-                        opacity: 0.9;
-                    }
-                    .contact-details {
-                        font-weight: bold;
-                    }
-                    @media (max-width: 600px) {
-                        .email-container {
-                            padding: 20px;
-                        }
-                        .info-grid {
-                            grid-template-columns: 1fr;
-                            gap: 10px;
-                        }
-                        .product-name {
-                            font-size: 20px;
-                        }
-                        .info-value {
-                            font-size: 18px;
-                        }
-                        .quantity-critical {
-                            font-size: 24px !important;
-                        }
-                    }
-                </style>
-            </head>
-            <body>
-                <div class="email-container">
-                    <div class="header">
-                        <div class="logo">📦 NgedEase</div>
-                        <div class="alert-badge">🚨 Stock Alert</div>
-                        <h1 class="title">Low Inventory Warning</h1>
-                    </div>
-                    
-                    <div class="greeting">
-                        Dear Inventory Team,
-                    </div>
-                    
-                    <p>We've detected that one of your products has reached a critically low stock level and requires immediate attention to prevent stockouts.</p>
-                    
-                    <div class="product-info">
-                        <div class="product-name">{{ product_name }}</div>
-                        <div class="info-grid">
-                            <div class="info-item">
-                                <div class="info-label">Store Location</div>
-                                <div class="info-value">{{ store_name }}</div>
-                            </div>
-                            <div class="info-item">
-                                <div class="info-label">Alert Threshold</div>
-                                <div class="info-value">{{ threshold }}</div>
-                            </div>
-                        </div>
-                        <div style="margin-top: 20px; text-align: center;">
-                            <div class="info-label">Current Stock Level</div>
-                            <div class="info-value quantity-critical">{{ current_quantity }}</div>
-                        </div>
-                    </div>
-                    
-                    <div class="urgency-meter">
-                        <div class="urgency-title">⏰ Urgency Level: HIGH</div>
-                        <div class="urgency-bar">
-                            <div class="urgency-fill"></div>
-                        </div>
-                        <div style="font-size: 14px; color: #c62828; margin-top: 5px;">
-                            Stock level is 85% below recommended threshold
-                        </div>
-                    </div>
-                    
-                    <div class="action-section">
-                        <h3 class="action-title">
-                            <span>🎯</span>
-                            <span>Immediate Actions Required</span>
-                        </h3>
-                        <ul class="action-list">
-                            <li>Review current supplier availability and lead times</li>
-                            <li>Place urgent restock order to prevent stockouts</li>
-                            <li>Consider temporary product substitutions if available</li>
-                            <li>Notify sales team of potential inventory constraints</li>
-                            <li>Update customers about potential delivery delays</li>
-                        </ul>
-                    </div>
-                    
-                    <div class="contact-info">
-                        <div class="contact-title">Need assistance with restocking?</div>
-                        <div class="contact-details">
-                            📞 Contact Supply Chain: +251-929-146-352<br>
-                            📧 Email: mahfouzteyib57@gmail.com
-                        </div>
-                    </div>
-                    
-                    <div class="support">
-                        For technical support or system issues, contact us at 
-                        <a href="mailto:mahfouzteyib57@gmail.com">mahfouzteyib57@gmail.com</a>
-                    </div>
-                    
-                    <div class="footer">
-                        <p><strong>NgedEase Inventory Management System</strong></p>
-                        <p>This is an automated alert. Please take immediate action to prevent stockouts.</p>
-                        <p>&copy; 2024 NgedEase. All rights reserved.</p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """,
-            text_body="""
-🚨 LOW STOCK ALERT - URGENT ACTION REQUIRED
-
-Dear Inventory Team,
-
-CRITICAL STOCK LEVEL DETECTED
-=================================
-
-Product: {{ product_name }}
-Store: {{ store_name }}
-Current Quantity: {{ current_quantity }}
-Alert Threshold: {{ threshold }}
-
-⏰ URGENCY LEVEL: HIGH
-Stock level is critically low and requires immediate attention.
-
-🎯 IMMEDIATE ACTIONS REQUIRED:
-• Review current supplier availability and lead times
-• Place urgent restock order to prevent stockouts
-• Consider temporary product substitutions if available
-• Notify sales team of potential inventory constraints
-
-
-For technical support: mahfouzteyib57@gmail.com
-
-This is an automated alert from NgedEase Inventory Management System.
-Please take immediate action to prevent stockouts.
-
-© 2025 NgedEase. All rights reserved.
-            """
-        )
-        return template
+                notification_log.error_message = str(error)
+        NotificationLog.objects.bulk_update(notification_logs, ['status', 'sent_at', 'error_message'])
+
+        sent = errors.count(None)
+        logger.info(f"{template_type} emails sent: {sent}/{len(messages)}")
+        return sent
+
+
+def _deliver_over_connection(indexed_messages, connection_factory, errors):
+    connection = connection_factory(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        for index, _ in indexed_messages:
+            errors[index] = e
+        return
+
+    try:
+        for index, message in indexed_messages:
+            message.connection = connection
+            try:
+                message.send()
+            except smtplib.SMTPServerDisconnected:
+                # The server may drop an idle or long-lived session; reconnect once
+                try:
+                    connection.close()
+                    connection.open()
+                    message.send()
+                except Exception as e:
+                    errors[index] = e
+            except Exception as e:
+                errors[index] = e
+    finally:
+        connection.close()
+
+
+def deliver_emails(messages, connections=1, connection_factory=get_connection):
+    """
+    Send EmailMessages over up to `connections` SMTP connections opened once each
+    and shared by the messages assigned to them, in parallel threads. Returns a list
+    aligned with messages holding None for each sent message or the error that
+    stopped it.
+    """
+    errors = [None] * len(messages)
+    workers = max(1, min(connections, len(messages)))
+    indexed = list(enumerate(messages))
+    chunks = [indexed[i::workers] for i in range(workers)]
+    if workers == 1:
+        _deliver_over_connection(chunks[0], connection_factory, errors)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda chunk: _deliver_over_connection(chunk, connection_factory, errors), chunks))
+    return errors
+
+LOW_STOCK_QUEUE = 'low_stock_notifications'
+DEAD_LETTER_QUEUE = f'{LOW_STOCK_QUEUE}.dead'
+RETRY_COUNT_HEADER = 'x-retry-count'
+
+
+def retry_queue_name(attempt):
+    return f'{LOW_STOCK_QUEUE}.retry.{attempt}'
+
+
+class PermanentMessageError(Exception):
+    """The message can never be processed; it goes to the dead-letter queue without retries"""
+
 
 class RabbitMQConsumer:
-    
-    def __init__(self):
+    """
+    Consumes low stock alerts with up to `prefetch` unacknowledged messages handled by
+    a pool of `threads` worker threads. pika channels are not thread-safe, so workers
+    only decide a message's outcome; the ack and any republish run on the connection
+    thread through add_callback_threadsafe.
+
+    A failed message is acked and republished to a delay queue for its attempt
+    (NOTIFICATION_RETRY_DELAYS); when the delay expires the broker dead-letters it back
+    to the main queue. After the last retry, or at once for malformed messages, it
+    is moved to the dead-letter queue instead of being requeued in a hot loop.
+    """
+
+    def __init__(self, prefetch=None, threads=None):
         self.connection = None
         self.channel = None
+        self.executor = None
+        self.prefetch = prefetch or settings.NOTIFICATION_CONSUMER_PREFETCH
+        self.threads = threads or settings.NOTIFICATION_CONSUMER_THREADS
+        self.retry_delays = settings.NOTIFICATION_RETRY_DELAYS
         self.notification_service = NotificationService()
+        self.digest_flusher = None
     
     def connect(self):
         """Connect to CloudAMQP"""
         try:
             rabbitmq_url = os.getenv('CLOUDAMQP_URL')
-            print(rabbitmq_url)
             if not rabbitmq_url:
                 raise ValueError("CLOUDAMQP_URL environment variable not set")
             
@@ -485,7 +267,7 @@ class RabbitMQConsumer:
             
             self.connection = pika.BlockingConnection(connection_params)
             self.channel = self.connection.channel()
-            self.channel.queue_declare(queue='low_stock_notifications', durable=True)
+            self.declare_queues()
             
             logger.info("Connected to CloudAMQP successfully")
             return True
@@ -493,98 +275,185 @@ class RabbitMQConsumer:
         except Exception as e:
             logger.error(f"Failed to connect to CloudAMQP: {e}")
             return False
-    
-    def process_low_stock_message(self, ch, method, properties, body):
-        """Process incoming low stock notification"""
+
+    def declare_queues(self):
+        self.channel.queue_declare(queue=LOW_STOCK_QUEUE, durable=True)
+        self.channel.queue_declare(queue=DEAD_LETTER_QUEUE, durable=True)
+        for attempt, delay in enumerate(self.retry_delays, start=1):
+            # Messages sit here for `delay` seconds, then the broker routes them back
+            self.channel.queue_declare(
+                queue=retry_queue_name(attempt),
+                durable=True,
+                arguments={
+                    'x-message-ttl': int(delay * 1000),
+                    'x-dead-letter-exchange': '',
+                    'x-dead-letter-routing-key': LOW_STOCK_QUEUE
+                }
+            )
+
+    def handle_low_stock_message(self, body):
+        """
+        Send the alert in body to its recipients. Raises PermanentMessageError for
+        malformed messages and TransientNotificationError when the recipients cannot
+        be looked up or no email could be sent, so the message is retried.
+        """
         try:
-            print('processing message')
             message = json.loads(body)
-            logger.info(f"Processing message: {message}")
-            
-            # Validate message
-            required_fields = ['product_name', 'store_name', 'current_quantity', 'threshold', 'company_id', 'store_id']
-            if not all(field in message for field in required_fields):
-                logger.error(f"Invalid message format: {message}")
-                ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
-                return
-            
-            # Get users to notify
-            users = self.notification_service.get_users_for_notification(
-                message['company_id'],
-                message['store_id']
-            )
-            
-            if not users:
-                logger.warning(f"No users found for company {message['company_id']}, store {message['store_id']}")
-                ch.basic_ack(delivery_tag=method.delivery_tag)
-                return
-            
-            # Send email to each user
-            success_count = 0
-            for user in users:
-                user_email = user.get('email')
-                if not user_email:
-                    logger.warning(f"User {user.get('id')} has no email address")
-                    continue
-                    
-                success = self.notification_service.send_low_stock_email(
-                    recipient_email=user_email,
-                    product_name=message['product_name'],
-                    store_name=message['store_name'],
-                    current_quantity=message['current_quantity'],
-                    threshold=message['threshold'],
-                    metadata={
-                        'inventory_id': message.get('inventory_id'),
-                        'store_id': message['store_id'],
-                        'company_id': message['company_id'],
-                        'user_id': user.get('id'),
-                        'user_role': user.get('role'),
-                        'timestamp': message.get('timestamp')
-                    }
-                )
-                
-                if success:
-                    success_count += 1
-                    logger.info(f"Notification sent to {user_email} ({user.get('role')})")
-                else:
-                    logger.error(f"Failed to send notification to {user_email}")
-            
-            logger.info(f"Processed notification: {success_count}/{len(users)} emails sent successfully")
-            
-            # Acknowledge message
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in message: {e}")
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            raise PermanentMessageError(f"Invalid JSON in message: {e}")
+        logger.info(f"Processing message: {message}")
+
+        # Validate message
+        required_fields = ['product_name', 'store_name', 'current_quantity', 'threshold', 'company_id', 'store_id']
+        if not isinstance(message, dict) or not all(field in message for field in required_fields):
+            raise PermanentMessageError(f"Invalid message format: {message}")
+
+        if self.digest_flusher is not None:
+            # Sent later with the store's other alerts by the digest flusher
+            buffer_alert(message)
+            return
+
+        # Get users to notify
+        users = self.notification_service.get_users_for_notification(
+            message['company_id'],
+            message['store_id']
+        )
+
+        if not users:
+            logger.warning(f"No users found for company {message['company_id']}, store {message['store_id']}")
+            return
+
+        # Send one rendered email to every user over shared SMTP connections
+        recipients = []
+        for user in users:
+            user_email = user.get('email')
+            if not user_email:
+                logger.warning(f"User {user.get('id')} has no email address")
+                continue
+            recipients.append((user_email, {
+                'inventory_id': message.get('inventory_id'),
+                'store_id': message['store_id'],
+                'company_id': message['company_id'],
+                'user_id': user.get('id'),
+                'user_role': user.get('role'),
+                'timestamp': message.get('timestamp')
+            }))
+
+        success_count = self.notification_service.send_low_stock_emails(
+            recipients,
+            product_name=message['product_name'],
+            store_name=message['store_name'],
+            current_quantity=message['current_quantity'],
+            threshold=message['threshold']
+        )
+
+        if recipients and success_count == 0:
+            # Nobody received the alert (SMTP down, template broken), so the retry
+            # sends it to every recipient again without duplicating any email. Partial
+            # failures are logged per recipient in NotificationLog and not retried.
+            raise TransientNotificationError(f"No low stock emails sent to {len(recipients)} recipient(s)")
+
+        logger.info(f"Processed notification: {success_count}/{len(users)} emails sent successfully")
+
+    def process_low_stock_message(self, ch, method, properties, body):
+        """Hand an incoming low stock notification to the worker pool"""
+        self.executor.submit(self._work, method.delivery_tag, properties, body)
+
+    def _work(self, delivery_tag, properties, body):
+        close_old_connections()
+        try:
+            self.handle_low_stock_message(body)
+            outcome, error = 'ack', None
+        except PermanentMessageError as e:
+            outcome, error = 'dead', e
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
-            # Requeue for retry
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            outcome, error = 'retry', e
+        finally:
+            close_old_connections()
+
+        try:
+            self.connection.add_callback_threadsafe(
+                partial(self._settle, delivery_tag, properties, body, outcome, error)
+            )
+        except Exception as e:
+            # Connection lost: the broker redelivers the unacked message on reconnect
+            logger.error(f"Could not settle message {delivery_tag}: {e}")
+
+    def _settle(self, delivery_tag, properties, body, outcome, error):
+        """Runs on the connection thread: republish if needed, then ack"""
+        if outcome == 'retry':
+            headers = dict(properties.headers or {})
+            attempt = headers.get(RETRY_COUNT_HEADER, 0) + 1
+            if attempt <= len(self.retry_delays):
+                logger.warning(f"Error processing message, retry {attempt}/{len(self.retry_delays)}: {error}")
+                headers[RETRY_COUNT_HEADER] = attempt
+                self._republish(retry_queue_name(attempt), body, headers)
+            else:
+                outcome = 'dead'
+
+        if outcome == 'dead':
+            logger.error(f"Moving message to {DEAD_LETTER_QUEUE}: {error}")
+            headers = dict(properties.headers or {})
+            headers['x-last-error'] = str(error)[:500]
+            self._republish(DEAD_LETTER_QUEUE, body, headers)
+
+        self.channel.basic_ack(delivery_tag=delivery_tag)
+
+    def _republish(self, queue, body, headers):
+        self.channel.basic_publish(
+            exchange='',
+            routing_key=queue,
+            body=body,
+            properties=pika.BasicProperties(
+                delivery_mode=2,
+                content_type='application/json',
+                headers=headers
+            )
+        )
     
     def start_consuming(self):
         """Start consuming messages"""
         if not self.connect():
             logger.error("Failed to connect to RabbitMQ")
             return
-            
+
+        self.executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='notification')
+        if settings.NOTIFICATION_DIGEST_WINDOW > 0:
+            self.digest_flusher = DigestFlusher(self.notification_service)
+            self.digest_flusher.start()
         try:
-            self.channel.basic_qos(prefetch_count=1)
+            self.channel.basic_qos(prefetch_count=self.prefetch)
             self.channel.basic_consume(
-                queue='low_stock_notifications',
+                queue=LOW_STOCK_QUEUE,
                 on_message_callback=self.process_low_stock_message
             )
             
-            logger.info("Starting to consume messages from CloudAMQP...")
+            logger.info(f"Starting to consume messages from CloudAMQP (prefetch {self.prefetch}, {self.threads} threads)...")
             self.channel.start_consuming()
             
         except KeyboardInterrupt:
             logger.info("Stopping consumer...")
             self.channel.stop_consuming()
-            self.close()
         except Exception as e:
             logger.error(f"Consumer error: {e}")
+        finally:
+            self.drain()
             self.close()
+
+    def drain(self):
+        """Let in-flight messages finish and flush their acks before the connection closes"""
+        if self.executor is None:
+            return
+        if self.digest_flusher is not None:
+            # Pending alerts stay buffered in the database for the next run
+            self.digest_flusher.stop()
+        self.executor.shutdown(wait=True)
+        self.executor = None
+        try:
+            if self.connection and self.connection.is_open:
+                self.connection.process_data_events(time_limit=1)
+        except Exception as e:
+            logger.error(f"Error flushing acknowledgements: {e}")
     
     def close(self):
         """Close connection"""
@@ -593,4 +462,4 @@ class RabbitMQConsumer:
                 self.connection.close()
                 logger.info("RabbitMQ connection closed")
         except Exception as e:
-            logger.error(f"Error closing connection: {e}")
\ No newline at end of file
+            logger.error(f"Error closing connection: {e}")
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from notifications.models import NotificationTemplate
+from notifications.template_registry import invalidate_template
+
+
+@receiver(post_save, sender=NotificationTemplate)
+@receiver(post_delete, sender=NotificationTemplate)
+def invalidate_compiled_templates(sender, instance, **kwargs):
+    # An update may change the row's type, so drop every type rather than instance.type
+    invalidate_template()
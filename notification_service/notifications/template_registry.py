@@ -0,0 +1,515 @@
+import threading
+import time
+from django.conf import settings
+from django.template import Template
+from .models import NotificationTemplate
+
+# Per-process registry of compiled notification templates, keyed by template type.
+# The active NotificationTemplate row for a type is loaded and parsed once; the
+# compiled copy is dropped when this process saves or deletes a template (see
+# notifications.signals) and after NOTIFICATION_TEMPLATE_CACHE_TIMEOUT seconds, so
+# edits made from another process are picked up too.
+_compiled = {}
+_lock = threading.Lock()
+
+
+class CompiledTemplate:
+    __slots__ = ('name', 'subject', 'html_body', 'text_body', 'per_recipient', 'loaded_at')
+
+    def __init__(self, name, subject, html_body, text_body):
+        self.name = name
+        self.subject = Template(subject)
+        self.html_body = Template(html_body)
+        self.text_body = Template(text_body)
+        # Templates that do not mention the recipient render once for a whole batch
+        self.per_recipient = 'recipient_email' in subject + html_body + text_body
+        self.loaded_at = time.monotonic()
+
+    def render(self, context):
+        """Returns (subject, html_body, text_body) rendered with a django.template.Context"""
+        return (
+            self.subject.render(context),
+            self.html_body.render(context),
+            self.text_body.render(context),
+        )
+
+
+def _load(template_type):
+    template = NotificationTemplate.objects.filter(
+        type=template_type,
+        is_active=True
+    ).order_by('-updated_at').first()
+    if template is not None:
+        return CompiledTemplate(template.name, template.subject, template.html_body, template.text_body)
+
+    default = DEFAULT_TEMPLATES.get(template_type)
+    if default is None:
+        raise LookupError(f"No active notification template of type '{template_type}'")
+    return CompiledTemplate(**default)
+
+
+def get_template(template_type):
+    """
+    Compiled template for a type: the most recently updated active row, or the
+    built-in default when there is none. Nothing is written to the database.
+    """
+    compiled = _compiled.get(template_type)
+    if compiled is not None and time.monotonic() - compiled.loaded_at < settings.NOTIFICATION_TEMPLATE_CACHE_TIMEOUT:
+        return compiled
+
+    compiled = _load(template_type)
+    with _lock:
+        _compiled[template_type] = compiled
+    return compiled
+
+
+def invalidate_template(template_type=None):
+    """Drop one type's compiled template, or every type's when template_type is None"""
+    with _lock:
+        if template_type is None:
+            _compiled.clear()
+        else:
+            _compiled.pop(template_type, None)
+
+
+DEFAULT_TEMPLATES = {
+    'low_stock': dict(
+        name="Default Low Stock Alert",
+        subject="🚨 Low Stock Alert: {{ product_name }} - {{ store_name }}",
+        html_body="""
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>Low Stock Alert</title>
+            <style>
+                body {
+                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                    line-height: 1.6;
+                    color: #333;
+                    max-width: 600px;
+                    margin: 0 auto;
+                    padding: 20px;
+                    background-color: #f4f4f4;
+                }
+                .email-container {
+                    background-color: #ffffff;
+                    border-radius: 10px;
+                    padding: 40px;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+                    border-top: 4px solid #f44336;
+                }
+                .header {
+                    text-align: center;
+                    margin-bottom: 30px;
+                }
+                .logo {
+                    font-size: 28px;
+                    font-weight: bold;
+                    color: #f44336;
+                    margin-bottom: 10px;
+                }
+                .title {
+                    font-size: 24px;
+                    color: #2c3e50;
+                    margin-bottom: 20px;
+                }
+                .alert-badge {
+                    background: linear-gradient(135deg, #ff5722 0%, #f44336 100%);
+                    color: white;
+                    padding: 8px 16px;
+                    border-radius: 20px;
+                    font-size: 14px;
+                    font-weight: bold;
+                    display: inline-block;
+                    margin-bottom: 20px;
+                    text-transform: uppercase;
+                    letter-spacing: 1px;
+                }
+                .greeting {
+                    font-size: 16px;
+                    color: #555;
+                    margin-bottom: 25px;
+                }
+                .product-info {
+                    background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
+                    border-radius: 10px;
+                    padding: 30px;
+                    margin: 30px 0;
+                    box-shadow: 0 4px 15px rgba(255, 107, 107, 0.2);
+                    color: white;
+                }
+                .product-name {
+                    font-size: 24px;
+                    font-weight: bold;
+                    margin-bottom: 20px;
+                    text-align: center;
+                    text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.3);
+                }
+                .info-grid {
+                    display: grid;
+                    grid-template-columns: 1fr 1fr;
+                    gap: 20px;
+                    margin-top: 20px;
+                }
+                .info-item {
+                    background-color: rgba(255, 255, 255, 0.1);
+                    padding: 15px;
+                    border-radius: 8px;
+                    text-align: center;
+                    backdrop-filter: blur(10px);
+                }
+                .info-label {
+                    font-size: 12px;
+                    opacity: 0.9;
+                    margin-bottom: 5px;
+                    text-transform: uppercase;
+                    letter-spacing: 1px;
+                }
+                .info-value {
+                    font-size: 20px;
+                    font-weight: bold;
+                }
+                .quantity-critical {
+                    font-size: 28px !important;
+                    color: #ffeb3b;
+                    text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.5);
+                }
+                .action-section {
+                    background-color: #fff3e0;
+                    border-left: 4px solid #ff9800;
+                    padding: 20px;
+                    margin: 25px 0;
+                    border-radius: 5px;
+                }
+                .action-title {
+                    color: #e65100;
+                    margin-top: 0;
+                    font-size: 18px;
+                    display: flex;
+                    align-items: center;
+                    gap: 10px;
+                }
+                .action-list {
+                    margin: 15px 0;
+                    padding-left: 20px;
+                }
+                .action-list li {
+                    margin: 10px 0;
+                    color: #bf360c;
+                    font-weight: 500;
+                }
+                .urgency-meter {
+                    background-color: #ffebee;
+                    border-radius: 10px;
+                    padding: 20px;
+                    margin: 20px 0;
+                    text-align: center;
+                    border: 2px solid #ffcdd2;
+                }
+                .urgency-title {
+                    color: #c62828;
+                    font-size: 16px;
+                    font-weight: bold;
+                    margin-bottom: 10px;
+                }
+                .urgency-bar {
+                    width: 100%;
+                    height: 10px;
+                    background-color: #ffcdd2;
+                    border-radius: 5px;
+                    overflow: hidden;
+                    margin: 10px 0;
+                }
+                .urgency-fill {
+                    height: 100%;
+                    background: linear-gradient(90deg, #ff5722, #f44336);
+                    width: 85%;
+                    border-radius: 5px;
+                }
+                .footer {
+                    text-align: center;
+                    margin-top: 40px;
+                    padding-top: 20px;
+                    border-top: 1px solid #eee;
+                    color: #777;
+                    font-size: 14px;
+                }
+                .support {
+                    background-color: #e8f5e8;
+                    border-radius: 5px;
+                    padding: 15px;
+                    margin: 20px 0;
+                    text-align: center;
+                }
+                .support a {
+                    color: #4CAF50;
+                    text-decoration: none;
+                }
+                .contact-info {
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    padding: 20px;
+                    border-radius: 8px;
+                    margin: 20px 0;
+                    text-align: center;
+                }
+                .contact-title {
+                    font-size: 16px;
+                    margin-bottom: 10px;
+                    opacity: 0.9;
+                }
+                .contact-details {
+                    font-weight: bold;
+                }
+                @media (max-width: 600px) {
+                    .email-container {
+                        padding: 20px;
+                    }
+                    .info-grid {
+                        grid-template-columns: 1fr;
+                        gap: 10px;
+                    }
+                    .product-name {
+                        font-size: 20px;
+                    }
+                    .info-value {
+                        font-size: 18px;
+                    }
+                    .quantity-critical {
+                        font-size: 24px !important;
+                    }
+                }
+            </style>
+        </head>
+        <body>
+            <div class="email-container">
+                <div class="header">
+                    <div class="logo">📦 NgedEase</div>
+                    <div class="alert-badge">🚨 Stock Alert</div>
+                    <h1 class="title">Low Inventory Warning</h1>
+                </div>
+                
+                <div class="greeting">
+                    Dear Inventory Team,
+                </div>
+                
+                <p>We've detected that one of your products has reached a critically low stock level and requires immediate attention to prevent stockouts.</p>
+                
+                <div class="product-info">
+                    <div class="product-name">{{ product_name }}</div>
+                    <div class="info-grid">
+                        <div class="info-item">
+                            <div class="info-label">Store Location</div>
+                            <div class="info-value">{{ store_name }}</div>
+                        </div>
+                        <div class="info-item">
+                            <div class="info-label">Alert Threshold</div>
+                            <div class="info-value">{{ threshold }}</div>
+                        </div>
+                    </div>
+                    <div style="margin-top: 20px; text-align: center;">
+                        <div class="info-label">Current Stock Level</div>
+                        <div class="info-value quantity-critical">{{ current_quantity }}</div>
+                    </div>
+                </div>
+                
+                <div class="urgency-meter">
+                    <div class="urgency-title">⏰ Urgency Level: HIGH</div>
+                    <div class="urgency-bar">
+                        <div class="urgency-fill"></div>
+                    </div>
+                    <div style="font-size: 14px; color: #c62828; margin-top: 5px;">
+                        Stock level is 85% below recommended threshold
+                    </div>
+                </div>
+                
+                <div class="action-section">
+                    <h3 class="action-title">
+                        <span>🎯</span>
+                        <span>Immediate Actions Required</span>
+                    </h3>
+                    <ul class="action-list">
+                        <li>Review current supplier availability and lead times</li>
+                        <li>Place urgent restock order to prevent stockouts</li>
+                        <li>Consider temporary product substitutions if available</li>
+                        <li>Notify sales team of potential inventory constraints</li>
+                        <li>Update customers about potential delivery delays</li>
+                    </ul>
+                </div>
+                
+                <div class="contact-info">
+                    <div class="contact-title">Need assistance with restocking?</div>
+                    <div class="contact-details">
+                        📞 Contact Supply Chain: +251-929-146-352<br>
+                        📧 Email: mahfouzteyib57@gmail.com
+                    </div>
+                </div>
+                
+                <div class="support">
+                    For technical support or system issues, contact us at 
+                    <a href="mailto:mahfouzteyib57@gmail.com">mahfouzteyib57@gmail.com</a>
+                </div>
+                
+                <div class="footer">
+                    <p><strong>NgedEase Inventory Management System</strong></p>
+                    <p>This is an automated alert. Please take immediate action to prevent stockouts.</p>
+                    <p>&copy; 2024 NgedEase. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """,
+        text_body="""
+🚨 LOW STOCK ALERT - URGENT ACTION REQUIRED
+
+Dear Inventory Team,
+
+CRITICAL STOCK LEVEL DETECTED
+=================================
+
+Product: {{ product_name }}
+Store: {{ store_name }}
+Current Quantity: {{ current_quantity }}
+Alert Threshold: {{ threshold }}
+
+⏰ URGENCY LEVEL: HIGH
+Stock level is critically low and requires immediate attention.
+
+🎯 IMMEDIATE ACTIONS REQUIRED:
+• Review current supplier availability and lead times
+• Place urgent restock order to prevent stockouts
+• Consider temporary product substitutions if available
+• Notify sales team of potential inventory constraints
+
+
+For technical support: mahfouzteyib57@gmail.com
+
+This is an automated alert from NgedEase Inventory Management System.
+Please take immediate action to prevent stockouts.
+
+© 2025 NgedEase. All rights reserved.
+        """
+    ),
+    'low_stock_digest': dict(
+        name="Default Low Stock Digest",
+        subject="🚨 Low Stock Alert: {{ alert_count }} products at {{ store_name }}",
+        html_body="""
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>Low Stock Alert</title>
+            <style>
+                body {
+                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                    line-height: 1.6;
+                    color: #333;
+                    max-width: 600px;
+                    margin: 0 auto;
+                    padding: 20px;
+                    background-color: #f4f4f4;
+                }
+                .email-container {
+                    background-color: #ffffff;
+                    border-radius: 10px;
+                    padding: 40px;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+                    border-top: 4px solid #f44336;
+                }
+                .header {
+                    text-align: center;
+                    margin-bottom: 30px;
+                }
+                .logo {
+                    font-size: 28px;
+                    font-weight: bold;
+                    color: #f44336;
+                    margin-bottom: 10px;
+                }
+                .title {
+                    font-size: 24px;
+                    color: #2c3e50;
+                    margin-bottom: 20px;
+                }
+                .alert-table {
+                    width: 100%;
+                    border-collapse: collapse;
+                    margin: 25px 0;
+                }
+                .alert-table th {
+                    background-color: #f44336;
+                    color: white;
+                    text-align: left;
+                    padding: 10px;
+                    font-size: 13px;
+                    text-transform: uppercase;
+                    letter-spacing: 1px;
+                }
+                .alert-table td {
+                    padding: 10px;
+                    border-bottom: 1px solid #eee;
+                }
+                .quantity-critical {
+                    color: #c62828;
+                    font-weight: bold;
+                }
+                .footer {
+                    text-align: center;
+                    margin-top: 40px;
+                    padding-top: 20px;
+                    border-top: 1px solid #eee;
+                    color: #777;
+                    font-size: 14px;
+                }
+            </style>
+        </head>
+        <body>
+            <div class="email-container">
+                <div class="header">
+                    <div class="logo">📦 NgedEase</div>
+                    <h1 class="title">Low Inventory Warning</h1>
+                </div>
+
+                <p>Dear Inventory Team,</p>
+                <p>{{ alert_count }} products at <strong>{{ store_name }}</strong> have reached a critically low stock level and require attention to prevent stockouts.</p>
+
+                <table class="alert-table">
+                    <tr>
+                        <th>Product</th>
+                        <th>Current Stock</th>
+                        <th>Threshold</th>
+                    </tr>
+                    {% for alert in alerts %}
+                    <tr>
+                        <td>{{ alert.product_name }}</td>
+                        <td class="quantity-critical">{{ alert.current_quantity }}</td>
+                        <td>{{ alert.threshold }}</td>
+                    </tr>
+                    {% endfor %}
+                </table>
+
+                <div class="footer">
+                    <p><strong>NgedEase Inventory Management System</strong></p>
+                    <p>This is an automated alert. Please take immediate action to prevent stockouts.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """,
+        text_body="""
+🚨 LOW STOCK ALERT - {{ alert_count }} PRODUCTS
+
+Dear Inventory Team,
+
+The following products at {{ store_name }} are below their alert threshold:
+{% for alert in alerts %}
+• {{ alert.product_name }}: {{ alert.current_quantity }} left (threshold {{ alert.threshold }}){% endfor %}
+
+This is an automated alert from NgedEase Inventory Management System.
+Please take immediate action to prevent stockouts.
+        """
+    ),
+}
@@ -1,3 +1,154 @@
-from django.test import TestCase
+import json
+from unittest import mock
+import requests
+from django.template import Context
+from django.test import TestCase, override_settings
+from notifications.digests import buffer_alert, flush_due_digests
+from notifications.models import NotificationLog, NotificationTemplate, PendingLowStockAlert
+from notifications.services import (
+    NotificationService,
+    PermanentMessageError,
+    RabbitMQConsumer,
+    RecipientLookupError,
+    TransientNotificationError
+)
+from notifications.smtp_sink import SMTPSink
+from notifications.template_registry import get_template, invalidate_template
 
-# Create your tests here.
+MESSAGE = json.dumps({
+    'product_name': 'Shirt',
+    'store_name': 'Store',
+    'current_quantity': 2,
+    'threshold': 10,
+    'company_id': 'company',
+    'store_id': 'store'
+})
+
+
+class LowStockMessageTests(TestCase):
+    """Transient failures must raise so the consumer retries the message"""
+
+    def setUp(self):
+        self.consumer = RabbitMQConsumer(prefetch=1, threads=1)
+
+    def test_malformed_message(self):
+        with self.assertRaises(PermanentMessageError):
+            self.consumer.handle_low_stock_message(b'{"product_name": "Shirt"}')
+
+    def test_user_service_down(self):
+        with mock.patch('notifications.services.requests.get', side_effect=requests.ConnectionError('down')):
+            with self.assertRaises(RecipientLookupError):
+                self.consumer.handle_low_stock_message(MESSAGE)
+
+    def test_no_email_sent(self):
+        users = [{'id': 'user', 'email': 'admin@example.com', 'role': 'admin'}]
+        with mock.patch.object(NotificationService, 'get_users_for_notification', return_value=users), \
+                mock.patch.object(NotificationService, 'send_low_stock_emails', return_value=0):
+            with self.assertRaises(TransientNotificationError):
+                self.consumer.handle_low_stock_message(MESSAGE)
+
+
+class FailingStoreService:
+    """Stand-in notification service whose SMTP sends fail for one store"""
+
+    def __init__(self, failing_store):
+        self.failing_store = failing_store
+        self.sent_stores = []
+
+    def get_users_for_notification(self, company_id, store_id):
+        return [{'id': 'user', 'email': 'admin@example.com', 'role': 'admin'}]
+
+    def send_low_stock_emails(self, recipients, product_name, store_name, current_quantity, threshold):
+        if store_name == self.failing_store:
+            return 0
+        self.sent_stores.append(store_name)
+        return len(recipients)
+
+
+class DigestFlushTests(TestCase):
+    """A failing store's digest must not hold up or lose the other stores' alerts"""
+
+    def test_failed_digest_is_rebuffered(self):
+        for store in ('store-a', 'store-b'):
+            buffer_alert({**json.loads(MESSAGE), 'store_id': store, 'store_name': store})
+
+        service = FailingStoreService('store-a')
+        self.assertEqual(flush_due_digests(service, window=0), 1)
+        self.assertEqual(service.sent_stores, ['store-b'])
+        self.assertEqual(list(PendingLowStockAlert.objects.values_list('store_id', flat=True)), ['store-a'])
+
+
+class TemplateRegistryTests(TestCase):
+    """Templates are compiled once per process and never written on send"""
+
+    def setUp(self):
+        invalidate_template()
+        self.addCleanup(invalidate_template)
+
+    def test_default_template_is_not_saved(self):
+        with self.assertNumQueries(1):
+            template = get_template('low_stock')
+        self.assertEqual(template.name, 'Default Low Stock Alert')
+        with self.assertNumQueries(0):
+            self.assertIs(get_template('low_stock'), template)
+        self.assertFalse(NotificationTemplate.objects.exists())
+
+    def test_saved_template_replaces_compiled_copy(self):
+        get_template('low_stock')
+        template = NotificationTemplate.objects.create(
+            name='Custom',
+            type='low_stock',
+            subject='Restock {{ product_name }}',
+            html_body='<p>{{ product_name }}</p>',
+            text_body='{{ product_name }}'
+        )
+        self.assertEqual(get_template('low_stock').name, 'Custom')
+
+        template.subject = 'Reorder {{ product_name }}'
+        template.save()
+        subject, _, _ = get_template('low_stock').render(Context({'product_name': 'Shirt'}))
+        self.assertEqual(subject, 'Reorder Shirt')
+
+        template.delete()
+        self.assertEqual(get_template('low_stock').name, 'Default Low Stock Alert')
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+    EMAIL_HOST='127.0.0.1',
+    EMAIL_USE_SSL=False,
+    EMAIL_USE_TLS=False,
+    EMAIL_HOST_USER='',
+    EMAIL_HOST_PASSWORD='',
+    DEFAULT_FROM_EMAIL='alerts@example.com',
+    EMAIL_DISPATCH_CONNECTIONS=2
+)
+class EmailDispatchTests(TestCase):
+    """A batch goes out over a few reused SMTP connections and is logged in bulk"""
+
+    def setUp(self):
+        invalidate_template()
+        self.sink = SMTPSink().start()
+        self.addCleanup(self.sink.stop)
+
+    def test_batch_over_shared_connections(self):
+        recipients = [(f'user{i}@example.com', {'user_id': i}) for i in range(6)]
+        # An address Django refuses to send to fails on its own without stopping the batch
+        recipients.append(('bad@@example.com', {'user_id': 6}))
+
+        with override_settings(EMAIL_PORT=self.sink.port), \
+                mock.patch.object(NotificationLog.objects, 'bulk_create', wraps=NotificationLog.objects.bulk_create) as bulk_create, \
+                mock.patch.object(NotificationLog.objects, 'bulk_update', wraps=NotificationLog.objects.bulk_update) as bulk_update:
+            sent = NotificationService().send_low_stock_emails(recipients, 'Shirt', 'Store', 2, 10)
+
+        self.assertEqual(sent, 6)
+        self.assertEqual(self.sink.messages, 6)
+        self.assertLessEqual(self.sink.connections, 2)
+        self.assertEqual(bulk_create.call_count, 1)
+        self.assertEqual(bulk_update.call_count, 1)
+
+        logs = NotificationLog.objects.all()
+        self.assertEqual(logs.filter(status='sent').count(), 6)
+        failed = logs.get(status='failed')
+        self.assertEqual(failed.recipient_email, 'bad@@example.com')
+        self.assertIn('Invalid address', failed.error_message)
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-17 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_create_super_admin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['company_id', 'role', 'assigned_store'], name='users_company_role_store_idx'),
+        ),
+    ]
@@ -53,4 +53,8 @@ class User(AbstractBaseUser):
         return f"{self.email} {self.first_name} {self.last_name}"
 
     class Meta:
-        ordering = ['-created_at'] 
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Recipient lookups filter by company and role, then by store
+            models.Index(fields=['company_id', 'role', 'assigned_store'], name='users_company_role_store_idx'),
+        ] 
\ No newline at end of file
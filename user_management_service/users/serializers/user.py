@@ -43,4 +43,38 @@ class UserSerializer(serializers.ModelSerializer):
             instance.set_password(password)
             
         instance.save()
-        return instance 
\ No newline at end of file
+        return instance 
+
+class UserRecipientSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'company_id', 'email', 'first_name', 'last_name', 'role', 'assigned_store']
+        read_only_fields = fields
+
+
+class RecipientQuerySerializer(serializers.Serializer):
+    """Query parameters of the recipients lookup; role lists are comma-separated"""
+    company_id = serializers.UUIDField()
+    roles = serializers.CharField(required=False, allow_blank=True, default='')
+    store = serializers.CharField(required=False, max_length=50)
+    store_roles = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def _parse_roles(self, value):
+        roles = {role.strip() for role in value.split(',') if role.strip()}
+        unknown = roles - {choice for choice, _ in User.ROLE_CHOICES}
+        if unknown:
+            raise serializers.ValidationError(f"Unknown role(s): {', '.join(sorted(unknown))}")
+        return roles
+
+    def validate_roles(self, value):
+        return self._parse_roles(value)
+
+    def validate_store_roles(self, value):
+        return self._parse_roles(value)
+
+    def validate(self, data):
+        if not data['roles'] and not data['store_roles']:
+            raise serializers.ValidationError("Provide roles, store_roles or both.")
+        if data['store_roles'] and not data.get('store'):
+            raise serializers.ValidationError("store is required with store_roles.")
+        return data
@@ -2,7 +2,7 @@ from django.urls import path
 
 from users.views.activity import ActivityLogViewForCompany
 from .views import (
-    UserListView, UserDetailView,
+    UserListView, UserDetailView, UserRecipientsView,
     RoleListView, RoleDetailView,
     PermissionListView, PermissionDetailView,
     ActivityLogView
@@ -15,6 +15,7 @@ from .views.auth import (
 
 urlpatterns = [
     path('users/', UserListView.as_view(), name='user-list'),
+    path('users/recipients/', UserRecipientsView.as_view(), name='user-recipients'),
     path('users/<uuid:id>/', UserDetailView.as_view(), name='user-detail'),
     path('roles/', RoleListView.as_view(), name='role-list'),
     path('roles/<uuid:id>/', RoleDetailView.as_view(), name='role-detail'),
@@ -484,7 +484,10 @@ class VerifyTokenView(APIView):
                     'properties': {
                         'is_valid': {'type': 'boolean', 'example': True},
                         'user_id': {'type': 'string', 'format': 'uuid', 'example': "123e4567-e89b-12d3-a456-426614174000"},
-                        'email': {'type': 'string', 'format': 'email', 'example': "user@example.com"}
+                        'email': {'type': 'string', 'format': 'email', 'example': "user@example.com"},
+                        'role': {'type': 'string', 'example': "admin"},
+                        'company_id': {'type': 'string', 'format': 'uuid', 'example': "123e4567-e89b-12d3-a456-426614174000"},
+                        'assigned_store': {'type': 'string', 'nullable': True}
                     }
                 }
             ),
@@ -520,6 +523,11 @@ class VerifyTokenView(APIView):
                 'user_id': str(user.id),
                 'email': user.email,
                 'role' : user.role,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'company_id': str(user.company_id),
+                'assigned_store': user.assigned_store,
+                'is_active': user.is_active,
             }, status=status.HTTP_200_OK)
 
         except (InvalidToken, TokenError, User.DoesNotExist):
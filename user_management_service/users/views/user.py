@@ -3,9 +3,10 @@ from rest_framework.views import APIView
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework import status
-from drf_spectacular.utils import extend_schema, OpenApiResponse
+from django.db.models import Q
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from users.models.user import User
-from users.serializers.user import UserSerializer
+from users.serializers.user import RecipientQuerySerializer, UserRecipientSerializer, UserSerializer
 from rest_framework.permissions import AllowAny
 
 class UserListView(APIView):
@@ -95,4 +96,50 @@ class UserDetailView(APIView):
     def delete(self, request: Request, id):
         user = self.get_user(id)
         user.delete()
-        return Response({'message': 'User deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response({'message': 'User deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
+
+
+class UserRecipientsView(APIView):
+    """
+    Active users of a company to notify: everyone with one of `roles`, plus users with
+    one of `store_roles` assigned to `store`. Filtering runs in the database on the
+    (company_id, role, assigned_store) index, so the cost does not grow with the
+    total number of users.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="List notification recipients",
+        description="Get the active users of a company with the given roles, optionally narrowed to a store",
+        tags=['Users'],
+        parameters=[
+            OpenApiParameter('company_id', str, required=True),
+            OpenApiParameter('roles', str, description="Comma-separated roles included from every store"),
+            OpenApiParameter('store', str, description="Store id for store_roles"),
+            OpenApiParameter('store_roles', str, description="Comma-separated roles included only when assigned to store"),
+        ],
+        responses={
+            200: UserRecipientSerializer(many=True),
+            400: OpenApiResponse(description="Bad Request")
+        }
+    )
+    def get(self, request: Request):
+        query = RecipientQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+
+        role_filter = Q()
+        if params['roles']:
+            role_filter |= Q(role__in=params['roles'])
+        if params['store_roles']:
+            role_filter |= Q(role__in=params['store_roles'], assigned_store=params['store'])
+
+        users = User.objects.filter(
+            role_filter,
+            company_id=params['company_id'],
+            is_active=True
+        ).only(*UserRecipientSerializer.Meta.fields)
+        serializer = UserRecipientSerializer(users, many=True)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)